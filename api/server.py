@@ -3,18 +3,99 @@ Flask server pro Twilio webhooky
 OPRAVENO: Auto-zavěšení, rychlejší reakce, české skloňování
 """
 
-from flask import Flask, request, Response, send_from_directory
+from flask import Flask, request, Response, send_from_directory, send_file, stream_with_context, abort
 from twilio.twiml.voice_response import VoiceResponse, Gather
 import os
+import re
 
-from core import TTSEngine
+from core import TTSEngine, split_sentences, llm_client
+from core.audio_cache_manager import get_audio_cache_manager
+from core.reply_cache import get_reply_cache
+from core.session_store import get_session_store
+from core.session_reaper import get_session_reaper
+from services.post_call import enqueue_call_report, start_post_call_workers
+from services.intent_matcher import get_intent_matcher
+from services.greeting_pool import get_greeting_pool
+from services.speculation import get_speculation_engine
+from database.sqlite_connector import get_knowledge_base
+from database.invalidation import get_invalidation_service
 from services import ReceptionistService
-from config import Prompts, Config
+from config import Prompts, Config, Phrases
 
 app = Flask(__name__, static_folder='../static', static_url_path='/static')
 
 receptionist = ReceptionistService()
 tts = TTSEngine()
+intent_matcher = get_intent_matcher()
+
+# ✅ Spekulativní odpovědi AI, zatímco hraje audio (ano / ne / cena / nemám čas)
+speculation = get_speculation_engine(receptionist.ai, tts)
+
+# ✅ Audio cache s budgetem - hot fraze se nikdy nevyhodi, evikce bezi na pozadi
+audio_cache = get_audio_cache_manager()
+audio_cache.pin_texts(tts, Phrases.all())
+greeting_pool = get_greeting_pool()
+if greeting_pool:
+    audio_cache.pin_texts(tts, greeting_pool.segments(), label='greeting')
+audio_cache.start()
+
+# ✅ Stav hovorů mimo proces - /process může obsloužit libovolný worker
+sessions = get_session_store()
+
+# ✅ Uklid opuštěných hovorů (TTL podle poslední aktivity)
+session_reaper = get_session_reaper()
+session_reaper.start()
+
+# ✅ Změny DB z jiných procesů (produkty, KB) → přestavba cache na pozadí
+invalidation = get_invalidation_service()
+invalidation.start()
+
+# ✅ AI report + learning po hovoru běží ve frontě (webhook jen zařadí)
+job_queue = start_post_call_workers()
+
+
+def load_kb_state(call_sid):
+    """Per-call stav KB hovoru ze session store (None = hovor není v KB módu)"""
+    from services.kb_call_state import KBCallState
+    
+    data = sessions.get(f"kb:{call_sid}")
+    if data is None:
+        return None
+    return KBCallState.from_dict(data)
+
+
+def save_kb_state(call_sid, kb_state):
+    """Ulož stav KB hovoru po každém kroku"""
+    sessions.set(f"kb:{call_sid}", kb_state.to_dict())
+
+
+def drop_kb_state(call_sid):
+    """Konec hovoru - smaž stav"""
+    sessions.delete(f"kb:{call_sid}")
+
+
+def trim_segments(segments, max_sentences=2):
+    """Zkrať odpověď na N vět (jednoslovné fillery se nepočítají)"""
+    kept = []
+    sentences = 0
+    
+    for segment in segments:
+        if len(segment.split()) > 1:
+            sentences += 1
+        if sentences > max_sentences:
+            break
+        kept.append(segment)
+    
+    return kept
+
+
+def play_segments(target, audio_urls, text):
+    """Přehraj segmenty jako po sobě jdoucí <Play>, jinak <Say>"""
+    if audio_urls:
+        for url in audio_urls:
+            target.play(url)
+    else:
+        target.say(text, language='cs-CZ')
 
 
 @app.route('/static/<path:filename>')
@@ -24,6 +105,27 @@ def serve_static(filename):
     return send_from_directory(static_dir, filename)
 
 
+@app.route('/tts/stream/<key>.mp3')
+def tts_stream(key):
+    """Streamuje rozpracovanou TTS syntezu (chunky jdou Twiliu hned jak prijdou)"""
+    if not re.fullmatch(r'[0-9a-f]{64}', key):
+        abort(404)
+    
+    # Uz hotovo -> z disku
+    if tts.store.contains(key):
+        return send_file(os.path.abspath(tts.store.path_for(key)), mimetype='audio/mpeg')
+    
+    inflight = tts.open_stream(key)
+    if inflight is None:
+        abort(404)
+    
+    return Response(
+        stream_with_context(inflight.iter_chunks(timeout=Config.TTS_STREAM_TIMEOUT)),
+        mimetype='audio/mpeg',
+        headers={'Cache-Control': 'no-cache'}
+    )
+
+
 @app.route("/voice", methods=['POST'])
 @app.route("/inbound", methods=['POST'])
 def inbound_call():
@@ -38,9 +140,10 @@ def inbound_call():
     print(f"{'='*50}")
     
     # ✅ SMAŽ STAROU KONVERZACI (pokud existuje)
-    if call_sid in receptionist.ai.conversations:
+    if receptionist.ai.has_conversation(call_sid):
         print(f"  ⚠️  Mažu starou konverzaci pro {call_sid}")
-        del receptionist.ai.conversations[call_sid]
+        receptionist.ai.end_conversation(call_sid)
+        speculation.cancel(call_sid)
     
     # Získej TEXT pozdravu
     greeting_text = receptionist.handle_call(call_sid, caller)
@@ -48,11 +151,11 @@ def inbound_call():
     # Vytvoř TwiML
     response = VoiceResponse()
     
-    # Generuj TTS
+    # Generuj TTS (po větách - sdílená cache)
     try:
-        audio_url = tts.generate(greeting_text, use_cache=True)
+        audio_urls = tts.generate_segments(split_sentences(greeting_text))
     except:
-        audio_url = None
+        audio_urls = None
     
     # ✅ GATHER BĚHEM PLAY (barge-in)
     gather = Gather(
@@ -69,16 +172,19 @@ def inbound_call():
         hints='dobrý den, ahoj, recepce, objednávka, dotaz, ano, ne, moment, prosím, děkuji, halo, slyšíme se'
     )
     
-    if audio_url:
-        print(f"  ✅ TTS: {audio_url}")
-        gather.play(audio_url)  # ✅ PLAY UVNITŘ GATHER
+    if audio_urls:
+        print(f"  ✅ TTS: {audio_urls}")
     else:
         print(f"  ⚠️  TTS selhalo")
-        gather.say(greeting_text, language='cs-CZ')
+    
+    play_segments(gather, audio_urls, greeting_text)  # ✅ PLAY UVNITŘ GATHER
     
     response.append(gather)
     response.redirect('/process?call_time=0')
     
+    # 🔮 Během pozdravu připrav odpovědi na nejčastější reakce
+    speculation.speculate(call_sid, receptionist.call_stage(call_sid))
+    
     return Response(str(response), mimetype='text/xml')
 @app.route("/outbound", methods=['POST'])
 def outbound_call():
@@ -106,19 +212,18 @@ def outbound_call():
     if use_kb:
         print(f"  🔥 Spouštím KNOWLEDGE BASE Cold Caller")
         
-        from services.cold_caller_kb import ColdCallerKB
+        from services.cold_caller_kb import get_cold_caller_kb
         
-        # Vytvoř KB caller instance
-        kb_caller = ColdCallerKB()
+        # Sdílený KB caller + malý stav jen pro tento hovor
+        kb_caller = get_cold_caller_kb()
+        kb_state = kb_caller.new_call(call_sid)
         
         # Získej opening z databáze
-        greeting = kb_caller.handle_outbound_call(call_sid, name, company)
+        greeting = kb_caller.handle_outbound_call(kb_state, name, company)
+        segments = kb_state.last_segments
         
-        # Ulož instance pro /process endpoint
-        if 'kb_callers' not in app.config:
-            app.config['kb_callers'] = {}
-        
-        app.config['kb_callers'][call_sid] = kb_caller
+        # Ulož stav pro /process endpoint (session store)
+        save_kb_state(call_sid, kb_state)
         
         print(f"  ✅ KB Caller aktivní pro {call_sid}")
     
@@ -135,6 +240,7 @@ def outbound_call():
         
         # Český pozdrav
         greeting = f"Dobrý den, {name}. Tady Pavel z Lososs."
+        segments = split_sentences(greeting)
         
         # AUTO-LEARNING PROMPT (pokud existuje)
         try:
@@ -151,10 +257,7 @@ def outbound_call():
         receptionist.ai.start_conversation(call_sid, sales_prompt)
         
         # Přidej greeting do konverzace
-        receptionist.ai.conversations[call_sid].append({
-            'role': 'assistant',
-            'content': greeting
-        })
+        receptionist.ai.append_message(call_sid, 'assistant', greeting)
     
     # ============================================================
     # SPOLEČNÝ KÓD (TTS + TwiML)
@@ -168,13 +271,13 @@ def outbound_call():
     print(f"  🎤 Generuji ElevenLabs TTS...")
     
     try:
-        audio_url = tts.generate(greeting, use_cache=True)
+        audio_urls = tts.generate_segments(segments)
     except Exception as e:
         print(f"  ❌ TTS chyba: {e}")
-        audio_url = None
+        audio_urls = None
     
-    if audio_url:
-        print(f"  ✅ Audio: {audio_url}")
+    if audio_urls:
+        print(f"  ✅ Audio: {audio_urls}")
         
         # ✅ GATHER BĚHEM PLAY (barge-in)
         gather = Gather(
@@ -191,7 +294,7 @@ def outbound_call():
             hints='dobrý den, ahoj, ano, ne, web, děkuji, moment, stop, zájem, email, halo, slyšíme se'
         )
         
-        gather.play(audio_url)
+        play_segments(gather, audio_urls, greeting)
         response.append(gather)
         response.redirect('/process?call_time=0')
         
@@ -236,7 +339,7 @@ def process_speech():
     if call_time >= 270:
         print(f"  ⏰ TIMEOUT - ukončuji")
         
-        timeout_msg = "Musím ukončit hovor. Hezký den!"
+        timeout_msg = Phrases.TIMEOUT
         
         try:
             audio_url = tts.generate(timeout_msg, use_cache=True)
@@ -249,45 +352,30 @@ def process_speech():
         return Response(str(response), mimetype='text/xml')
     
     # ⭐ DETEKCE ODMÍTNUTÍ - POUZE TVRDÁ ODMÍTNUTÍ!
-    hard_rejection_keywords = [
-        'nemám zájem a nebudu', 'nevolejte', 'smažte', 'přestaňte',
-        'neotravujte', 'odhlásit', 'nechci', 'už podruhé ne',
-        'říkám ne', 'konec', 'stop'
-    ]
-
-    # ✅ SOFT ODMÍTNUTÍ = NÁMITKA (pokračuj!)
-    soft_rejection = [
-        'nemám čas', 'nemám minutku', 'teď ne', 'později',
-        'musím jít', 'spěchám'
-    ]
-
-    # ✅ PŘÍLEŽITOST (rozhodně ne odmítnutí!)
-    opportunities = [
-        'nemáme web', 'nemáme stránky', 'nemáme', 'nemám web',
-        'starý web', 'nefunguje', 'špatný', 'zastaralý'
-    ]
-
-    user_input_lower = user_input.lower()
-
+    # Klíčová slova: data/intent_keywords.json (rejection.hard / soft / opportunity)
+    # Jeden průchod textem, výsledek se sdílí s KB callerem (cache)
+    intents = intent_matcher.match(user_input)
+    
     # 1. Zkontroluj příležitosti PRVNÍ
-    is_opportunity = any(phrase in user_input_lower for phrase in opportunities)
+    is_opportunity = intents.has('rejection.opportunity')
+    
     if is_opportunity:
         print(f"  🎯 PŘÍLEŽITOST detekována - pokračuji agresivně!")
         is_rejection = False
 
     # 2. Soft rejection = jen poznámka, ale pokračuj
-    elif any(phrase in user_input_lower for phrase in soft_rejection):
+    elif intents.has('rejection.soft'):
         print(f"  ⚠️  SOFT odmítnutí - zkusím obejít!")
         is_rejection = False
 
     # 3. Jen HARD rejection = skutečně zavěs
     else:
-        is_rejection = any(keyword in user_input_lower for keyword in hard_rejection_keywords)
+        is_rejection = intents.has('rejection.hard')
 
     if is_rejection:
         print(f"  ❌ HARD ODMÍTNUTÍ - ukončuji")
         
-        goodbye = "Rozumím, díky za čas. Hezký den."
+        goodbye = Phrases.HARD_REJECTION
         
         try:
             audio_url = tts.generate(goodbye, use_cache=True)
@@ -312,7 +400,7 @@ def process_speech():
         if retry_count >= 2:
             print(f"  ❌ 2 pokusy - ukončuji")
             
-            sorry_msg = "Omlouvám se, nerozumím. Hezký den."
+            sorry_msg = Phrases.NOT_UNDERSTOOD_END
             
             try:
                 audio_url = tts.generate(sorry_msg, use_cache=True)
@@ -325,7 +413,7 @@ def process_speech():
             response.hangup()
             return Response(str(response), mimetype='text/xml')
         
-        sorry_msg = "Neslyším vás. Mluvte prosím hlasitěji."
+        sorry_msg = Phrases.CANT_HEAR
         
         try:
             audio_url = tts.generate(sorry_msg, use_cache=True)
@@ -359,12 +447,12 @@ def process_speech():
         print(f"  ⚠️  PŘÍLIŠ KRÁTKÝ")
         
         if retry_count >= 2:
-            response.say("Omlouvám se, nerozumím. Hezký den.", language='cs-CZ')
+            response.say(Phrases.NOT_UNDERSTOOD_END, language='cs-CZ')
             response.pause(length=1)
             response.hangup()
             return Response(str(response), mimetype='text/xml')
         
-        sorry_msg = "Nerozuměl jsem. Zopakujte prosím."
+        sorry_msg = Phrases.REPEAT
         
         try:
             audio_url = tts.generate(sorry_msg, use_cache=True)
@@ -396,56 +484,65 @@ def process_speech():
     # ✅ ZPRACOVÁNÍ AI
     print(f"  🤖 Zpracovávám AI odpověď...")
     
+    prefetched = []  # věty s TTS spuštěným předem (úklid na konci tahu)
+    
     try:
         # ============================================================
         # 🔥 KNOWLEDGE BASE CHECK - TADY!
         # ============================================================
         
-        kb_callers = app.config.get('kb_callers', {})
+        kb_state = load_kb_state(call_sid)
         
-        if call_sid in kb_callers:
+        if kb_state:
             # ✅ POUŽIJ KNOWLEDGE BASE
             print(f"  🔥 Používám Knowledge Base")
-            kb_caller = kb_callers[call_sid]
-            ai_reply = kb_caller.process_customer_response(call_sid, user_input)
+            from services.cold_caller_kb import get_cold_caller_kb
+            ai_reply = get_cold_caller_kb().process_customer_response(kb_state, user_input)
+            segments = kb_state.last_segments
+            save_kb_state(call_sid, kb_state)
         else:
-            # ✅ PŮVODNÍ ZPŮSOB
-            print(f"  🤖 Používám standard AI")
-            ai_reply = receptionist.process_message(call_sid, user_input)
+            # ✅ PŮVODNÍ ZPŮSOB - AI streamuje po větách, TTS věty startuje hned
+            # (syntéza 1. věty běží, zatímco model píše 2.; po limitu se stream utne)
+            # 🔮 Odpověď předpočítaná během přehrávání (pokud sedí intent)
+            speculated = speculation.commit(call_sid, user_input)
+            segments = []
+            if speculated:
+                for sentence in speculated:
+                    segments.extend(split_sentences(sentence))
+            else:
+                print(f"  🤖 Používám standard AI (stream)")
+                for sentence in receptionist.stream_speech(call_sid, user_input):
+                    tts.prefetch(sentence)
+                    prefetched.append(sentence)
+                    segments.extend(split_sentences(sentence))
+            ai_reply = ' '.join(segments)
         
         print(f"  AI: {ai_reply[:100]}...")
         
         # ✅ DETEKUJ ROZLOUČENÍ V AI ODPOVĚDI
-        goodbye_phrases = [
-            'hezký den', 'nashledanou', 'na shledanou',
-            'měj se', 'zatím ahoj', 'díky za čas',
-            'už musím', 'musím jít', 'rozumím, díky'
-        ]
-        
-        ai_reply_lower = ai_reply.lower()
-        is_goodbye = any(phrase in ai_reply_lower for phrase in goodbye_phrases)
+        is_goodbye = intent_matcher.match(ai_reply).has('reply.goodbye')
         
         # Zkrať dlouhé odpovědi
         if len(ai_reply) > 250 or ai_reply.count('.') > 2:
-            sentences = ai_reply.split('.')
-            ai_reply = '. '.join(sentences[:2]) + '.'
+            segments = trim_segments(segments)
+            ai_reply = ' '.join(segments)
             print(f"  ✂️  Zkráceno")
         
-        # Generuj TTS
-        print(f"  🎤 Generuji TTS...")
+        # Generuj TTS (filler + věty jako samostatné segmenty)
+        print(f"  🎤 Generuji TTS ({len(segments)} segmentů)...")
         try:
-            audio_url = tts.generate(ai_reply, use_cache=True)
+            audio_urls = tts.generate_segments(segments)
         except:
-            audio_url = None
+            audio_urls = None
+        finally:
+            # Prefetch vět, které zkrácení vyřadilo
+            tts.discard_prefetched(prefetched)
         
         # ✅ POKUD ROZLOUČENÍ → PŘEHRAJ A ZAVĚS!
         if is_goodbye:
             print(f"  👋 DETEKOVÁNO ROZLOUČENÍ - zavěšuji po přehrání")
             
-            if audio_url:
-                response.play(audio_url)
-            else:
-                response.say(ai_reply, language='cs-CZ')
+            play_segments(response, audio_urls, ai_reply)
             
             response.pause(length=1)
             response.hangup()
@@ -457,8 +554,8 @@ def process_speech():
                 pass
             
             # ✅ CLEANUP KB caller pokud existuje
-            if call_sid in kb_callers:
-                del kb_callers[call_sid]
+            if kb_state:
+                drop_kb_state(call_sid)
             
             return Response(str(response), mimetype='text/xml')
         
@@ -479,16 +576,20 @@ def process_speech():
             hints='ano, ne, dobrý den, ahoj, děkuji, web, email, telefon, moment, stop, prosím, halo, slyšíme se'
         )
         
-        if audio_url:
-            print(f"  ✅ Přehrávám s barge-in: {audio_url}")
-            gather.play(audio_url)
+        if audio_urls:
+            print(f"  ✅ Přehrávám s barge-in: {audio_urls}")
         else:
             print(f"  ⚠️  TTS selhalo, použiji say")
-            gather.say(ai_reply, language='cs-CZ')
+        
+        play_segments(gather, audio_urls, ai_reply)
         
         response.append(gather)
         response.redirect(f'/process?retry=0&call_time={new_call_time}')
         
+        # 🔮 Spekulace na další tah (jen standard AI - KB má vlastní flow)
+        if not kb_state:
+            speculation.speculate(call_sid, receptionist.call_stage(call_sid))
+        
         return Response(str(response), mimetype='text/xml')
             
     except Exception as e:
@@ -496,7 +597,8 @@ def process_speech():
         import traceback
         traceback.print_exc()
         
-        sorry_msg = "Omlouvám se, nastala chyba. Zkuste znovu."
+        tts.discard_prefetched(prefetched)
+        sorry_msg = Phrases.ERROR
         
         try:
             audio_url = tts.generate(sorry_msg, use_cache=True)
@@ -529,7 +631,7 @@ def process_speech():
 
 @app.route("/call-status", methods=['POST'])
 def call_status():
-    """Status callback - AI REPORT + AUTO-LEARNING + DATABÁZE"""
+    """Status callback - zařadí AI REPORT + AUTO-LEARNING do fronty, vrací hned"""
     call_sid = request.values.get('CallSid')
     status = request.values.get('CallStatus')
     duration = request.values.get('CallDuration', 0)
@@ -543,78 +645,20 @@ def call_status():
     print(f"{'='*50}")
     
     try:
-        # ✅ ZÍSKEJ KONVERZACI PŘED end_call!
+        # ✅ ZÍSKEJ KONVERZACI PŘED úklidem stavu!
         conversation = []
-        if call_sid in receptionist.ai.conversations:
-            conversation = receptionist.ai.conversations[call_sid].copy()
+        if receptionist.ai.has_conversation(call_sid):
+            conversation = receptionist.ai.get_history(call_sid)
             print(f"  ✅ Konverzace nalezena ({len(conversation)} zpráv)")
         else:
             print(f"  ⚠️  Konverzace už byla smazána!")
         
-        # Teprve TEĎ zavolej end_call (nesmaže konverzaci)
-        # receptionist.end_call(call_sid, int(duration))
-        
-        # AI REPORT - POUZE pokud máme konverzaci!
+        # AI REPORT - POUZE pokud máme konverzaci! (běží ve frontě, ne tady)
         if status == 'completed' and int(duration) >= 10 and len(conversation) > 2:
-            print(f"\n{'='*60}")
-            print(f"🤖 SPOUŠTÍM AI VYHODNOCENÍ")
-            print(f"{'='*60}")
-            
-            try:
-                from services.call_reporter import CallReporter
-                from database.call_analytics import CallAnalytics
-                
-                reporter = CallReporter()
-                analytics = CallAnalytics()
-                
-                # ✅ POŠLI KONVERZACI DO REPORTERU!
-                result = reporter.analyze_call(call_sid, conversation)
-                
-                if 'error' not in result:
-                    print(f"\n✅ AI REPORT VYGENEROVÁN!")
-                    print(f"   Výsledek: {result.get('outcome', 'N/A')}")
-                    print(f"   Skóre: {result.get('sales_score', 0)}/100")
-                    print(f"   Shrnutí: {result.get('ai_summary', 'N/A')[:100]}...")
-                    
-                    # ✅ ULOŽ DO DATABÁZE
-                    call_data = {
-                        'call_sid': call_sid,
-                        'contact_phone': caller,
-                        'duration': int(duration),
-                        'conversation': conversation,
-                        'started_at': None,  # TODO: track start time
-                        'ended_at': None,
-                        **result
-                    }
-                    
-                    analytics.save_call(call_data)
-                    print(f"   ✅ Uloženo do databáze!")
-                    
-                    # ✅ AI LEARNING - pokud úspěšný!
-                    success_rate = result.get('sales_score', 0)
-                    
-                    if success_rate >= 70:
-                        print(f"\n🧠 SPOUŠTÍM AUTO-LEARNING (úspěšný hovor {success_rate}%)...")
-                        
-                        try:
-                            from services.learning_system import LearningSystem
-                            learner = LearningSystem()
-                            learner.learn_from_call(call_sid, result)
-                            print(f"   ✅ Learning dokončen - prompt vylepšen!")
-                        except Exception as e:
-                            print(f"   ⚠️  Learning error: {e}")
-                    
-                    elif success_rate < 40:
-                        print(f"\n📚 Ukládám FAILED hovor pro learning ({success_rate}%)...")
-                        # TODO: Learn from failures
-                    
-                else:
-                    print(f"\n❌ Report error: {result['error']}")
-                    
-            except Exception as e:
-                print(f"\n❌ Report failed: {e}")
-                import traceback
-                traceback.print_exc()
+            if enqueue_call_report(call_sid, conversation, int(duration), caller):
+                print(f"  📥 AI vyhodnocení zařazeno do fronty")
+            else:
+                print(f"  ℹ️  AI vyhodnocení už ve frontě je")
         
         elif len(conversation) <= 2:
             print(f"  ⚠️  Hovor příliš krátký ({len(conversation)} zpráv) - přeskakuji AI report")
@@ -627,6 +671,12 @@ def call_status():
         import traceback
         traceback.print_exc()
     
+    # ✅ Hovor skončil - další webhook už nepřijde, ukliď stav hned
+    if status in session_reaper.TERMINAL_STATUSES:
+        session_reaper.evict(call_sid)
+        speculation.cancel(call_sid)
+        print(f"  🧹 Stav hovoru uklizen")
+    
     return Response('OK', mimetype='text/plain')
 
 
@@ -636,6 +686,21 @@ def health():
     return {'status': 'ok', 'service': 'AI Phone Assistant'}
 
 
+@app.route("/metrics", methods=['GET'])
+def metrics():
+    """Provozni metriky (cache, ...)"""
+    return {
+        'audio_cache': audio_cache.get_metrics(),
+        'sessions': session_reaper.get_metrics(),
+        'jobs': job_queue.get_stats(),
+        'kb_usage': get_knowledge_base().usage.get_metrics(),
+        'invalidation': invalidation.get_metrics(),
+        'llm': llm_client.get_metrics(),
+        'reply_cache': get_reply_cache().get_metrics(),
+        'speculation': speculation.get_metrics()
+    }
+
+
 if __name__ == "__main__":
     print("=" * 60)
     print("   AI TELEFONNÍ ASISTENT - PRODUCTION")
@@ -0,0 +1,84 @@
+"""
+Benchmark: kolik stoji zalozeni KB hovoru na /outbound
+
+legacy - co delal drive ColdCallerKB() pro kazdy hovor:
+         ReceptionistService (AIEngine + TTSEngine + CallDB) + TopicController + ResponseSelector
+shared - sdileny ColdCallerKB + KBCallState pro hovor
+
+Meri se jen setup (bez vyberu odpovedi a TTS), cas pres perf_counter,
+alokace pres tracemalloc.
+
+Pouziti:
+    python -m cli.bench_call_setup
+    python -m cli.bench_call_setup --legacy 20 --shared 10000
+"""
+
+import argparse
+import contextlib
+import io
+import time
+import tracemalloc
+
+from services.receptionist import ReceptionistService
+from services.topic_controller import TopicController
+from services.response_selector import ResponseSelector
+from services.cold_caller_kb import get_cold_caller_kb
+
+
+def legacy_setup(call_sid):
+    """Puvodni per-call konstrukce celeho stacku"""
+    return (ReceptionistService(), TopicController(), ResponseSelector())
+
+
+def shared_setup(call_sid):
+    """Nova per-call konstrukce - jen stav"""
+    return get_cold_caller_kb().new_call(call_sid)
+
+
+def measure(setup, iterations):
+    """
+    Returns:
+        (prumerny cas v us, prumerne alokovane bajty na hovor)
+    """
+    # Zahrati (singletony, importy, KB cache)
+    with contextlib.redirect_stdout(io.StringIO()):
+        setup('CA_warmup')
+
+    keep = []
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    started = time.perf_counter()
+
+    # Printy konstruktoru by zkreslily cas
+    with contextlib.redirect_stdout(io.StringIO()):
+        for i in range(iterations):
+            keep.append(setup(f"CA{i:032d}"))
+
+    elapsed = time.perf_counter() - started
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return elapsed / iterations * 1e6, (after - before) / iterations
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark per-call setupu KB hovoru')
+    parser.add_argument('--legacy', type=int, default=20, help='Iteraci legacy setupu')
+    parser.add_argument('--shared', type=int, default=10000, help='Iteraci noveho setupu')
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("   BENCHMARK: SETUP KB HOVORU")
+    print("=" * 60)
+
+    legacy_us, legacy_bytes = measure(legacy_setup, args.legacy)
+    shared_us, shared_bytes = measure(shared_setup, args.shared)
+
+    print(f"\n{'':<10}{'cas/hovor':>16}{'alokace/hovor':>18}")
+    print(f"{'legacy':<10}{legacy_us:>13.1f} us{legacy_bytes / 1024:>15.1f} KB")
+    print(f"{'shared':<10}{shared_us:>13.1f} us{shared_bytes / 1024:>15.1f} KB")
+    print(f"\n⚡ {legacy_us / shared_us:.0f}x rychlejsi, {legacy_bytes / max(shared_bytes, 1):.0f}x mene alokaci")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""
+Benchmark: CallDB pod soubeznou zatezi webhooku
+
+legacy  - connect/close na kazdou operaci, vychozi pragmy (puvodni CallDB)
+manager - CallDB nad ConnectionManagerem (pool spojeni, WAL, ...)
+
+Kazdy webhook (add_call, update_call, get_contacts, update_contact) bezi
+na vlastnim kratkodobem vlakne jako request ve Werkzeugu, --threads jich
+bezi naraz. Meri se operace za sekundu, chyby 'database is locked'
+a pocet otevrenych spojeni.
+
+Pouziti:
+    python -m cli.bench_db
+    python -m cli.bench_db --threads 16 --seconds 5
+"""
+
+import argparse
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+from config import Config
+
+
+class LegacyCallDB:
+    """Puvodni pristup - nove spojeni na kazdou operaci"""
+
+    def __init__(self, path):
+        self.path = path
+        self.opened = 0
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        with self._lock:
+            self.opened += 1
+        return sqlite3.connect(self.path)
+
+    def add_call(self, data):
+        conn = self._connect()
+        conn.execute('''INSERT OR REPLACE INTO calls
+            (call_sid, type, direction, phone, start_time, status)
+            VALUES (?, ?, ?, ?, ?, ?)''',
+            (data['sid'], data['type'], data['direction'],
+             data['phone'], datetime.now().isoformat(), 'active'))
+        conn.commit()
+        conn.close()
+
+    def update_call(self, sid, updates):
+        conn = self._connect()
+        fields = ', '.join([f"{k} = ?" for k in updates.keys()])
+        conn.execute(f"UPDATE calls SET {fields} WHERE call_sid = ?", list(updates.values()) + [sid])
+        conn.commit()
+        conn.close()
+
+    def get_contacts(self, status='new', limit=100):
+        conn = self._connect()
+        rows = conn.execute('''SELECT id, name, phone, company, email, call_count
+            FROM contacts WHERE status = ? LIMIT ?''', (status, limit)).fetchall()
+        conn.close()
+        return rows
+
+    def update_contact(self, phone, updates):
+        conn = self._connect()
+        fields = ', '.join([f"{k} = ?" for k in updates.keys()])
+        conn.execute(f"UPDATE contacts SET {fields} WHERE phone = ?", list(updates.values()) + [phone])
+        conn.commit()
+        conn.close()
+
+
+def run_load(db, threads, seconds):
+    """Webhooky na kratkodobych vlaknech, max `threads` naraz - vrat (operace, chyby)"""
+    slots = threading.BoundedSemaphore(threads)
+    lock = threading.Lock()
+    totals = {'ops': 0, 'errors': 0}
+    deadline = time.time() + seconds
+
+    def webhook(i):
+        sid = f"CA{i:011d}"
+        phone = f"+42060{(i * 7919) % 1000:07d}"
+        try:
+            db.add_call({'sid': sid, 'type': 'cold', 'direction': 'outbound', 'phone': phone})
+            db.update_call(sid, {'status': 'completed', 'duration': i % 300})
+            db.get_contacts(limit=20)
+            db.update_contact(phone, {'call_count': i, 'last_call': sid})
+            key = 'ops'
+        except sqlite3.OperationalError:
+            key = 'errors'
+        finally:
+            slots.release()
+        with lock:
+            totals[key] += 4 if key == 'ops' else 1
+
+    i = 0
+    while time.time() < deadline:
+        slots.acquire()
+        threading.Thread(target=webhook, args=(i,)).start()
+        i += 1
+
+    # Pockej na dobehnuti poslednich webhooku
+    for _ in range(threads):
+        slots.acquire()
+
+    return totals['ops'], totals['errors']
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark DB vrstvy pod soubeznou zatezi')
+    parser.add_argument('--threads', type=int, default=8, help='Soubezne webhooky')
+    parser.add_argument('--seconds', type=float, default=3, help='Delka kazdeho behu')
+    parser.add_argument('--contacts', type=int, default=1000, help='Pocet kontaktu v DB')
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("   BENCHMARK: DB (calls / contacts)")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        results = {}
+
+        for mode in ('legacy', 'manager'):
+            Config.DB_PATH = os.path.join(tmp, f'{mode}.db')
+
+            # Schema + kontakty (CallDB vytvori tabulky)
+            from database.models import CallDB
+            call_db = CallDB()
+            for i in range(args.contacts):
+                call_db.add_contact({'name': f'Kontakt {i}', 'phone': f'+42060{i:07d}'})
+
+            db = call_db
+            if mode == 'legacy':
+                # Puvodni soubor nemel WAL - kopie mimo otevrena spojeni (pool, invalidace)
+                legacy_path = os.path.join(tmp, 'legacy-rollback.db')
+                with call_db.db.connection() as conn:
+                    conn.execute("VACUUM INTO ?", (legacy_path,))
+                conn = sqlite3.connect(legacy_path)
+                conn.execute("PRAGMA journal_mode=DELETE")
+                conn.close()
+                db = LegacyCallDB(legacy_path)
+
+            started = time.time()
+            ops, errors = run_load(db, args.threads, args.seconds)
+            elapsed = time.time() - started
+            results[mode] = ops / elapsed
+            opened = db.opened if mode == 'legacy' else call_db.db.opened
+
+            print(f"\n{mode:<8} {ops / elapsed:>10.0f} ops/s   ({ops} ops, {errors} locked, "
+                  f"{args.threads} naraz, {opened} otevrenych spojeni)")
+
+        print(f"\n⚡ Zrychleni: {results['manager'] / results['legacy']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Microbenchmark: intent matcher vs puvodni retez any(x in text ...)
+
+legacy  - kazda tabulka zvlast: text.lower() + any(keyword in text) (jak to bylo v kodu)
+matcher - jeden zkompilovany regex pres normalizovany text (bez cache)
+cached  - IntentMatcher.match (lru_cache - stejna utterance z vice mist)
+
+Overi i shodu: matcher musi najit vsechno co legacy (navic muze najit
+shody bez diakritiky).
+
+Pouziti:
+    python -m cli.bench_intents
+    python -m cli.bench_intents --rounds 5000
+"""
+
+import argparse
+import json
+import time
+
+from services.intent_matcher import IntentMatcher
+
+
+UTTERANCES = [
+    "Dobrý den, kdo volá?",
+    "Nemám čas, volejte později",
+    "Nemáme web, ale přemýšleli jsme o tom",
+    "Kolik by to stálo?",
+    "Už máme web a jsme spokojení",
+    "Nezajímá mě to, nevolejte mi",
+    "Jo, to zní zajímavě, jak to funguje?",
+    "Včera jsem byl na fotbale, hrozné počasí",
+    "Schůzka zítra by šla",
+    "Moment, předám vás kolegovi",
+    "nemam cas",  # STT bez diakritiky
+    "Ano, pošlete mi email",
+    "To je drahé, máme malý rozpočet",
+    "Stop, konec",
+    "Hezký den, nashledanou",
+]
+
+
+def legacy_match(tables, text):
+    """Puvodni pristup - tabulka po tabulce"""
+    text_lower = text.lower()
+    found = set()
+    for group, intents in tables.items():
+        for intent, keywords in intents.items():
+            if any(keyword in text_lower for keyword in keywords):
+                found.add(f"{group}.{intent}")
+    return found
+
+
+def bench(fn, rounds):
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for text in UTTERANCES:
+            fn(text)
+    return (time.perf_counter() - started) / (rounds * len(UTTERANCES)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark intent matcheru')
+    parser.add_argument('--rounds', type=int, default=2000, help='Pocet pruchodu vsemi utterances')
+    args = parser.parse_args()
+
+    matcher = IntentMatcher()
+    with open(matcher.path, 'r', encoding='utf-8') as f:
+        tables = json.load(f)
+
+    print("=" * 60)
+    print("   BENCHMARK: INTENT MATCHER")
+    print("=" * 60)
+
+    # Shoda
+    missing = 0
+    extra = 0
+    for text in UTTERANCES:
+        legacy = legacy_match(tables, text)
+        compiled = {
+            intent for intent in
+            (f"{g}.{i}" for g, intents in tables.items() for i in intents)
+            if matcher._match(text).has(intent)
+        }
+        missing += len(legacy - compiled)
+        extra += len(compiled - legacy)
+
+    print(f"\n🔍 Shoda: {missing} chybejicich intentu, {extra} navic (bez diakritiky)")
+
+    legacy_us = bench(lambda text: legacy_match(tables, text), args.rounds)
+    matcher_us = bench(matcher._match, args.rounds)
+    cached_us = bench(matcher.match, args.rounds)
+
+    print(f"\n{'legacy':<10}{legacy_us:>10.2f} us / utterance")
+    print(f"{'matcher':<10}{matcher_us:>10.2f} us / utterance ({legacy_us / matcher_us:.1f}x)")
+    print(f"{'cached':<10}{cached_us:>10.2f} us / utterance ({legacy_us / cached_us:.1f}x)")
+
+    if missing:
+        raise SystemExit("❌ Matcher nenasel vsechno co legacy")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Vygeneruj pool pozdravu pro prichozi hovory + predrenderuj audio
+
+Pozdravy vznikaji stejne jako driv pri kazdem hovoru (Prompts.RECEPTIONIST
++ "Zákazník zvedl telefon."), jen jednou dopredu. Kazda veta se hned
+vyrenderuje do TTS cache, takze /inbound uz na nic neceka.
+
+Pouziti:
+    python -m cli.build_greetings
+    python -m cli.build_greetings --count 12 --no-audio
+"""
+
+import argparse
+import time
+
+from config import Config, Prompts
+from core.ai_engine import _SentenceCutter
+from core.llm_client import get_openai_client
+from services.greeting_pool import PICKUP_MESSAGE, GreetingPool
+
+
+def generate_variants(count: int, temperature: float, attempts: int) -> list:
+    """N ruznych pozdravu (duplicitni odpovedi modelu se zahodi)"""
+    client = get_openai_client()
+    variants = []
+
+    for _ in range(attempts):
+        if len(variants) >= count:
+            break
+
+        response = client.chat.completions.create(
+            model=Config.OPENAI_MODEL,
+            messages=[
+                {"role": "system", "content": Prompts.RECEPTIONIST},
+                {"role": "user", "content": PICKUP_MESSAGE},
+            ],
+            temperature=temperature,
+            max_tokens=Config.MAX_TOKENS,
+        )
+
+        # Stejny limit delky jako odpoved v hovoru
+        cutter = _SentenceCutter()
+        cutter.feed(response.choices[0].message.content)
+        cutter.finish()
+        greeting = ' '.join(cutter.sentences)
+
+        if greeting and greeting not in variants:
+            variants.append(greeting)
+            print(f"  💬 {greeting}")
+
+    return variants
+
+
+def render_audio(pool: GreetingPool):
+    """Kazda veta kazde varianty do TTS cache (uz vyrenderovane se preskoci)"""
+    from core import TTSEngine
+
+    tts = TTSEngine()
+    rendered = 0
+    for segment in dict.fromkeys(pool.segments()):
+        if tts.store.contains(tts.cache_key(segment)):
+            continue
+        tts.render(segment)
+        rendered += 1
+    print(f"🎤 Audio: {rendered} nových segmentů, {len(pool.segments())} celkem")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Pool pozdravu pro prichozi hovory')
+    parser.add_argument('--count', type=int, default=Config.GREETING_POOL_SIZE, help='Pocet variant')
+    parser.add_argument('--temperature', type=float, default=0.9, help='Rozmanitost variant')
+    parser.add_argument('--output', default=Config.GREETING_POOL_PATH, help='Vystupni soubor')
+    parser.add_argument('--no-audio', action='store_true', help='Jen texty, bez TTS')
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("   BUILD: GREETING POOL")
+    print("=" * 60)
+
+    started = time.perf_counter()
+    variants = generate_variants(args.count, args.temperature, attempts=args.count * 3)
+    if not variants:
+        print("❌ Žádný pozdrav se nevygeneroval")
+        return
+
+    pool = GreetingPool(variants)
+    pool.save(args.output)
+    print(f"\n💾 {len(variants)} variant uloženo: {args.output} "
+          f"({(time.perf_counter() - started):.1f} s)")
+
+    if not args.no_audio:
+        render_audio(pool)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+"""
+Postav retrieval index nad KB situacemi (offline)
+
+Pouziti:
+    python -m cli.build_retrieval_index
+    python -m cli.build_retrieval_index --query "a kolik stoji udrzba?"
+"""
+
+import argparse
+import time
+
+from config import Config
+from database.retrieval_index import RetrievalIndex, collect_documents
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build retrieval indexu (char n-gram TF-IDF)')
+    parser.add_argument('--kb-db', default='database/knowledge_base.db', help='Knowledge base')
+    parser.add_argument('--calls-db', default=Config.DB_PATH, help='Historie hovoru (call_details)')
+    parser.add_argument('--output', default=Config.RETRIEVAL_INDEX_PATH, help='Vystupni soubor')
+    parser.add_argument('--query', action='append', default=[], help='Zkusebni dotaz (lze opakovat)')
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("   BUILD: RETRIEVAL INDEX")
+    print("=" * 60)
+
+    documents = collect_documents(args.kb_db, args.calls_db)
+    sources = {}
+    for _, source, _ in documents:
+        sources[source] = sources.get(source, 0) + 1
+    print(f"\n📄 Dokumenty: {len(documents)} {sources}")
+
+    started = time.perf_counter()
+    index = RetrievalIndex.build(documents)
+    print(f"🔨 Postaveno za {(time.perf_counter() - started) * 1000:.0f} ms "
+          f"({len(index.vocab)} n-gramu, {len(index.data)} nenulovych vah)")
+
+    index.save(args.output)
+    print(f"💾 Ulozeno: {args.output}")
+
+    for query in args.query:
+        started = time.perf_counter()
+        results = index.search(query)
+        elapsed = (time.perf_counter() - started) * 1e6
+        print(f"\n🔍 '{query}' ({elapsed:.0f} us)")
+        for response_id, score, source in results:
+            print(f"   #{response_id:<4} {score:.3f}  ({source})")
+
+
+if __name__ == "__main__":
+    main()
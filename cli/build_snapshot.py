@@ -0,0 +1,76 @@
+"""
+Postav warm start artefakt (KB snapshot + intent matcher + retrieval index)
+
+Pouziti:
+    python -m cli.build_snapshot            # zapis data/warm_start.pkl
+    python -m cli.build_snapshot --verify   # jen porovnej artefakt s aktualnimi zdroji
+
+Spoustet po migraci / importu KB / build_retrieval_index, pred startem workeru.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+from config import Config
+from database.manager import get_connection_manager
+from database.migrations import ensure_schema
+from database.warm_start import WarmStart, current_signatures
+
+
+def verify(path: str, kb_path: str) -> bool:
+    """Vypis stav komponent artefaktu vuci aktualnim zdrojum"""
+    started = time.perf_counter()
+    warm = WarmStart.load(path)
+    load_ms = (time.perf_counter() - started) * 1000
+
+    if warm is None:
+        print(f"❌ Artefakt {path} chybi nebo je poskozeny")
+        return False
+
+    print(f"📦 {path}: nacteno za {load_ms:.1f} ms")
+    fresh = True
+    for name, signature in current_signatures(kb_path).items():
+        if name not in warm.components:
+            print(f"  ⚪ {name}: neni v artefaktu")
+        elif warm.get(name, signature) is not None:
+            print(f"  ✅ {name}: aktualni")
+        else:
+            print(f"  ⚠️  {name}: zastaraly (postavi se ze zdroje)")
+            fresh = False
+    return fresh
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build warm start artefaktu')
+    parser.add_argument('--kb-db', default='database/knowledge_base.db', help='Knowledge base')
+    parser.add_argument('--output', default=Config.WARM_START_PATH, help='Vystupni soubor')
+    parser.add_argument('--verify', action='store_true', help='Jen over existujici artefakt')
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("   BUILD: WARM START")
+    print("=" * 60)
+
+    if args.verify:
+        sys.exit(0 if verify(args.output, args.kb_db) else 1)
+
+    # Podpis KB potrebuje table_versions (migrace v4)
+    with get_connection_manager(args.kb_db).connection() as conn:
+        ensure_schema(conn, 'knowledge_base', args.kb_db)
+
+    started = time.perf_counter()
+    warm = WarmStart.build(args.kb_db)
+    print(f"\n🔨 Postaveno za {(time.perf_counter() - started) * 1000:.0f} ms: "
+          f"{', '.join(warm.components)}")
+
+    warm.save(args.output)
+    print(f"💾 Ulozeno: {args.output} ({os.path.getsize(args.output) / 1024:.0f} KB)\n")
+
+    verify(args.output, args.kb_db)
+    print()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+"""
+Migrace schematu calls.db a knowledge_base.db + kontrola planu dotazu
+
+Pouziti:
+    python -m cli.migrate              # dorovnej obe databaze (+ ANALYZE)
+    python -m cli.migrate --check      # EXPLAIN QUERY PLAN hot dotazu, exit 1 pri full scanu
+"""
+
+import argparse
+import sys
+
+from config import Config
+from database.manager import get_connection_manager
+from database.migrations import MIGRATIONS, full_scans, get_version, migrate
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Verzovane migrace SQLite schematu')
+    parser.add_argument('--calls-db', default=Config.DB_PATH, help='Databaze hovoru')
+    parser.add_argument('--kb-db', default='database/knowledge_base.db', help='Knowledge base')
+    parser.add_argument('--check', action='store_true', help='Over ze hot dotazy nejdou pres full scan')
+    parser.add_argument('--analyze', action='store_true', help='ANALYZE i bez nove migrace')
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("   MIGRACE SCHEMATU")
+    print("=" * 60)
+
+    failed = False
+    for schema, path in (('calls', args.calls_db), ('knowledge_base', args.kb_db)):
+        with get_connection_manager(path).connection() as conn:
+            before = get_version(conn)
+            applied = migrate(conn, schema)
+            if args.analyze and not applied:
+                conn.execute("ANALYZE")
+                conn.commit()
+
+            latest = MIGRATIONS[schema][-1][0]
+            print(f"\n📦 {path}: v{before} -> v{get_version(conn)} (posledni v{latest})")
+
+            if args.check:
+                problems = full_scans(conn, schema)
+                if problems:
+                    failed = True
+                    for query, detail in problems:
+                        print(f"  ❌ {detail}\n     {query}")
+                else:
+                    print(f"  ✅ Hot dotazy bez full scanu")
+
+    print()
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,198 @@
+"""
+Pre-render vsech KB odpovedi do TTS cache pred spustenim kampane
+
+V KB rezimu vime dopredu vsechno co ColdCallerKB muze rict - vyrenderujeme
+to predem (po segmentech), takze behem kampane nejde ani jeden hovor na ElevenLabs.
+
+Je to resumable: uloziste je content-addressed, uz vyrenderovane texty
+se preskoci (prerusena kampan pokracuje tam kde skoncila).
+
+Pouziti:
+    python -m cli.prerender
+    python -m cli.prerender --workers 8 --contacts 200
+"""
+
+import argparse
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from config import Phrases
+from core import TTSEngine, split_sentences
+from database import CallDB
+from database.sqlite_connector import get_knowledge_base
+from services.response_selector import ResponseSelector
+from services.topic_controller import TopicController
+from services.cold_caller_kb import ColdCallerKB
+
+
+MAX_RETRIES = 5
+BACKOFF_BASE = 2.0  # s (2, 4, 8, 16, 32 + jitter)
+
+
+def collect_texts(contacts_limit=0):
+    """
+    Posbira vsechny audio segmenty ktere muze KB caller rict
+
+    Odpovedi se prehravaji po segmentech (filler, veta 1, veta 2),
+    takze staci vyrenderovat kazdou vetu a kazdy filler jednou.
+
+    Returns:
+        list: Unikatni segmenty (zachovane poradi)
+    """
+    kb = get_knowledge_base()
+    texts = []
+
+    fillers = [p['czech_phrase'] for p in kb.get_czech_phrases('filler', 'high')]
+
+    # 1. Fillery jako samostatne segmenty
+    texts.extend(ResponseSelector.filler_segment(filler) for filler in fillers)
+
+    # 2. Responses + alternativy (po vetach)
+    for row in kb.get_all_responses():
+        for column in ('response_text', 'alternative_1', 'alternative_2'):
+            texts.extend(split_sentences(row.get(column)))
+
+    # 3. Redirect templates (acknowledge muze nahradit filler)
+    for row in kb.get_all_redirects():
+        redirect_text = row.get('redirect_direct') or ''
+        for acknowledge in [row.get('acknowledge_short') or 'Jo'] + fillers:
+            texts.extend(TopicController.compose_redirect_segments(acknowledge, redirect_text))
+
+    texts.extend(split_sentences(TopicController.FALLBACK_REDIRECT))
+
+    # 4. Fallbacky ResponseSelectoru
+    for text in list(ResponseSelector.FALLBACKS.values()) + [ResponseSelector.DEFAULT_FALLBACK]:
+        texts.extend(split_sentences(text))
+
+    # 5. Fixni hlasky serveru (prehravaji se vcelku)
+    texts.extend(Phrases.all())
+
+    # 6. Osloveni kontaktu ve fronte (volitelne)
+    if contacts_limit:
+        intros = kb.get_best_response(stage='intro', sub_category='value_first', limit=5)
+        for contact in CallDB().get_contacts(status='new', limit=contacts_limit):
+            for intro in intros:
+                texts.extend(ColdCallerKB.personalize_greeting_segments(
+                    split_sentences(intro['response_text']),
+                    contact['name'],
+                    contact.get('company') or ''
+                ))
+
+    # Deduplikace se zachovanim poradi
+    seen = set()
+    unique = []
+    for text in texts:
+        text = text.strip()
+        if text and text not in seen:
+            seen.add(text)
+            unique.append(text)
+
+    return unique
+
+
+def _is_rate_limit(error):
+    """Je chyba rate limit (HTTP 429)?"""
+    status = getattr(error, 'status_code', None)
+    return status == 429 or '429' in str(error) or 'rate limit' in str(error).lower()
+
+
+def render_one(tts, text, gate):
+    """
+    Vyrenderuje jeden text s retry a exponencialnim backoffem
+
+    gate: sdilena udalost - pri rate limitu pozastavi vsechny workery
+    """
+    for attempt in range(1, MAX_RETRIES + 1):
+        gate.wait()
+
+        try:
+            tts.render(text)
+            return True
+
+        except Exception as e:
+            delay = BACKOFF_BASE ** attempt + random.uniform(0, 1)
+
+            if _is_rate_limit(e):
+                print(f"  ⏳ Rate limit - pauza {delay:.1f}s")
+                gate.clear()
+                time.sleep(delay)
+                gate.set()
+            elif attempt < MAX_RETRIES:
+                print(f"  ⚠️  {e} - retry za {delay:.1f}s")
+                time.sleep(delay)
+            else:
+                print(f"  ❌ Vzdavam: '{text[:50]}' ({e})")
+
+    return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Pre-render KB odpovedi do TTS cache')
+    parser.add_argument('--workers', type=int, default=4, help='Max paralelnich ElevenLabs requestu')
+    parser.add_argument('--contacts', type=int, default=0, help='Vyrenderuj i pozdravy pro N novych kontaktu')
+    parser.add_argument('--dry-run', action='store_true', help='Jen spocitej co chybi')
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("   PRE-RENDER TTS CACHE")
+    print("=" * 60)
+
+    tts = TTSEngine()
+    store = tts.store
+
+    texts = collect_texts(contacts_limit=args.contacts)
+
+    # Resumability - co uz v cache je, preskoc
+    missing = []
+    for text in texts:
+        key = tts.cache_key(text)
+        store.pin(key, 'prerender')
+        if not store.contains(key):
+            missing.append(text)
+
+    print(f"\n📋 Textu celkem: {len(texts)}")
+    print(f"   ✅ Uz v cache: {len(texts) - len(missing)}")
+    print(f"   🎤 K vyrenderovani: {len(missing)}")
+
+    if args.dry_run or not missing:
+        print("\n✅ Cache je tepla" if not missing else "\n(dry run)")
+        return
+
+    gate = threading.Event()
+    gate.set()
+
+    done = 0
+    failed = 0
+    started = time.time()
+
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        futures = {pool.submit(render_one, tts, text, gate): text for text in missing}
+
+        for future in as_completed(futures):
+            if future.result():
+                done += 1
+            else:
+                failed += 1
+
+            if (done + failed) % 10 == 0 or done + failed == len(missing):
+                print(f"  [{done + failed}/{len(missing)}] hotovo, {failed} chyb")
+
+    print(f"\n{'='*60}")
+    print(f"✅ Vyrenderovano: {done}")
+    print(f"❌ Selhalo: {failed}")
+    print(f"⏱️  Cas: {time.time() - started:.1f}s")
+
+    if failed:
+        print("\nSpust znovu - pokracuje se jen chybejicimi texty.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        print("\n\n⚠️  Preruseno - spust znovu pro pokracovani")
+        sys.exit(1)
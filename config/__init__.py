@@ -23,6 +23,31 @@ class Config:
     TEMPERATURE = 0.7
     MAX_TOKENS = 100  # ✅ Kratší odpovědi
     MAX_HISTORY = 8
+    AI_REPLY_MAX_CHARS = 200  # Delsi odpoved AI se utne na hranici vety
+    AI_REPLY_MAX_SENTENCES = 2  # /process stejne prehraje max 2 vety
+    
+    # Sdileny OpenAI klient (core/llm_client.py) - keep-alive pool pro cely proces
+    LLM_TIMEOUT = 60.0  # Default (reporty, learning); hovor si dava 5 s per request
+    LLM_MAX_CONNECTIONS = 20
+    LLM_KEEPALIVE_EXPIRY = 120  # s - spojeni mezi tahy hovoru zustane otevrene
+    LLM_MAX_CONCURRENCY = 16  # Soubezne LLM requesty (vsechna vlakna + asyncio)
+    
+    # Cache odpovedi AI (core/reply_cache.py) - jen vyjmenovane faze hovoru
+    REPLY_CACHE_STAGES = [s.strip() for s in os.getenv('REPLY_CACHE_STAGES', 'greeting,opening').split(',') if s.strip()]
+    REPLY_CACHE_TURNS = 2  # Klic = posledni K zprav (predchozi odpoved AI + zakaznik)
+    REPLY_CACHE_TTL = 3600  # s
+    REPLY_CACHE_MAX_ENTRIES = 5000
+    
+    # Spekulativni odpovedi behem prehravani (services/speculation.py)
+    SPECULATION_ENABLED = os.getenv('SPECULATION_ENABLED', 'true').lower() == 'true'
+    SPECULATION_STAGES = {  # faze hovoru -> predpocitane reakce zakaznika
+        'opening': ['yes', 'no', 'no_time'],
+        'conversation': ['yes', 'no', 'price', 'no_time'],
+    }
+    SPECULATION_MAX_INFLIGHT = 4  # Spekulace naraz (cely proces) - zbytek se preskoci
+    SPECULATION_TTL = 30  # s - starsi spekulace se nepouzije
+    SPECULATION_WAIT = 3.0  # s - max cekani na rozpracovanou spekulaci
+    SPECULATION_MAX_WORDS = 6  # Delsi odpoved zakaznika nese vic nez intent -> model
     
     # ElevenLabs
     ELEVENLABS_API_KEY = os.getenv('ELEVENLABS_API_KEY')
@@ -35,10 +60,68 @@ class Config:
     
     # Database
     DB_PATH = 'data/calls.db'
+    DB_BUSY_TIMEOUT = 5000  # ms - cekani na zamek misto 'database is locked'
+    DB_MMAP_SIZE = 64 * 1024 * 1024  # 64 MB memory-mapped I/O
+    DB_CACHE_SIZE_KB = 8192  # page cache na spojeni
+    DB_STATEMENT_CACHE = 256  # pripravene dotazy na spojeni
+    DB_POOL_SIZE = 8  # max otevrenych spojeni na databazi (sdileno vsemi vlakny)
+    DB_POOL_TIMEOUT = 30  # s - cekani na volne spojeni z poolu
+    
+    # Stav hovoru (konverzace, KB caller) - sdileny mezi workery
+    SESSION_BACKEND = os.getenv('SESSION_BACKEND', 'sqlite')  # memory / sqlite / redis
+    SESSION_DB = 'data/sessions.db'
+    REDIS_URL = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
+    SESSION_TTL = 1800  # s bez aktivity -> stav hovoru se smaze (hovor max 5 min)
+    SESSION_REAP_INTERVAL = 60  # Uklid na pozadi kazdou minutu
+    
+    # Fronta uloh po hovoru (AI report, learning) - mimo webhook
+    JOBS_DB = 'data/jobs.db'
+    JOBS_WORKERS = 2
+    JOBS_MAX_ATTEMPTS = 5
+    JOBS_BACKOFF_BASE = 2  # s (2, 4, 8, 16)
+    JOBS_LEASE = 300  # s - rozpracovana uloha spadleho workeru se vezme znovu
+    JOBS_POLL_INTERVAL = 2  # s
     
     # Audio cache
     AUDIO_CACHE_DIR = 'static/audio'
     AUDIO_CACHE_ENABLED = True
+    AUDIO_MANIFEST_DB = 'data/audio_manifest.db'  # ✅ Mimo static/ (neservuje se ven)
+    AUDIO_CACHE_MAX_MB = int(os.getenv('AUDIO_CACHE_MAX_MB', 500))  # Diskovy budget
+    AUDIO_CACHE_LOW_WATERMARK = 0.9  # Evikce az na 90% budgetu
+    AUDIO_CACHE_PROTECT_HITS = 5  # LFU ochrana - hot fraze jdou na radu az posledni
+    AUDIO_CACHE_MIN_AGE = 600  # Nevyhazuj audio pouzite v poslednich 10 min
+    AUDIO_CACHE_EVICT_INTERVAL = 300  # Evikce na pozadi kazdych 5 min
+    AUDIO_HIT_FLUSH_INTERVAL = 10  # s - hity z pameti do manifestu (write-behind)
+    AUDIO_HIT_FLUSH_MAX_KEYS = 1000  # Plny buffer se zapise hned
+    
+    # Streamovane TTS - Twilio hraje uz prvni chunky (necekame na celou syntezu)
+    TTS_STREAMING = True
+    TTS_STREAM_TIMEOUT = 30  # s bez noveho chunku -> ukonci stream
+    
+    # Phrase index (topic / off-topic / namitky) - jak casto kontrolovat zmenu tabulek v MySQL
+    PHRASE_INDEX_CHECK_INTERVAL = 30  # s
+    
+    # Usage citace KB (times_used, success_rate) - write-behind, ne na ceste hovoru
+    USAGE_FLUSH_INTERVAL_MS = 500
+    USAGE_FLUSH_MAX_EVENTS = 100
+    
+    # Invalidace cache (KB snapshot, produkty) po zmene DB z jineho procesu - max zastaralost
+    CACHE_INVALIDATION_INTERVAL_MS = 1000
+    
+    # Retrieval index nad KB situacemi (python -m cli.build_retrieval_index)
+    RETRIEVAL_INDEX_PATH = 'data/retrieval_index.npz'
+    RETRIEVAL_NGRAM_RANGE = (3, 5)  # znakove n-gramy
+    RETRIEVAL_MIN_SCORE = 0.45  # kosinova podobnost - pod tim plati puvodni flow
+    RETRIEVAL_MIN_WORDS = 3  # kratsi odpovedi (ano, ne, jo) ridi flow
+    
+    # Warm start - predpocitany KB snapshot, matcher a index (python -m cli.build_snapshot)
+    WARM_START_ENABLED = os.getenv('WARM_START_ENABLED', 'true').lower() == 'true'
+    WARM_START_PATH = 'data/warm_start.pkl'
+    WARM_START_REFRESH_INTERVAL = 300  # s - zastaraly artefakt se prepise nejvys jednou za 5 min
+    
+    # Pool pozdravu pro prichozi hovory (python -m cli.build_greetings)
+    GREETING_POOL_PATH = 'data/greeting_pool.json'
+    GREETING_POOL_SIZE = 8
 
 
 class CallConfig:
@@ -59,5 +142,6 @@ class CallConfig:
 
 # Export
 from .prompts import Prompts
+from .phrases import Phrases
 
-__all__ = ['Config', 'CallConfig', 'Prompts']
\ No newline at end of file
+__all__ = ['Config', 'CallConfig', 'Prompts', 'Phrases']
\ No newline at end of file
@@ -0,0 +1,24 @@
+"""
+Pevne fraze ktere server rika bez AI
+Na jednom miste - kvuli cache (pinning, pre-render)
+"""
+
+
+class Phrases:
+    """Fixni hlasky serveru"""
+    
+    TIMEOUT = "Musím ukončit hovor. Hezký den!"
+    HARD_REJECTION = "Rozumím, díky za čas. Hezký den."
+    NOT_UNDERSTOOD_END = "Omlouvám se, nerozumím. Hezký den."
+    CANT_HEAR = "Neslyším vás. Mluvte prosím hlasitěji."
+    REPEAT = "Nerozuměl jsem. Zopakujte prosím."
+    ERROR = "Omlouvám se, nastala chyba. Zkuste znovu."
+    OFF_TOPIC_END = "Rozumím. Pošlu vám email s informacemi. Hezký den!"
+    
+    @classmethod
+    def all(cls):
+        """Vsechny fixni fraze (pro pinning / pre-render)"""
+        return [
+            value for name, value in vars(cls).items()
+            if name.isupper() and isinstance(value, str)
+        ]
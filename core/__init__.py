@@ -3,7 +3,7 @@ Jadro aplikace - AI a TTS/STT enginy
 """
 
 from .ai_engine import AIEngine
-from .tts_engine import TTSEngine
+from .tts_engine import TTSEngine, split_sentences
 from .stt_engine import STTEngine
 
-__all__ = ['AIEngine', 'TTSEngine', 'STTEngine']
\ No newline at end of file
+__all__ = ['AIEngine', 'TTSEngine', 'STTEngine', 'split_sentences']
\ No newline at end of file
@@ -3,19 +3,96 @@ ChatGPT integrace
 OPTIMALIZOVÁNO: Rychlejší odpovědi, timeout
 """
 
-from openai import OpenAI
+import re
+import time
+
 from config import Config
+from core.llm_client import get_async_openai_client, get_llm_limiter, get_openai_client
+from core.reply_cache import get_reply_cache
+from core.session_store import get_session_store
+
+
+# Stejne hranice vet jako split_sentences (TTS segmenty)
+_SENTENCE_END = re.compile(r'(?<=[.!?…])\s+')
+
+FALLBACK_REPLY = "Promiňte, momentálně mám technické potíže. Můžete to zkusit znovu?"
+
+
+class _SentenceCutter:
+    """
+    Tokeny z LLM streamu -> hotove vety v ramci limitu odpovedi
+    
+    Vse pred posledni hranici vety je hotove; po prekroceni limitu
+    (znaky / vety) se nastavi capped a dalsi vety se zahodi.
+    """
+    
+    def __init__(self, max_chars=None, max_sentences=None):
+        self.max_chars = max_chars or Config.AI_REPLY_MAX_CHARS
+        self.max_sentences = max_sentences or Config.AI_REPLY_MAX_SENTENCES
+        self.sentences = []
+        self.capped = False
+        self.done = False  # stream dobehl (odpoved je cela)
+        self.failed = False  # chyba API - odpoved je fallback
+        self._buffer = ''
+        self._started = time.time()
+    
+    def _fits(self, sentence):
+        if not self.sentences:
+            return True  # prvni veta projde vzdy
+        length = sum(len(s) + 1 for s in self.sentences) + len(sentence)
+        counted = sum(1 for s in self.sentences + [sentence] if len(s.split()) > 1)
+        return length <= self.max_chars and counted <= self.max_sentences
+    
+    def _accept(self, parts):
+        accepted = []
+        for sentence in parts:
+            sentence = sentence.strip()
+            if not sentence or self.capped:
+                continue
+            if not self._fits(sentence):
+                self.capped = True
+                break
+            if not self.sentences:
+                print(f"  ⚡ První věta AI za {(time.time() - self._started) * 1000:.0f} ms")
+            self.sentences.append(sentence)
+            accepted.append(sentence)
+        return accepted
+    
+    def feed(self, text):
+        """Pridej tokeny, vrat nove hotove vety"""
+        *done, self._buffer = _SENTENCE_END.split(self._buffer + (text or ''))
+        return self._accept(done)
+    
+    def finish(self):
+        """Konec streamu - posledni veta (bez mezery za teckou)"""
+        rest, self._buffer = self._buffer, ''
+        self.done = True
+        return self._accept([rest])
+    
+    def fallback(self):
+        """Chyba API - nahradni odpoved, pokud jeste nic nezaznelo"""
+        self.failed = True
+        if self.sentences:
+            return []
+        self.sentences.append(FALLBACK_REPLY)
+        return [FALLBACK_REPLY]
 
 
 class AIEngine:
     """Engine pro komunikaci s ChatGPT"""
     
     def __init__(self):
-        self.client = OpenAI(
-            api_key=Config.OPENAI_API_KEY,
-            timeout=5.0  # ✅ NOVÉ: 5s timeout (standardně 60s!)
-        )
-        self.conversations = {}
+        # ✅ Sdileny klient (keep-alive pool) + spolecny limit soubeznych requestu
+        self.client = get_openai_client()
+        self.limiter = get_llm_limiter()
+        # Opakujici se kratke vymeny z pameti (jen faze z REPLY_CACHE_STAGES)
+        self.reply_cache = get_reply_cache()
+        # Historie konverzaci je v session store (sdilena mezi workery)
+        self.sessions = get_session_store()
+    
+    @staticmethod
+    def _key(session_id):
+        return f"conv:{session_id}"
     
     def start_conversation(self, session_id, system_prompt):
         """
@@ -25,65 +102,220 @@ class AIEngine:
             session_id: Unikatni ID konverzace (napr. call_sid)
             system_prompt: Systemovy prompt definujici chovani AI
         """
-        self.conversations[session_id] = [
+        self.sessions.set(self._key(session_id), [
             {"role": "system", "content": system_prompt}
-        ]
+        ])
     
-    def get_response(self, session_id, user_message):
+    def has_conversation(self, session_id):
+        """Existuje konverzace?"""
+        return self._key(session_id) in self.sessions
+    
+    def get_history(self, session_id):
         """
-        Ziska odpoved od AI
-        OPTIMALIZOVÁNO: Rychlejší s timeout
+        Vrati historii konverzace (kopie - zmeny je treba ulozit)
+        
+        Returns:
+            list: Zpravy, nebo [] pokud konverzace neexistuje
+        """
+        return self.sessions.get(self._key(session_id)) or []
+    
+    def append_message(self, session_id, role, content):
+        """Prida zpravu do existujici konverzace"""
+        history = self.get_history(session_id)
+        history.append({"role": role, "content": content})
+        self.sessions.set(self._key(session_id), self._trim_history(history))
+    
+    def get_response(self, session_id, user_message, stage=None):
+        """
+        Ziska odpoved od AI (cela odpoved najednou)
         
         Args:
             session_id: ID konverzace
             user_message: Zprava od uzivatele
+            stage: Faze hovoru - pokud je v REPLY_CACHE_STAGES, zkusi se cache
             
         Returns:
             str: Odpoved od AI
         """
-        if session_id not in self.conversations:
-            raise ValueError(f"Konverzace {session_id} neexistuje")
+        return ' '.join(self.stream_sentences(session_id, user_message, stage=stage))
+    
+    async def aget_response(self, session_id, user_message, stage=None):
+        """Async varianta get_response (sdileny AsyncOpenAI klient)"""
+        return ' '.join([s async for s in self.astream_sentences(session_id, user_message, stage=stage)])
+    
+    def stream_sentences(self, session_id, user_message, max_chars=None, max_sentences=None, stage=None):
+        """
+        Odpoved AI po vetach - kazda veta se vrati hned, jak ji model dopise
         
-        # Pridani user zpravy
-        self.conversations[session_id].append({
-            "role": "user",
-            "content": user_message
-        })
+        Volajici muze spustit TTS prvni vety, zatimco se generuje druha.
+        Po dosazeni limitu (znaky / vety jako v /process) se stream zavre -
+        zbytek odpovedi by se stejne zahodil.
         
-        # ⚡ OPTIMALIZOVANÉ VOLÁNÍ API
-        try:
-            response = self.client.chat.completions.create(
-                model=Config.OPENAI_MODEL,
-                messages=self.conversations[session_id],
-                temperature=Config.TEMPERATURE,
-                max_tokens=Config.MAX_TOKENS,
-                timeout=5.0,  # ✅ NOVÉ: 5s timeout
-                stream=False  # ✅ NOVÉ: vypnuto streaming (rychlejší pro krátké odpovědi)
-            )
-            
-            ai_message = response.choices[0].message.content.strip()
+        Args:
+            session_id: ID konverzace
+            user_message: Zprava od uzivatele
+            max_chars: Max delka odpovedi (prvni veta projde vzdy)
+            max_sentences: Max pocet vet (jednoslovne se nepocitaji)
+            stage: Faze hovoru pro reply cache (None = vzdy model)
             
+        Yields:
+            str: Vety odpovedi
+        """
+        history = self._start_turn(session_id, user_message)
+        cache_key = self._cache_key(history, stage, max_chars, max_sentences)
+        cached = cache_key and self.reply_cache.get(cache_key, stage)
+        if cached:
+            yield from self._serve_cached(session_id, history, cached)
+            return
+        
+        cutter = _SentenceCutter(max_chars, max_sentences)
+        
+        stream = None
+        try:
+            with self.limiter:
+                # ⚡ STREAMING - tokeny hned jak vznikaji
+                stream = self.client.chat.completions.create(
+                    messages=history, stream=True, **self._request_params()
+                )
+                for chunk in stream:
+                    if chunk.choices:
+                        yield from cutter.feed(chunk.choices[0].delta.content)
+                    if cutter.capped:
+                        break
+                yield from cutter.finish()
+        
         except Exception as e:
             print(f"⚠️  OpenAI timeout/error: {e}")
-            # Fallback odpověď
-            ai_message = "Promiňte, momentálně mám technické potíže. Můžete to zkusit znovu?"
+            yield from cutter.fallback()
+        
+        finally:
+            # Predcasny konec - dalsi tokeny nacitat nema smysl
+            if stream is not None and hasattr(stream, 'close'):
+                stream.close()
+            self._end_turn(session_id, history, cutter, cache_key)
+    
+    async def astream_sentences(self, session_id, user_message, max_chars=None, max_sentences=None, stage=None):
+        """Async varianta stream_sentences (async generator vet)"""
+        history = self._start_turn(session_id, user_message)
+        cache_key = self._cache_key(history, stage, max_chars, max_sentences)
+        cached = cache_key and self.reply_cache.get(cache_key, stage)
+        if cached:
+            for sentence in self._serve_cached(session_id, history, cached):
+                yield sentence
+            return
+        
+        cutter = _SentenceCutter(max_chars, max_sentences)
+        
+        stream = None
+        try:
+            async with self.limiter.slot():
+                stream = await get_async_openai_client().chat.completions.create(
+                    messages=history, stream=True, **self._request_params()
+                )
+                async for chunk in stream:
+                    if chunk.choices:
+                        for sentence in cutter.feed(chunk.choices[0].delta.content):
+                            yield sentence
+                    if cutter.capped:
+                        break
+                for sentence in cutter.finish():
+                    yield sentence
+        
+        except Exception as e:
+            print(f"⚠️  OpenAI timeout/error: {e}")
+            for sentence in cutter.fallback():
+                yield sentence
+        
+        finally:
+            if stream is not None and hasattr(stream, 'close'):
+                await stream.close()
+            self._end_turn(session_id, history, cutter, cache_key)
+    
+    def draft_reply(self, history, user_message, stage=None, cancelled=None):
+        """
+        Odpoved na hypotetickou zpravu - historie konverzace se nemeni
         
-        # Oriznutie prilis dlouhych odpovedi
-        if len(ai_message) > 200:
-            last_dot = ai_message[:200].rfind('.')
-            if last_dot > 0:
-                ai_message = ai_message[:last_dot + 1]
+        Pro spekulace (services/speculation.py): cancelled (Event) zavre
+        stream, jakmile spekulace prestane byt potreba.
         
-        # Pridani AI odpovedi do historie
-        self.conversations[session_id].append({
-            "role": "assistant",
-            "content": ai_message
-        })
+        Returns:
+            list: Vety odpovedi, nebo None (chyba / zruseno)
+        """
+        messages = history + [{"role": "user", "content": user_message}]
+        cache_key = self._cache_key(messages, stage, None, None)
+        cached = cache_key and self.reply_cache.get(cache_key, stage)
+        if cached:
+            return cached
+        
+        cutter = _SentenceCutter()
+        stream = None
+        try:
+            with self.limiter:
+                stream = self.client.chat.completions.create(
+                    messages=messages, stream=True, **self._request_params()
+                )
+                for chunk in stream:
+                    if cancelled is not None and cancelled.is_set():
+                        return None
+                    if chunk.choices:
+                        cutter.feed(chunk.choices[0].delta.content)
+                    if cutter.capped:
+                        break
+                cutter.finish()
         
-        # Omezeni velikosti historie
-        self._trim_history(session_id)
+        except Exception as e:
+            print(f"⚠️  OpenAI (draft) error: {e}")
+            return None
+        
+        finally:
+            if stream is not None and hasattr(stream, 'close'):
+                stream.close()
         
-        return ai_message
+        if cache_key:
+            self.reply_cache.put(cache_key, cutter.sentences)
+        return cutter.sentences or None
+    
+    def _start_turn(self, session_id, user_message):
+        history = self.sessions.get(self._key(session_id))
+        if history is None:
+            raise ValueError(f"Konverzace {session_id} neexistuje")
+        
+        history.append({"role": "user", "content": user_message})
+        return history
+    
+    def _cache_key(self, history, stage, max_chars, max_sentences):
+        """Klic do reply cache, nebo None (faze neni opt-in)"""
+        if not self.reply_cache.enabled_for(stage):
+            return None
+        return self.reply_cache.make_key(history[:-1], history[-1]['content'], max_chars, max_sentences)
+    
+    def _serve_cached(self, session_id, history, sentences):
+        """Odpoved z cache - do historie stejne jako od modelu"""
+        print(f"  ⚡ Odpověď AI z cache ({len(sentences)} vět)")
+        history.append({"role": "assistant", "content": ' '.join(sentences)})
+        self.sessions.set(self._key(session_id), self._trim_history(history))
+        return sentences
+    
+    def _end_turn(self, session_id, history, cutter, cache_key=None):
+        """Odpoved do historie i kdyz volajici prestal cist"""
+        if cutter.capped:
+            print(f"  ✂️  Stream AI ukončen po {len(cutter.sentences)} větách (limit)")
+        
+        # Jen cela odpoved modelu (ne fallback, ne stream utnuty volajicim)
+        if cache_key and cutter.done and not cutter.failed:
+            self.reply_cache.put(cache_key, cutter.sentences)
+        
+        history.append({"role": "assistant", "content": ' '.join(cutter.sentences)})
+        self.sessions.set(self._key(session_id), self._trim_history(history))
+    
+    @staticmethod
+    def _request_params():
+        return {
+            'model': Config.OPENAI_MODEL,
+            'temperature': Config.TEMPERATURE,
+            'max_tokens': Config.MAX_TOKENS,
+            'timeout': 5.0,  # ✅ 5s timeout (sdileny klient ma delsi pro reporty)
+        }
     
     def end_conversation(self, session_id):
         """
@@ -92,16 +324,13 @@ class AIEngine:
         Returns:
             list: Historie konverzace
         """
-        if session_id in self.conversations:
-            history = self.conversations[session_id]
-            del self.conversations[session_id]
-            return history
-        return []
+        history = self.get_history(session_id)
+        self.sessions.delete(self._key(session_id))
+        return history
     
-    def _trim_history(self, session_id):
+    def _trim_history(self, history):
         """Orizne historii na maximalni delku"""
-        if len(self.conversations[session_id]) > Config.MAX_HISTORY + 1:
+        if len(history) > Config.MAX_HISTORY + 1:
             # Zachovej system prompt + poslednich N zprav
-            self.conversations[session_id] = [
-                self.conversations[session_id][0]
-            ] + self.conversations[session_id][-Config.MAX_HISTORY:]
\ No newline at end of file
+            return [history[0]] + history[-Config.MAX_HISTORY:]
+        return history
@@ -0,0 +1,196 @@
+"""
+Sprava diskoveho budgetu audio cache
+LRU evikce s LFU ochranou hot frazi, bezi na pozadi (mimo request)
+Stejne vlakno zapisuje hity z pameti do manifestu (AudioStore.flush_hits).
+"""
+
+import glob
+import os
+import threading
+import time
+from collections import deque
+from typing import Dict, List
+
+from config import Config
+from core.audio_store import get_audio_store
+
+
+class AudioCacheManager:
+    """Hlida velikost AUDIO_CACHE_DIR a vyhazuje nejmene uzitecne audio"""
+
+    def __init__(self, store=None, max_bytes: int = None):
+        self.store = store or get_audio_store()
+        self.max_bytes = max_bytes or Config.AUDIO_CACHE_MAX_MB * 1024 * 1024
+        self.low_watermark = Config.AUDIO_CACHE_LOW_WATERMARK
+        self.protect_hits = Config.AUDIO_CACHE_PROTECT_HITS
+        self.min_age = Config.AUDIO_CACHE_MIN_AGE
+        self.interval = Config.AUDIO_CACHE_EVICT_INTERVAL
+        self.flush_interval = Config.AUDIO_HIT_FLUSH_INTERVAL
+
+        # Casy evikci (pro evictions/hour)
+        self._evictions = deque()
+        self.total_evictions = 0
+        self.bytes_evicted = 0
+
+        self._thread = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+    # ============================================================
+    # PINNING
+    # ============================================================
+
+    def pin_texts(self, tts, texts: List[str], label: str = 'hot'):
+        """Ochrani fraze (pozdravy, retry hlasky) pred evikci"""
+        for text in texts:
+            self.store.pin(tts.cache_key(text), label)
+
+    # ============================================================
+    # EVIKCE
+    # ============================================================
+
+    def evict(self) -> int:
+        """
+        Srovna cache pod budget
+
+        Poradi: nechranene (hit_count < PROTECT_HITS) podle LRU,
+        teprve potom chranene podle LRU. Pinned klice a audio pouzite
+        v poslednich MIN_AGE sekundach se nemazou nikdy.
+
+        Returns:
+            int: Pocet smazanych souboru
+        """
+        with self._lock:
+            # LRU/LFU poradi potrebuje aktualni hit_count a last_hit
+            self.store.flush_hits()
+            self._cleanup_temp_files()
+            self.store.purge_pending()
+
+            total = self.store.get_stats()['total_bytes']
+            if total <= self.max_bytes:
+                return 0
+
+            target = self.max_bytes * self.low_watermark
+            cutoff = time.time() - self.min_age
+
+            with self.store.db.transaction() as conn:
+                candidates = conn.execute("""
+                    SELECT key, path, size
+                    FROM audio_entries
+                    WHERE key NOT IN (SELECT key FROM pinned_keys)
+                      AND COALESCE(last_hit, created) < ?
+                    ORDER BY
+                        CASE WHEN hit_count >= ? THEN 1 ELSE 0 END ASC,
+                        COALESCE(last_hit, created) ASC
+                """, (cutoff, self.protect_hits)).fetchall()
+
+                evicted = []
+                for row in candidates:
+                    if total <= target:
+                        break
+
+                    try:
+                        os.remove(row['path'])
+                    except FileNotFoundError:
+                        pass
+                    except OSError as e:
+                        print(f"  ⚠️  Evikce {row['path']} selhala: {e}")
+                        continue
+
+                    total -= row['size']
+                    evicted.append((row['key'], row['size']))
+
+                conn.executemany(
+                    "DELETE FROM audio_entries WHERE key = ?",
+                    [(key,) for key, _ in evicted]
+                )
+
+            now = time.time()
+            for _, size in evicted:
+                self._evictions.append(now)
+                self.bytes_evicted += size
+            self.total_evictions += len(evicted)
+
+            if evicted:
+                print(f"🧹 Audio cache: vyhozeno {len(evicted)} souboru, zbyva {total / 1024 / 1024:.1f} MB")
+
+            return len(evicted)
+
+    def _cleanup_temp_files(self, max_age: int = 3600):
+        """Smaze zapomenute .tmp_ soubory (spadly zapis)"""
+        cutoff = time.time() - max_age
+        for path in glob.glob(os.path.join(self.store.cache_dir, '.tmp_*')):
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+            except OSError:
+                pass
+
+    # ============================================================
+    # BACKGROUND THREAD
+    # ============================================================
+
+    def start(self):
+        """Spusti evikci na pozadi"""
+        if self._thread and self._thread.is_alive():
+            return
+
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name='audio-cache-evictor', daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        """Zastavi vlakno"""
+        self._stop.set()
+
+    def _run(self):
+        next_evict = time.time() + self.interval
+        while not self._stop.wait(min(self.flush_interval, self.interval)):
+            try:
+                if time.time() >= next_evict:
+                    next_evict = time.time() + self.interval
+                    self.evict()
+                else:
+                    self.store.flush_hits()
+            except Exception as e:
+                print(f"  ⚠️  Audio cache evikce selhala: {e}")
+
+    # ============================================================
+    # METRIKY
+    # ============================================================
+
+    def get_metrics(self) -> Dict:
+        """Hit ratio, usetrene bajty, evikce za hodinu"""
+        hour_ago = time.time() - 3600
+        while self._evictions and self._evictions[0] < hour_ago:
+            self._evictions.popleft()
+
+        self.store.flush_hits()
+        stats = self.store.get_stats()
+
+        return {
+            **self.store.get_hit_stats(),
+            'entries': stats['entries'],
+            'total_bytes': stats['total_bytes'],
+            'budget_bytes': self.max_bytes,
+            'budget_used': round(stats['total_bytes'] / self.max_bytes, 4),
+            'evictions_last_hour': len(self._evictions),
+            'evictions_total': self.total_evictions,
+            'bytes_evicted': self.bytes_evicted,
+        }
+
+
+# ============================================================
+# SINGLETON INSTANCE
+# ============================================================
+
+_manager_instance = None
+
+def get_audio_cache_manager() -> AudioCacheManager:
+    """Ziskej singleton instance cache manageru"""
+    global _manager_instance
+    if _manager_instance is None:
+        _manager_instance = AudioCacheManager()
+    return _manager_instance
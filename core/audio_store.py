@@ -0,0 +1,346 @@
+"""
+Content-addressed uloziste TTS audia
+Klic = stabilni SHA-256 z normalizovaneho textu + hlasu + modelu + nastaveni hlasu,
+takze cache prezije restart serveru a sdili ji vsechny workery.
+
+Hity (hit_count, last_hit) se na hot path jen prictou v pameti - do
+manifestu je zapise flush_hits() v jedne transakci (AudioCacheManager
+na pozadi, pred evikci a metrikami, pri ukonceni procesu).
+"""
+
+import atexit
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+import unicodedata
+from typing import Dict, Optional
+
+from config import Config
+from database.manager import get_connection_manager
+
+
+# Verze formatu klice - zvys pokud se zmeni to, co vstupuje do digestu
+KEY_VERSION = 1
+
+
+def normalize_text(text: str) -> str:
+    """Normalizuje text pro klic (NFC, jednotne mezery)"""
+    text = unicodedata.normalize('NFC', text or '')
+    return ' '.join(text.split())
+
+
+def make_key(text: str, voice_id: str, model_id: str, voice_settings: Dict) -> str:
+    """
+    Vytvori stabilni klic pro audio
+
+    Na rozdil od hash() je SHA-256 stejny v kazdem procesu.
+    """
+    payload = json.dumps({
+        'v': KEY_VERSION,
+        'text': normalize_text(text),
+        'voice_id': voice_id,
+        'model_id': model_id,
+        'voice_settings': voice_settings,
+    }, sort_keys=True, ensure_ascii=False)
+
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class AudioStore:
+    """Uloziste audio souboru s manifestem (size, created, last_hit, hit_count)"""
+
+    def __init__(self, cache_dir: str = None, manifest_path: str = None):
+        self.cache_dir = cache_dir or Config.AUDIO_CACHE_DIR
+        self.manifest_path = manifest_path or Config.AUDIO_MANIFEST_DB
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        manifest_dir = os.path.dirname(self.manifest_path)
+        if manifest_dir:
+            os.makedirs(manifest_dir, exist_ok=True)
+
+        # Citace pro metriky (per proces)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.bytes_saved = 0
+
+        # Write-behind hitu: klic -> [pocet, last_hit, path, size]; chybejici soubory
+        self._hit_buffer: Dict[str, list] = {}
+        self._forget_buffer = set()
+        self._flush_lock = threading.Lock()
+        self.max_buffered = Config.AUDIO_HIT_FLUSH_MAX_KEYS
+
+        # Trvale spojeni per vlakno (WAL - vic workeru najednou)
+        self.db = get_connection_manager(self.manifest_path)
+
+        self._init_manifest()
+        atexit.register(self.flush_hits)
+
+    def _init_manifest(self):
+        """Vytvori tabulku manifestu"""
+        with self.db.transaction() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS audio_entries (
+                    key TEXT PRIMARY KEY,
+                    path TEXT NOT NULL,
+                    text TEXT,
+                    voice_id TEXT,
+                    model_id TEXT,
+                    size INTEGER NOT NULL DEFAULT 0,
+                    created REAL NOT NULL,
+                    last_hit REAL,
+                    hit_count INTEGER NOT NULL DEFAULT 0,
+                    legacy INTEGER NOT NULL DEFAULT 0
+                )
+            """)
+            # Klice ktere se nikdy nemaji vyhodit (hot fraze serveru)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS pinned_keys (
+                    key TEXT PRIMARY KEY,
+                    label TEXT
+                )
+            """)
+            # Texty cekajici na streamovanou syntezu (sdilene mezi workery)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS pending_synthesis (
+                    key TEXT PRIMARY KEY,
+                    text TEXT NOT NULL,
+                    created REAL NOT NULL
+                )
+            """)
+
+    # ============================================================
+    # CESTY
+    # ============================================================
+
+    def path_for(self, key: str) -> str:
+        """Cesta k souboru pro dany klic"""
+        return os.path.join(self.cache_dir, f"tts_{key}.mp3")
+
+    # ============================================================
+    # CTENI
+    # ============================================================
+
+    def lookup(self, key: str) -> Optional[str]:
+        """
+        Najde audio podle klice a zaznamena hit (jen v pameti)
+
+        Returns:
+            str: Cesta k souboru, nebo None (miss)
+        """
+        path = self.path_for(key)
+
+        if not os.path.exists(path):
+            with self._lock:
+                self.misses += 1
+                self._hit_buffer.pop(key, None)
+                self._forget_buffer.add(key)
+            return None
+
+        size = os.path.getsize(path)
+        with self._lock:
+            self.hits += 1
+            self.bytes_saved += size
+
+            entry = self._hit_buffer.get(key)
+            if entry is None:
+                self._hit_buffer[key] = [1, time.time(), path, size]
+            else:
+                entry[0] += 1
+                entry[1] = time.time()
+            full = len(self._hit_buffer) >= self.max_buffered
+
+        # Strop pameti - jinak zapisuje AudioCacheManager na pozadi
+        if full:
+            self.flush_hits()
+
+        return path
+
+    def flush_hits(self) -> int:
+        """
+        Zapise nasbirane hity a chybejici soubory v jedne transakci
+
+        Returns:
+            int: Pocet zapsanych klicu
+        """
+        with self._flush_lock:
+            with self._lock:
+                hits, self._hit_buffer = self._hit_buffer, {}
+                forget, self._forget_buffer = self._forget_buffer, set()
+
+            # Mezitim ho mohl vytvorit jiny worker - maz jen kdyz soubor porad chybi
+            forget = [key for key in forget if not os.path.exists(self.path_for(key))]
+            if not hits and not forget:
+                return 0
+
+            now = time.time()
+            with self.db.transaction() as conn:
+                conn.executemany("""
+                    UPDATE audio_entries
+                    SET hit_count = hit_count + ?, last_hit = MAX(COALESCE(last_hit, 0), ?)
+                    WHERE key = ?
+                """, [(count, last_hit, key) for key, (count, last_hit, _, _) in hits.items()])
+
+                # Soubor existuje, ale chybi v manifestu (napr. kopie z jineho stroje)
+                conn.executemany("""
+                    INSERT OR IGNORE INTO audio_entries
+                        (key, path, size, created, last_hit, hit_count)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                """, [(key, path, size, now, last_hit, count)
+                      for key, (count, last_hit, path, size) in hits.items()])
+
+                conn.executemany(
+                    "DELETE FROM audio_entries WHERE key = ?", [(key,) for key in forget]
+                )
+
+            return len(hits) + len(forget)
+
+    def contains(self, key: str) -> bool:
+        """Existuje audio pro klic? (bez zapoctu hitu)"""
+        return os.path.exists(self.path_for(key))
+
+    def get_entry(self, key: str) -> Optional[Dict]:
+        """Vrati radek manifestu (vcetne dosud nezapsanych hitu)"""
+        self.flush_hits()
+        row = self.db.fetchone(
+            "SELECT * FROM audio_entries WHERE key = ?", (key,)
+        )
+        return dict(row) if row else None
+
+    # ============================================================
+    # ZAPIS
+    # ============================================================
+
+    def put(
+        self,
+        key: str,
+        audio_bytes: bytes,
+        text: str = None,
+        voice_id: str = None,
+        model_id: str = None
+    ) -> str:
+        """
+        Atomicky ulozi audio (temp soubor + rename)
+
+        Polovicaty mp3 se tak nikdy neservuje - soubor se objevi
+        pod finalnim jmenem az kdyz je cely zapsany.
+        """
+        path = self.path_for(key)
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, prefix='.tmp_', suffix='.mp3')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(audio_bytes)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+        self._record(key, path, len(audio_bytes), text, voice_id, model_id)
+        return path
+
+    def _record(self, key, path, size, text=None, voice_id=None, model_id=None,
+                created=None, legacy=False):
+        """Zapise (nebo prepise) radek manifestu"""
+        with self._lock:
+            self._forget_buffer.discard(key)
+
+        with self.db.transaction() as conn:
+            conn.execute("""
+                INSERT INTO audio_entries
+                    (key, path, text, voice_id, model_id, size, created, legacy)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(key) DO UPDATE SET
+                    path = excluded.path,
+                    size = excluded.size,
+                    text = COALESCE(excluded.text, audio_entries.text)
+            """, (key, path, text, voice_id, model_id, size,
+                  created or time.time(), 1 if legacy else 0))
+
+    def pin(self, key: str, label: str = None):
+        """Oznaci klic jako chraneny pred eviction"""
+        with self.db.transaction() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO pinned_keys (key, label) VALUES (?, ?)",
+                (key, label)
+            )
+
+    # ============================================================
+    # PENDING (streamovana synteza)
+    # ============================================================
+
+    def add_pending(self, key: str, text: str):
+        """Zaregistruje text pro /tts/stream/<key> (muze ho obslouzit jiny worker)"""
+        with self.db.transaction() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO pending_synthesis (key, text, created) VALUES (?, ?, ?)",
+                (key, text, time.time())
+            )
+
+    def get_pending(self, key: str) -> Optional[str]:
+        """Text cekajici na syntezu, nebo None"""
+        row = self.db.fetchone(
+            "SELECT text FROM pending_synthesis WHERE key = ?", (key,)
+        )
+        return row['text'] if row else None
+
+    def remove_pending(self, key: str):
+        """Synteza dokoncena - audio uz je v cache"""
+        with self.db.transaction() as conn:
+            conn.execute("DELETE FROM pending_synthesis WHERE key = ?", (key,))
+
+    def purge_pending(self, max_age: int = 3600) -> int:
+        """Smaze stare pending zaznamy (hovor skoncil driv nez Twilio audio stahl)"""
+        with self.db.transaction() as conn:
+            cur = conn.execute(
+                "DELETE FROM pending_synthesis WHERE created < ?",
+                (time.time() - max_age,)
+            )
+        return cur.rowcount
+
+    # ============================================================
+    # STATS
+    # ============================================================
+
+    def get_hit_stats(self) -> Dict:
+        """Hit/miss citace tohoto procesu"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': round(self.hits / total, 4) if total else 0.0,
+                'bytes_saved': self.bytes_saved,
+                'buffered_hits': len(self._hit_buffer),
+            }
+
+    def get_stats(self) -> Dict:
+        """Zakladni statistiky manifestu"""
+        row = self.db.fetchone("""
+            SELECT COUNT(*) AS entries,
+                   COALESCE(SUM(size), 0) AS total_bytes,
+                   COALESCE(SUM(hit_count), 0) AS total_hits,
+                   COALESCE(SUM(legacy), 0) AS legacy_entries
+            FROM audio_entries
+        """)
+        return dict(row)
+
+
+# ============================================================
+# SINGLETON INSTANCE
+# ============================================================
+
+_store_instance = None
+
+def get_audio_store() -> AudioStore:
+    """Ziskej singleton instance audio store"""
+    global _store_instance
+    if _store_instance is None:
+        _store_instance = AudioStore()
+    return _store_instance
@@ -0,0 +1,294 @@
+"""
+Trvala fronta uloh na pozadi (SQLite)
+Pomale veci po hovoru (AI report, ulozeni, learning) nebezi ve webhooku -
+webhook jen zaradi ulohu a hned vrati odpoved. Fronta prezije restart.
+
+Kazda uloha je unikatni podle (kind, call_sid) - Twilio muze status
+callback poslat vickrat, zpracuje se jednou.
+"""
+
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+from config import Config
+
+
+class JobQueue:
+    """SQLite fronta s worker poolem, retry s backoffem a lease"""
+
+    def __init__(self, path: str = None):
+        self.path = path or Config.JOBS_DB
+        self.max_attempts = Config.JOBS_MAX_ATTEMPTS
+        self.backoff_base = Config.JOBS_BACKOFF_BASE
+        self.lease = Config.JOBS_LEASE
+        self.poll_interval = Config.JOBS_POLL_INTERVAL
+
+        db_dir = os.path.dirname(self.path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+
+        self._handlers: Dict[str, Callable[[Dict], None]] = {}
+        self._threads = []
+        self._stop = threading.Event()
+        self._wakeup = threading.Event()
+
+        self._init_db()
+
+    def _connect(self):
+        """Spojeni na frontu (WAL - webhook zapisuje, workery ctou)"""
+        conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA busy_timeout=5000")
+        return conn
+
+    def _init_db(self):
+        conn = self._connect()
+        try:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    kind TEXT NOT NULL,
+                    call_sid TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'queued',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    max_attempts INTEGER NOT NULL,
+                    run_after REAL NOT NULL,
+                    lease_until REAL,
+                    worker TEXT,
+                    last_error TEXT,
+                    created REAL NOT NULL,
+                    updated REAL NOT NULL,
+                    UNIQUE (kind, call_sid)
+                )
+            """)
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_jobs_ready
+                ON jobs (status, run_after)
+            """)
+        finally:
+            conn.close()
+
+    # ============================================================
+    # ZARAZENI
+    # ============================================================
+
+    def enqueue(self, kind: str, call_sid: str, payload: Dict,
+                max_attempts: int = None, delay: float = 0) -> bool:
+        """
+        Zaradi ulohu (idempotentne podle kind + call_sid)
+
+        Returns:
+            bool: True pokud je uloha nova, False pokud uz ve fronte byla
+        """
+        now = time.time()
+        conn = self._connect()
+        try:
+            cur = conn.execute("""
+                INSERT OR IGNORE INTO jobs
+                    (kind, call_sid, payload, max_attempts, run_after, created, updated)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, (kind, call_sid, json.dumps(payload, ensure_ascii=False),
+                  max_attempts or self.max_attempts, now + delay, now, now))
+            created = cur.rowcount == 1
+        finally:
+            conn.close()
+
+        if created:
+            self._wakeup.set()
+        return created
+
+    # ============================================================
+    # ZPRACOVANI
+    # ============================================================
+
+    def claim(self, worker: str) -> Optional[sqlite3.Row]:
+        """
+        Vezme jednu pripravenou ulohu
+
+        Uloha 'running' s proslym leasem (spadly worker / restart)
+        se bere znovu - pokud uz vycerpala pokusy, je 'failed'
+        (fail() se po padu workeru nezavola).
+        """
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            expired = conn.execute("""
+                UPDATE jobs
+                SET status = 'failed', lease_until = NULL, updated = ?,
+                    last_error = COALESCE(last_error, 'lease vyprsel (worker spadl)')
+                WHERE status = 'running' AND lease_until < ? AND attempts >= max_attempts
+            """, (now, now)).rowcount
+            if expired:
+                print(f"  ❌ {expired} job(s) definitivne selhalo - lease vyprsel po poslednim pokusu")
+
+            row = conn.execute("""
+                SELECT * FROM jobs
+                WHERE (status = 'queued' AND run_after <= ?)
+                   OR (status = 'running' AND lease_until < ?)
+                ORDER BY run_after
+                LIMIT 1
+            """, (now, now)).fetchone()
+
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+
+            conn.execute("""
+                UPDATE jobs
+                SET status = 'running', attempts = attempts + 1,
+                    lease_until = ?, worker = ?, updated = ?
+                WHERE id = ?
+            """, (now + self.lease, worker, now, row['id']))
+            conn.execute("COMMIT")
+
+            return conn.execute("SELECT * FROM jobs WHERE id = ?", (row['id'],)).fetchone()
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def complete(self, job: sqlite3.Row):
+        """Uloha hotova"""
+        self._update(job, "status = 'done', lease_until = NULL, last_error = NULL")
+
+    def fail(self, job: sqlite3.Row, error: Exception):
+        """Neuspech - dalsi pokus s exponencialnim backoffem, nebo 'failed'"""
+        if job['attempts'] >= job['max_attempts']:
+            if not self._update(job, "status = 'failed', lease_until = NULL, last_error = ?", (str(error),)):
+                return
+            print(f"  ❌ Job #{job['id']} {job['kind']} definitivne selhal: {error}")
+            return
+
+        delay = self.backoff_base ** job['attempts']
+        if not self._update(
+            job,
+            "status = 'queued', lease_until = NULL, last_error = ?, run_after = ?",
+            (str(error), time.time() + delay)
+        ):
+            return
+        print(f"  ⚠️  Job #{job['id']} {job['kind']} selhal ({error}) - retry za {delay:.0f}s")
+
+    def _update(self, job, assignments, params=()) -> bool:
+        """
+        Zapis vysledku - jen dokud ulohu drzi tento worker
+
+        Po vyprseni leasu ji mohl vzit jiny worker; jeho vysledek
+        se neprepisuje. Returns: False pokud uz uloha patri jinemu.
+        """
+        conn = self._connect()
+        try:
+            cur = conn.execute(
+                f"UPDATE jobs SET {assignments}, updated = ? "
+                f"WHERE id = ? AND status = 'running' AND worker = ?",
+                (*params, time.time(), job['id'], job['worker'])
+            )
+        finally:
+            conn.close()
+
+        if cur.rowcount != 1:
+            print(f"  ⚠️  Job #{job['id']} {job['kind']}: lease ztracen, vysledek zahozen")
+            return False
+        return True
+
+    def run_one(self, worker: str = 'main') -> bool:
+        """
+        Zpracuje jednu ulohu (pokud nejaka je)
+
+        Returns:
+            bool: True pokud se neco zpracovalo
+        """
+        job = self.claim(worker)
+        if job is None:
+            return False
+
+        handler = self._handlers.get(job['kind'])
+        if handler is None:
+            self.fail(job, RuntimeError(f"Neznamy typ ulohy: {job['kind']}"))
+            return True
+
+        try:
+            handler(json.loads(job['payload']))
+            self.complete(job)
+        except Exception as e:
+            self.fail(job, e)
+
+        return True
+
+    # ============================================================
+    # WORKERY
+    # ============================================================
+
+    def register(self, kind: str, handler: Callable[[Dict], None]):
+        """Handler pro typ ulohy - vyjimka = retry"""
+        self._handlers[kind] = handler
+
+    def start(self, workers: int = None):
+        """Spusti worker vlakna"""
+        if self._threads:
+            return
+
+        self._stop.clear()
+        host = socket.gethostname()
+
+        for i in range(workers or Config.JOBS_WORKERS):
+            name = f"{host}:{os.getpid()}:job-{i}"
+            thread = threading.Thread(target=self._run, args=(name,), name=f'job-worker-{i}', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self):
+        """Zastavi workery (rozpracovane ulohy dobehnou nebo je vezme lease)"""
+        self._stop.set()
+        self._wakeup.set()
+
+    def _run(self, worker):
+        while not self._stop.is_set():
+            try:
+                if self.run_one(worker):
+                    continue
+            except Exception as e:
+                print(f"  ⚠️  Job worker {worker}: {e}")
+
+            # Prazdna fronta - cekej na enqueue nebo na dalsi poll (retry, jine procesy)
+            self._wakeup.wait(self.poll_interval)
+            self._wakeup.clear()
+
+    # ============================================================
+    # METRIKY
+    # ============================================================
+
+    def get_stats(self) -> Dict:
+        """Pocet uloh podle stavu"""
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT status, COUNT(*) AS n FROM jobs GROUP BY status"
+            ).fetchall()
+            stats = {'queued': 0, 'running': 0, 'done': 0, 'failed': 0}
+            stats.update({row['status']: row['n'] for row in rows})
+            return stats
+        finally:
+            conn.close()
+
+
+# ============================================================
+# SINGLETON INSTANCE
+# ============================================================
+
+_queue_instance = None
+
+def get_job_queue() -> JobQueue:
+    """Ziskej singleton instance fronty"""
+    global _queue_instance
+    if _queue_instance is None:
+        _queue_instance = JobQueue()
+    return _queue_instance
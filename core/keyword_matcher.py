@@ -0,0 +1,72 @@
+"""
+Vicevzorovy matcher klicovych slov
+Jeden pruchod textem pro vsechna klicova slova vsech intentu
+(misto desitek any(x in text ...) smycek).
+
+Semantika je stejna jako `keyword in text.lower()` (podretezec),
+jen bez ohledu na diakritiku - Twilio STT ji obcas vynecha.
+"""
+
+import re
+import unicodedata
+from typing import Dict, FrozenSet, Iterable, List
+
+
+def normalize(text: str) -> str:
+    """Mala pismena, bez diakritiky, jednotne mezery"""
+    text = unicodedata.normalize('NFKD', (text or '').lower())
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch))
+    return ' '.join(text.split())
+
+
+class KeywordMatcher:
+    """
+    Zkompilovany matcher: {intent: [klicova slova]} -> nalezene intenty
+
+    Jeden regex s lookaheadem zkousi vsechna slova na kazde pozici textu.
+    Alternativy jsou serazene od nejdelsi, takze na dane pozici vyhraje
+    nejdelsi shoda - vsechna ostatni slova shodna na teze pozici jsou jeji
+    prefixy a doplni se z predpocitaneho prefixoveho uzaveru.
+    """
+
+    def __init__(self, tables: Dict[str, Iterable[str]]):
+        # normalizovane slovo -> intenty ktere ho obsahuji
+        self._intents_by_keyword: Dict[str, set] = {}
+        for intent, keywords in tables.items():
+            for keyword in keywords:
+                keyword = normalize(keyword)
+                if keyword:
+                    self._intents_by_keyword.setdefault(keyword, set()).add(intent)
+
+        keywords = sorted(self._intents_by_keyword, key=len, reverse=True)
+
+        # slovo -> vsechna slova ktera jsou jeho prefixem (vcetne nej)
+        self._prefix_closure: Dict[str, List[str]] = {
+            keyword: [other for other in keywords if keyword.startswith(other)]
+            for keyword in keywords
+        }
+
+        pattern = '|'.join(re.escape(keyword) for keyword in keywords)
+        self._regex = re.compile(f"(?=({pattern}))") if keywords else None
+
+        self.intents = frozenset(tables)
+
+    def match(self, text: str) -> Dict[str, FrozenSet[str]]:
+        """
+        Returns:
+            dict: intent -> mnozina nalezenych (normalizovanych) slov;
+                  intenty bez shody v nem nejsou
+        """
+        if self._regex is None:
+            return {}
+
+        found = set()
+        for m in self._regex.finditer(normalize(text)):
+            found.update(self._prefix_closure[m.group(1)])
+
+        result: Dict[str, set] = {}
+        for keyword in found:
+            for intent in self._intents_by_keyword[keyword]:
+                result.setdefault(intent, set()).add(keyword)
+
+        return {intent: frozenset(words) for intent, words in result.items()}
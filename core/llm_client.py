@@ -0,0 +1,164 @@
+"""
+Sdileny OpenAI klient pro cely proces
+
+Driv si kazdy AIEngine / CallReporter / AutoLearningSystem vytvoril
+vlastni OpenAI() = vlastni connection pool, TLS handshake znovu pro
+kazdou instanci. Ted je jeden sync a jeden async klient na proces:
+- keep-alive pool (LLM_MAX_CONNECTIONS), spojeni se recykluji mezi hovory
+- HTTP/2, pokud je nainstalovane h2 (pip install httpx[http2]) -
+  vic requestu pres jedno spojeni
+- spolecny limit soubeznych requestu (sync i async) - spicka hovoru
+  nezahlti API ani pool
+"""
+
+import asyncio
+import importlib.util
+import threading
+import weakref
+from contextlib import asynccontextmanager
+from typing import Dict
+
+import httpx
+from openai import AsyncOpenAI, OpenAI
+
+from config import Config
+
+
+HTTP2 = importlib.util.find_spec('h2') is not None
+
+
+def _limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=Config.LLM_MAX_CONNECTIONS,
+        max_keepalive_connections=Config.LLM_MAX_CONNECTIONS,
+        keepalive_expiry=Config.LLM_KEEPALIVE_EXPIRY,
+    )
+
+
+class ConcurrencyLimiter:
+    """
+    Spolecny strop soubeznych LLM requestu pro vlakna i asyncio
+
+    Sync: `with limiter:`. Async: `async with limiter.slot():` - kdyz je
+    plno, ceka se ve vlakne executoru (event loop se neblokuje).
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self._semaphore = threading.BoundedSemaphore(limit)
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.waiting = 0
+        self.total = 0
+
+    def _acquired(self):
+        with self._lock:
+            self.in_flight += 1
+            self.total += 1
+
+    def __enter__(self):
+        if not self._semaphore.acquire(blocking=False):
+            with self._lock:
+                self.waiting += 1
+            try:
+                self._semaphore.acquire()
+            finally:
+                with self._lock:
+                    self.waiting -= 1
+        self._acquired()
+        return self
+
+    def _release_abandoned(self, future):
+        if not future.cancelled() and future.exception() is None:
+            self._semaphore.release()
+
+    def __exit__(self, *exc):
+        with self._lock:
+            self.in_flight -= 1
+        self._semaphore.release()
+
+    @asynccontextmanager
+    async def slot(self):
+        if not self._semaphore.acquire(blocking=False):
+            with self._lock:
+                self.waiting += 1
+            acquiring = asyncio.get_running_loop().run_in_executor(None, self._semaphore.acquire)
+            try:
+                await asyncio.shield(acquiring)
+            except asyncio.CancelledError:
+                # Vlakno executoru slot stejne ziska - vrat ho, az ho dostane
+                acquiring.add_done_callback(self._release_abandoned)
+                raise
+            finally:
+                with self._lock:
+                    self.waiting -= 1
+        self._acquired()
+        try:
+            yield self
+        finally:
+            self.__exit__()
+
+
+# ============================================================
+# SINGLETON INSTANCE
+# ============================================================
+
+_client_instance = None
+_async_clients: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncOpenAI]' = weakref.WeakKeyDictionary()
+_limiter_instance = None
+_clients_lock = threading.Lock()
+
+def get_openai_client() -> OpenAI:
+    """Sdileny sync klient (keep-alive pool)"""
+    global _client_instance
+    if _client_instance is None:
+        with _clients_lock:
+            if _client_instance is None:
+                _client_instance = OpenAI(
+                    api_key=Config.OPENAI_API_KEY,
+                    timeout=Config.LLM_TIMEOUT,
+                    http_client=httpx.Client(http2=HTTP2, limits=_limits(), timeout=Config.LLM_TIMEOUT),
+                )
+    return _client_instance
+
+
+def get_async_openai_client() -> AsyncOpenAI:
+    """
+    Sdileny async klient pro bezici event loop
+
+    httpx.AsyncClient je svazany s loopem, ve kterem otevrel spojeni -
+    kazdy loop ma proto svuj (typicky je v procesu jeden).
+    """
+    loop = asyncio.get_running_loop()
+    with _clients_lock:
+        client = _async_clients.get(loop)
+        if client is None:
+            client = _async_clients[loop] = AsyncOpenAI(
+                api_key=Config.OPENAI_API_KEY,
+                timeout=Config.LLM_TIMEOUT,
+                http_client=httpx.AsyncClient(http2=HTTP2, limits=_limits(), timeout=Config.LLM_TIMEOUT),
+            )
+    return client
+
+
+def get_llm_limiter() -> ConcurrencyLimiter:
+    """Sdileny limit soubeznych LLM requestu"""
+    global _limiter_instance
+    if _limiter_instance is None:
+        with _clients_lock:
+            if _limiter_instance is None:
+                _limiter_instance = ConcurrencyLimiter(Config.LLM_MAX_CONCURRENCY)
+    return _limiter_instance
+
+
+def get_metrics() -> Dict:
+    limiter = get_llm_limiter()
+    return {
+        'http2': HTTP2,
+        'max_connections': Config.LLM_MAX_CONNECTIONS,
+        'max_concurrency': limiter.limit,
+        'in_flight': limiter.in_flight,
+        'waiting': limiter.waiting,
+        'requests_total': limiter.total,
+        'async_clients': len(_async_clients),
+    }
@@ -0,0 +1,145 @@
+"""
+Cache odpovedi AI pro opakujici se kratke vymeny
+
+"ano", "halo", "slysime se", "kolik to stoji" se opakuji v tisicich
+hovoru se stejnym system promptem - kazda takova vymena je jinak cely
+OpenAI request. Klic = digest system promptu (+ model a limity odpovedi)
+a normalizovanych poslednich K zprav vcetne aktualni zpravy zakaznika.
+
+Cache je opt-in po fazich hovoru (Config.REPLY_CACHE_STAGES):
+deterministicke casti flow jdou z pameti, personalizovane tahy dal
+na model. V pameti procesu, TTL + LRU strop na pocet polozek.
+"""
+
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+from config import Config
+from core.keyword_matcher import normalize
+
+
+_PUNCTUATION = re.compile(r'[^\w\s]')
+
+
+def normalize_turn(text: str) -> str:
+    """Bez diakritiky, interpunkce a velikosti pismen ("Ano." == "ano")"""
+    return ' '.join(_PUNCTUATION.sub(' ', normalize(text)).split())
+
+
+class ReplyCache:
+    """LRU cache odpovedi s TTL a hit-rate metrikami po fazich"""
+
+    def __init__(self, max_entries: int = None, ttl: float = None, turns: int = None):
+        self.max_entries = max_entries or Config.REPLY_CACHE_MAX_ENTRIES
+        self.ttl = ttl or Config.REPLY_CACHE_TTL
+        self.turns = turns or Config.REPLY_CACHE_TURNS
+        self.stages = frozenset(Config.REPLY_CACHE_STAGES)
+
+        self._entries = OrderedDict()  # klic -> (vety, ulozeno)
+        self._lock = threading.Lock()
+
+        self._stats = {}  # faze -> {'hits': n, 'misses': n}
+        self.stores = 0
+        self.evictions = 0
+        self.expired = 0
+
+    def enabled_for(self, stage: Optional[str]) -> bool:
+        return bool(stage) and stage in self.stages
+
+    def make_key(self, history: List[Dict], user_message: str, max_chars=None, max_sentences=None) -> str:
+        """
+        Klic z historie PRED aktualnim tahem + zpravy zakaznika
+
+        System prompt jde do klice jen jako digest, z konverzace se bere
+        poslednich `turns` zprav (aktualni zprava zakaznika je jedna z nich).
+        """
+        system = history[0]['content'] if history and history[0]['role'] == 'system' else ''
+        prompt_digest = hashlib.sha1(system.encode('utf-8')).hexdigest()
+
+        messages = [m for m in history if m['role'] != 'system']
+        messages.append({'role': 'user', 'content': user_message})
+        turns = [f"{m['role']}:{normalize_turn(m['content'])}" for m in messages[-self.turns:]]
+
+        raw = '\x1f'.join([
+            prompt_digest, Config.OPENAI_MODEL,
+            str(max_chars or Config.AI_REPLY_MAX_CHARS),
+            str(max_sentences or Config.AI_REPLY_MAX_SENTENCES),
+            *turns,
+        ])
+        return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+    def get(self, key: str, stage: str) -> Optional[List[str]]:
+        """Vety odpovedi, nebo None (miss / expirovano)"""
+        now = time.time()
+        with self._lock:
+            stats = self._stats.setdefault(stage, {'hits': 0, 'misses': 0})
+            entry = self._entries.get(key)
+            if entry and now - entry[1] > self.ttl:
+                del self._entries[key]
+                self.expired += 1
+                entry = None
+
+            if entry is None:
+                stats['misses'] += 1
+                return None
+
+            self._entries.move_to_end(key)
+            stats['hits'] += 1
+            return list(entry[0])
+
+    def put(self, key: str, sentences: List[str]):
+        if not sentences:
+            return
+        with self._lock:
+            self._entries[key] = (list(sentences), time.time())
+            self._entries.move_to_end(key)
+            self.stores += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get_metrics(self) -> Dict:
+        with self._lock:
+            stages = {
+                stage: dict(stats, hit_rate=round(stats['hits'] / max(1, stats['hits'] + stats['misses']), 4))
+                for stage, stats in self._stats.items()
+            }
+            hits = sum(s['hits'] for s in self._stats.values())
+            lookups = hits + sum(s['misses'] for s in self._stats.values())
+            return {
+                'enabled_stages': sorted(self.stages),
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': hits,
+                'misses': lookups - hits,
+                'hit_rate': round(hits / max(1, lookups), 4),
+                'stores': self.stores,
+                'evictions': self.evictions,
+                'expired': self.expired,
+                'stages': stages,
+            }
+
+
+# ============================================================
+# SINGLETON INSTANCE
+# ============================================================
+
+_cache_instance = None
+_cache_lock = threading.Lock()
+
+def get_reply_cache() -> ReplyCache:
+    """Sdilena cache odpovedi pro proces"""
+    global _cache_instance
+    if _cache_instance is None:
+        with _cache_lock:
+            if _cache_instance is None:
+                _cache_instance = ReplyCache()
+    return _cache_instance
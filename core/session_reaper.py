@@ -0,0 +1,132 @@
+"""
+Uklid opustenych hovoru
+TTL podle posledni aktivity - zavesene, timeoutovane a failed hovory
+nezustanou v pameti (ani v session store) navzdy.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Dict
+
+from config import Config
+from core.session_store import get_session_store
+
+
+class SessionReaper:
+    """Maze stav hovoru bez aktivity delsi nez SESSION_TTL"""
+
+    # Prefixy klicu v session store (viz AIEngine, server)
+    PREFIXES = ('conv:', 'kb:')
+
+    # Twilio CallStatus po kterych uz zadny webhook neprijde
+    TERMINAL_STATUSES = ('completed', 'busy', 'failed', 'no-answer', 'canceled')
+
+    def __init__(self, store=None, ttl: int = None, interval: int = None):
+        self.store = store or get_session_store()
+        self.ttl = ttl or Config.SESSION_TTL
+        self.interval = interval or Config.SESSION_REAP_INTERVAL
+
+        self._reaped = deque()
+        self.reaped_total = 0
+        self.forced_total = 0
+
+        self._thread = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+    # ============================================================
+    # UKLID
+    # ============================================================
+
+    def reap(self) -> int:
+        """
+        Smaze expirovane stavy
+
+        Returns:
+            int: Pocet smazanych klicu
+        """
+        with self._lock:
+            expired = self.store.purge(self.ttl)
+
+            now = time.time()
+            self._reaped.extend([now] * len(expired))
+            self.reaped_total += len(expired)
+
+        if expired:
+            print(f"🧹 Sessions: uklizeno {len(expired)} opustenych stavu")
+
+        return len(expired)
+
+    def evict(self, call_sid: str):
+        """Okamzite smaze vsechno k hovoru (terminalni /call-status)"""
+        for prefix in self.PREFIXES:
+            self.store.delete(f"{prefix}{call_sid}")
+
+        with self._lock:
+            self.forced_total += 1
+
+    # ============================================================
+    # BACKGROUND THREAD
+    # ============================================================
+
+    def start(self):
+        """Spusti uklid na pozadi"""
+        if self._thread and self._thread.is_alive():
+            return
+
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name='session-reaper', daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        """Zastavi vlakno"""
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.reap()
+            except Exception as e:
+                print(f"  ⚠️  Uklid sessions selhal: {e}")
+
+    # ============================================================
+    # METRIKY
+    # ============================================================
+
+    def get_metrics(self) -> Dict:
+        """Gauges: zive sessions, odhad velikosti, uklizene za hodinu"""
+        hour_ago = time.time() - 3600
+        with self._lock:
+            while self._reaped and self._reaped[0] < hour_ago:
+                self._reaped.popleft()
+            reaped_last_hour = len(self._reaped)
+
+        conversations = self.store.stats('conv:')
+        kb_states = self.store.stats('kb:')
+
+        return {
+            'live_conversations': conversations['count'],
+            'live_kb_states': kb_states['count'],
+            'estimated_bytes': conversations['bytes'] + kb_states['bytes'],
+            'ttl_seconds': self.ttl,
+            'reaped_last_hour': reaped_last_hour,
+            'reaped_total': self.reaped_total,
+            'forced_evictions': self.forced_total,
+        }
+
+
+# ============================================================
+# SINGLETON INSTANCE
+# ============================================================
+
+_reaper_instance = None
+
+def get_session_reaper() -> SessionReaper:
+    """Ziskej singleton instance reaperu"""
+    global _reaper_instance
+    if _reaper_instance is None:
+        _reaper_instance = SessionReaper()
+    return _reaper_instance
@@ -0,0 +1,264 @@
+"""
+Uloziste stavu hovoru (konverzace, stav KB calleru)
+Stav je mimo proces, takze dalsi Twilio webhook muze obslouzit jiny worker.
+
+Backendy (Config.SESSION_BACKEND):
+    memory - slovnik v procesu (jeden worker, vyvoj)
+    sqlite - SQLite WAL soubor sdileny workery na jednom stroji
+    redis  - Redis (vic stroju), potrebuje balicek redis
+"""
+
+import json
+import os
+from abc import ABC, abstractmethod
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from config import Config
+
+
+class SessionStore(ABC):
+    """
+    Spolecne rozhrani - hodnoty jsou JSON serializovatelne
+
+    Backend bez nektere metody selze uz pri vytvoreni, ne az uprostred hovoru.
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Any]:
+        pass
+
+    @abstractmethod
+    def set(self, key: str, value: Any):
+        pass
+
+    @abstractmethod
+    def delete(self, key: str):
+        pass
+
+    @abstractmethod
+    def __contains__(self, key: str) -> bool:
+        pass
+
+    @abstractmethod
+    def keys(self, prefix: str = '') -> List[str]:
+        pass
+
+    @abstractmethod
+    def purge(self, max_age: float) -> List[str]:
+        """Smaze klice bez aktivity (set) za poslednich max_age sekund, vrati je"""
+
+    @abstractmethod
+    def stats(self, prefix: str = '') -> Dict:
+        """Pocet klicu a odhad velikosti v bajtech (gauge pro /metrics)"""
+
+    @staticmethod
+    def _dump(value: Any) -> str:
+        return json.dumps(value, ensure_ascii=False)
+
+    @staticmethod
+    def _load(raw) -> Optional[Any]:
+        return json.loads(raw) if raw is not None else None
+
+
+class MemorySessionStore(SessionStore):
+    """V procesu - hodnoty se ukladaji jako JSON, aby se chovaly stejne jako ostatni backendy"""
+
+    def __init__(self):
+        self._data = {}  # key -> (json, posledni aktivita)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+        return self._load(entry[0]) if entry else None
+
+    def set(self, key, value):
+        raw = self._dump(value)
+        with self._lock:
+            self._data[key] = (raw, time.time())
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._data
+
+    def keys(self, prefix=''):
+        with self._lock:
+            return [k for k in self._data if k.startswith(prefix)]
+
+    def purge(self, max_age):
+        cutoff = time.time() - max_age
+        with self._lock:
+            expired = [k for k, (_, updated) in self._data.items() if updated < cutoff]
+            for key in expired:
+                del self._data[key]
+        return expired
+
+    def stats(self, prefix=''):
+        with self._lock:
+            sizes = [len(raw) for k, (raw, _) in self._data.items() if k.startswith(prefix)]
+        return {'count': len(sizes), 'bytes': sum(sizes)}
+
+
+class SQLiteSessionStore(SessionStore):
+    """SQLite ve WAL rezimu - vic workeru na jednom stroji"""
+
+    def __init__(self, path: str = None):
+        self.path = path or Config.SESSION_DB
+
+        db_dir = os.path.dirname(self.path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+
+        self._local = threading.local()
+
+        conn = self._connect()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS sessions (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                updated REAL NOT NULL
+            )
+        """)
+        conn.commit()
+
+    def _connect(self):
+        """Spojeni per vlakno (sqlite3 spojeni nejde sdilet mezi vlakny)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=5000")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key):
+        row = self._connect().execute(
+            "SELECT value FROM sessions WHERE key = ?", (key,)
+        ).fetchone()
+        return self._load(row[0]) if row else None
+
+    def set(self, key, value):
+        conn = self._connect()
+        conn.execute(
+            "INSERT OR REPLACE INTO sessions (key, value, updated) VALUES (?, ?, ?)",
+            (key, self._dump(value), time.time())
+        )
+        conn.commit()
+
+    def delete(self, key):
+        conn = self._connect()
+        conn.execute("DELETE FROM sessions WHERE key = ?", (key,))
+        conn.commit()
+
+    def __contains__(self, key):
+        return self._connect().execute(
+            "SELECT 1 FROM sessions WHERE key = ?", (key,)
+        ).fetchone() is not None
+
+    @staticmethod
+    def _like(prefix):
+        """LIKE vzor pro prefix (escapuje % a _)"""
+        return prefix.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+
+    def keys(self, prefix=''):
+        rows = self._connect().execute(
+            "SELECT key FROM sessions WHERE key LIKE ? ESCAPE '\\'", (self._like(prefix),)
+        ).fetchall()
+        return [row[0] for row in rows]
+
+    def purge(self, max_age):
+        cutoff = time.time() - max_age
+        conn = self._connect()
+        with conn:
+            expired = [row[0] for row in conn.execute(
+                "SELECT key FROM sessions WHERE updated < ?", (cutoff,)
+            )]
+            # Mezitim mohl nekdo klic obnovit - smaz jen kdyz je porad stary
+            conn.executemany(
+                "DELETE FROM sessions WHERE key = ? AND updated < ?",
+                [(key, cutoff) for key in expired]
+            )
+        return expired
+
+    def stats(self, prefix=''):
+        row = self._connect().execute(
+            "SELECT COUNT(*), COALESCE(SUM(LENGTH(value)), 0) FROM sessions WHERE key LIKE ? ESCAPE '\\'",
+            (self._like(prefix),)
+        ).fetchone()
+        return {'count': row[0], 'bytes': row[1]}
+
+
+class RedisSessionStore(SessionStore):
+    """Redis (nebo kompatibilni server) - vic stroju"""
+
+    def __init__(self, url: str = None):
+        try:
+            import redis
+        except ImportError:
+            raise ImportError("SESSION_BACKEND=redis potrebuje balicek 'redis' (pip install redis)")
+
+        self.client = redis.Redis.from_url(url or Config.REDIS_URL)
+        self.namespace = 'callai:'
+
+    def get(self, key):
+        return self._load(self.client.get(self.namespace + key))
+
+    def set(self, key, value):
+        # Redis expiruje sam - TTL se obnovi pri kazdem zapisu (posledni aktivita)
+        self.client.set(self.namespace + key, self._dump(value), ex=Config.SESSION_TTL)
+
+    def delete(self, key):
+        self.client.delete(self.namespace + key)
+
+    def __contains__(self, key):
+        return bool(self.client.exists(self.namespace + key))
+
+    def keys(self, prefix=''):
+        skip = len(self.namespace)
+        return [
+            k.decode('utf-8')[skip:]
+            for k in self.client.scan_iter(match=f"{self.namespace}{prefix}*")
+        ]
+
+    def purge(self, max_age):
+        # Expirace resi Redis (ex=SESSION_TTL v set)
+        return []
+
+    def stats(self, prefix=''):
+        keys = list(self.client.scan_iter(match=f"{self.namespace}{prefix}*"))
+        return {'count': len(keys), 'bytes': sum(self.client.strlen(k) for k in keys)}
+
+
+BACKENDS = {
+    'memory': MemorySessionStore,
+    'sqlite': SQLiteSessionStore,
+    'redis': RedisSessionStore,
+}
+
+
+# ============================================================
+# SINGLETON INSTANCE
+# ============================================================
+
+_session_store = None
+_session_lock = threading.Lock()
+
+def get_session_store() -> SessionStore:
+    """Ziskej singleton podle Config.SESSION_BACKEND"""
+    global _session_store
+    with _session_lock:
+        if _session_store is None:
+            backend = Config.SESSION_BACKEND
+            if backend not in BACKENDS:
+                raise ValueError(f"Neznamy SESSION_BACKEND: {backend} (moznosti: {', '.join(BACKENDS)})")
+            _session_store = BACKENDS[backend]()
+            print(f"  Session store: {backend}")
+        return _session_store
@@ -6,15 +6,14 @@ Prevadi rec na text pomoci OpenAI Whisper
 import tempfile
 import wave
 import pyaudio
-from openai import OpenAI
-from config import Config
+from core.llm_client import get_openai_client
 
 
 class STTEngine:
     """Engine pro rozpoznavani reci"""
     
     def __init__(self):
-        self.client = OpenAI(api_key=Config.OPENAI_API_KEY)
+        self.client = get_openai_client()  # sdileny pool spojeni
         self.rate = 16000
         self.chunk = 1024
         self.format = pyaudio.paInt16
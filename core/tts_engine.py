@@ -4,19 +4,50 @@ Prevadi text na rec pomoci ElevenLabs
 """
 
 import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from elevenlabs.client import ElevenLabs
 from elevenlabs import VoiceSettings
 from config import Config
+from core.audio_store import get_audio_store, make_key
+from core.tts_stream import StreamRegistry
+
+
+_SENTENCE_END = re.compile(r'(?<=[.!?…])\s+')
+
+
+def split_sentences(text):
+    """
+    Rozdeli text na vety - kazda veta je samostatny segment v cache
+    
+    Kombinace filler + veta by jinak byly pokazde novy string (= miss).
+    """
+    return [part.strip() for part in _SENTENCE_END.split(text or '') if part.strip()]
 
 
 class TTSEngine:
     """Engine pro generovani reci z textu"""
     
+    MODEL_ID = "eleven_turbo_v2_5"  # Turbo je nejrychlejsi
+    STREAMING_LATENCY = "3"  # Zmena z 4 na 3 (rychlejsi)
+    VOICE_SETTINGS = {
+        'stability': 0.5,
+        'similarity_boost': 0.75,
+        'style': 0.0,
+        'use_speaker_boost': True,
+    }
+    
     def __init__(self):
         print("Inicializuji TTSEngine...")
         try:
             self.client = ElevenLabs(api_key=Config.ELEVENLABS_API_KEY)
             self._ensure_cache_dir()
+            self.store = get_audio_store()
+            self._pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix='tts')
+            self._prefetched = {}  # klic -> URL (streaming) / Future (bez streamingu)
+            self._prefetch_lock = threading.Lock()
+            self.streams = StreamRegistry()
             print("  ✓ TTSEngine OK")
         except Exception as e:
             print(f"  ✗ TTSEngine chyba: {e}")
@@ -27,36 +58,19 @@ class TTSEngine:
         print(f"\n[TTSEngine] generate('{text[:50]}...')")
         
         try:
-            cache_file = self._get_cache_path(text)
+            key = self.cache_key(text)
             
-            if use_cache and os.path.exists(cache_file):
-                print(f"  ✓ Cache hit: {cache_file}")
-                return self._get_url_from_path(cache_file)
+            if use_cache:
+                cache_file = self.store.lookup(key)
+                if cache_file:
+                    print(f"  ✓ Cache hit: {cache_file}")
+                    return self._get_url_from_path(cache_file)
             
             print("  Generuji audio...")
             
-            # OPTIMALIZACE: Nizsi latence
-            audio_gen = self.client.text_to_speech.convert(
-                voice_id=Config.ELEVENLABS_VOICE_ID,
-                optimize_streaming_latency="3",  # Zmena z 4 na 3 (rychlejsi)
-
-                text=text,
-                model_id="eleven_turbo_v2_5",  # Turbo je nejrychlejsi
-                voice_settings=VoiceSettings(
-                    stability=0.5,
-                    similarity_boost=0.75,
-                    style=0.0,
-                    use_speaker_boost=True,
-                ),
-                
-            )
-            
-            audio_bytes = b"".join(audio_gen)
-            
-            with open(cache_file, 'wb') as f:
-                f.write(audio_bytes)
+            cache_file = self.render(text, key)
             
-            print(f"  ✓ Audio ulozeno: {cache_file} ({len(audio_bytes)} bytes)")
+            print(f"  ✓ Audio ulozeno: {cache_file}")
             
             url = self._get_url_from_path(cache_file)
             print(f"  URL: {url}")
@@ -66,16 +80,175 @@ class TTSEngine:
             print(f"  ✗ TTS chyba: {e}")
             return None
     
+    def generate_segments(self, segments, use_cache=True):
+        """
+        Vygeneruje audio pro kazdy segment (chybejici paralelne)
+        
+        Returns:
+            list: URL v poradi segmentu, nebo None pokud nektery selhal
+        """
+        if not segments:
+            return None
+        
+        if Config.TTS_STREAMING and use_cache:
+            try:
+                return [self._take_prefetched(text) or self.stream_url(text) for text in segments]
+            except Exception as e:
+                print(f"  ✗ TTS stream chyba: {e}")
+                return None
+        
+        futures = []
+        for text in segments:
+            future = self._take_prefetched(text) if use_cache else None
+            futures.append(future or self._pool.submit(self.generate, text, use_cache))
+        urls = [future.result() for future in futures]
+        
+        if not all(urls):
+            return None
+        return urls
+    
+    def prefetch(self, text):
+        """
+        Spusti syntezu vety hned (napr. prvni veta z AI streamu)
+        
+        Nasledne generate_segments() prevezme URL / Future z prefetche,
+        takze se veta nesyntetizuje (ani nehleda v cache) dvakrat.
+        Co generate_segments() neprevezme, uklidi discard_prefetched().
+        """
+        try:
+            key = self.cache_key(text)
+            with self._prefetch_lock:
+                if key in self._prefetched:
+                    return
+            
+            if Config.TTS_STREAMING:
+                result = self.stream_url(text)
+            else:
+                result = self._pool.submit(self.generate, text)
+            
+            with self._prefetch_lock:
+                self._prefetched.setdefault(key, result)
+        except Exception as e:
+            print(f"  ✗ TTS prefetch chyba: {e}")
+    
+    def _take_prefetched(self, text):
+        with self._prefetch_lock:
+            return self._prefetched.pop(self.cache_key(text), None)
+    
+    def discard_prefetched(self, texts):
+        """Konec tahu - zahod neprevzate prefetche (synteza dobehne do cache)"""
+        with self._prefetch_lock:
+            for text in texts:
+                self._prefetched.pop(self.cache_key(text), None)
+    
+    def stream_url(self, text):
+        """
+        URL pro prehrani textu bez cekani na celou syntezu
+        
+        Cache hit -> staticky soubor. Miss -> synteza se hned spusti
+        na pozadi a Twilio dostane /tts/stream/<key>.mp3, kde se chunky
+        posilaji jak prichazeji (a zaroven se ukladaji do cache).
+        """
+        key = self.cache_key(text)
+        
+        cache_file = self.store.lookup(key)
+        if cache_file:
+            print(f"  ✓ Cache hit: {cache_file}")
+            return self._get_url_from_path(cache_file)
+        
+        # Text do manifestu - stream request muze prijit na jiny worker
+        self.store.add_pending(key, text)
+        self.streams.start(key, text, self.synthesize_stream, self._save_stream)
+        
+        print(f"  🎙️  Stream: {key[:12]} '{text[:40]}'")
+        return f"/tts/stream/{key}.mp3"
+    
+    def open_stream(self, key):
+        """
+        Najde (nebo spusti) rozpracovanou syntezu pro klic
+        
+        Returns:
+            InflightSynthesis, nebo None pokud klic nikdo nezaregistroval
+        """
+        inflight = self.streams.get(key)
+        if inflight:
+            return inflight
+        
+        text = self.store.get_pending(key)
+        if not text:
+            return None
+        
+        return self.streams.start(key, text, self.synthesize_stream, self._save_stream)
+    
+    def _save_stream(self, inflight):
+        """Hotovy stream -> atomicky zapis do cache"""
+        self.store.put(
+            inflight.key, inflight.audio_bytes(),
+            text=inflight.text,
+            voice_id=Config.ELEVENLABS_VOICE_ID,
+            model_id=self.MODEL_ID
+        )
+        self.store.remove_pending(inflight.key)
+        
+        if inflight.first_chunk_at:
+            print(f"  ✓ Stream ulozen: {inflight.key[:12]} "
+                  f"(prvni chunk za {(inflight.first_chunk_at - inflight.started) * 1000:.0f} ms)")
+    
+    def render(self, text, key=None):
+        """
+        Vygeneruje audio a ulozi ho do cache
+        
+        Vyjimky propaguje (pre-render si dela vlastni retry).
+        
+        Returns:
+            str: Cesta k souboru v cache
+        """
+        audio_bytes = self.synthesize(text)
+        
+        return self.store.put(
+            key or self.cache_key(text), audio_bytes,
+            text=text,
+            voice_id=Config.ELEVENLABS_VOICE_ID,
+            model_id=self.MODEL_ID
+        )
+    
+    def synthesize(self, text):
+        """
+        Zavola ElevenLabs a vrati cele audio (bez cache)
+        
+        Vyjimky propaguje - volajici rozhoduje o retry.
+        """
+        # OPTIMALIZACE: Nizsi latence
+        audio_gen = self.client.text_to_speech.convert(
+            voice_id=Config.ELEVENLABS_VOICE_ID,
+            optimize_streaming_latency=self.STREAMING_LATENCY,
+            text=text,
+            model_id=self.MODEL_ID,
+            voice_settings=VoiceSettings(**self.VOICE_SETTINGS),
+        )
+        
+        return b"".join(audio_gen)
+    
+    def synthesize_stream(self, text):
+        """Zavola streamovaci endpoint ElevenLabs - iterator mp3 chunku"""
+        return self.client.text_to_speech.stream(
+            voice_id=Config.ELEVENLABS_VOICE_ID,
+            optimize_streaming_latency=self.STREAMING_LATENCY,
+            text=text,
+            model_id=self.MODEL_ID,
+            voice_settings=VoiceSettings(**self.VOICE_SETTINGS),
+        )
+    
+    def cache_key(self, text):
+        """Stabilni klic (text + hlas + model + nastaveni)"""
+        settings = dict(self.VOICE_SETTINGS, optimize_streaming_latency=self.STREAMING_LATENCY)
+        return make_key(text, Config.ELEVENLABS_VOICE_ID, self.MODEL_ID, settings)
+    
     def _ensure_cache_dir(self):
         """Vytvori slozku pro cache"""
         os.makedirs(Config.AUDIO_CACHE_DIR, exist_ok=True)
         print(f"  Cache dir: {Config.AUDIO_CACHE_DIR}")
     
-    def _get_cache_path(self, text):
-        """Vrati cestu k cache souboru"""
-        filename = f"tts_{abs(hash(text))}.mp3"
-        return os.path.join(Config.AUDIO_CACHE_DIR, filename)
-    
     def _get_url_from_path(self, path):
         """Prevede filepath na URL"""
         # OPRAV: Normalizuj cestu pro URL (pouzij forward slash)
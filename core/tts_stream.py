@@ -0,0 +1,139 @@
+"""
+Streamovana TTS synteza
+Jedna synteza bezi na pozadi, chunky se posilaji Twiliu hned jak prijdou
+a zaroven se ukladaji - po dokonceni se cele audio atomicky zapise do cache.
+"""
+
+import threading
+import time
+from typing import Callable, Iterator, List, Optional
+
+
+class InflightSynthesis:
+    """Rozpracovana synteza - buffer chunku sdileny vsemi posluchaci"""
+
+    def __init__(self, key: str, text: str):
+        self.key = key
+        self.text = text
+        self.started = time.time()
+        self.first_chunk_at = None
+
+        self._chunks: List[bytes] = []
+        self._done = False
+        self.error = None
+        self._cond = threading.Condition()
+
+    @property
+    def done(self) -> bool:
+        return self._done
+
+    def append(self, chunk: bytes):
+        """Prida chunk od providera a probudi posluchace"""
+        if not chunk:
+            return
+
+        with self._cond:
+            if self.first_chunk_at is None:
+                self.first_chunk_at = time.time()
+            self._chunks.append(chunk)
+            self._cond.notify_all()
+
+    def finish(self, error: Exception = None):
+        """Oznaci syntezu za dokoncenou (nebo selhanou)"""
+        with self._cond:
+            self._done = True
+            self.error = error
+            self._cond.notify_all()
+
+    def audio_bytes(self) -> bytes:
+        """Cele audio (po dokonceni)"""
+        with self._cond:
+            return b"".join(self._chunks)
+
+    def iter_chunks(self, timeout: float = 30) -> Iterator[bytes]:
+        """
+        Generator pro HTTP odpoved
+
+        Kazdy posluchac zacina od prvniho chunku, takze pozdni
+        request (napr. Twilio retry) dostane cele audio.
+        """
+        index = 0
+
+        while True:
+            with self._cond:
+                while index >= len(self._chunks) and not self._done:
+                    if not self._cond.wait(timeout):
+                        print(f"  ⚠️  TTS stream {self.key[:12]}: timeout")
+                        return
+
+                pending = self._chunks[index:]
+                finished = self._done
+
+            for chunk in pending:
+                yield chunk
+            index += len(pending)
+
+            if finished and index >= len(self._chunks):
+                return
+
+
+class StreamRegistry:
+    """Bezici syntezy v tomto procesu (klic -> InflightSynthesis)"""
+
+    def __init__(self):
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[InflightSynthesis]:
+        with self._lock:
+            return self._inflight.get(key)
+
+    def start(
+        self,
+        key: str,
+        text: str,
+        produce: Callable[[str], Iterator[bytes]],
+        on_complete: Callable[[InflightSynthesis], None]
+    ) -> InflightSynthesis:
+        """
+        Spusti syntezu na pozadi (pokud uz nebezi)
+
+        produce: text -> iterator chunku od providera
+        on_complete: zavola se s hotovou syntezou (ulozeni do cache)
+        """
+        with self._lock:
+            inflight = self._inflight.get(key)
+            if inflight:
+                return inflight
+
+            inflight = InflightSynthesis(key, text)
+            self._inflight[key] = inflight
+
+        thread = threading.Thread(
+            target=self._run, args=(inflight, produce, on_complete),
+            name=f'tts-stream-{key[:8]}', daemon=True
+        )
+        thread.start()
+        return inflight
+
+    def _run(self, inflight, produce, on_complete):
+        error = None
+        try:
+            for chunk in produce(inflight.text):
+                inflight.append(chunk)
+        except Exception as e:
+            error = e
+            print(f"  ✗ TTS stream chyba: {e}")
+
+        # Posluchaci dostanou konec streamu hned, zapis do cache uz necekaji
+        inflight.finish(error)
+
+        try:
+            if error is None:
+                on_complete(inflight)
+        except Exception as e:
+            print(f"  ⚠️  Ulozeni streamu do cache selhalo: {e}")
+        finally:
+            # Soubor uz je v cache (nebo synteza selhala) - dalsi request jde z disku
+            with self._lock:
+                self._inflight.pop(inflight.key, None)
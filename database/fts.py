@@ -0,0 +1,163 @@
+"""
+Fulltext hledani misto LIKE '%x%' (full scan)
+
+SQLite: FTS5 external-content tabulky synchronizovane triggery,
+        dotaz MATCH + razeni bm25().
+MySQL:  FULLTEXT indexy + MATCH ... AGAINST (boolean mode).
+"""
+
+import re
+import sqlite3
+from typing import Dict, List, Sequence
+
+
+# Cesky text - bez diakritiky, aby "cena" nasla i "céna" a naopak
+FTS_TOKENIZER = "unicode61 remove_diacritics 2"
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+
+# ============================================================
+# SQLITE FTS5
+# ============================================================
+
+def ensure_fts(conn: sqlite3.Connection, table: str, columns: Sequence[str],
+               content_rowid: str = 'id') -> bool:
+    """
+    Vytvor FTS5 index `{table}_fts` nad sloupci tabulky + triggery
+
+    Update trigger hlida jen indexovane sloupce (citace typu times_used
+    index neprepisuji).
+
+    Jednotlive prikazy (ne executescript, ktery by commitnul) - bezi
+    v transakci volajiciho (migrace), takze index bez triggeru nevznikne.
+    Chybejici cast (napr. trigger) se doplni a index se prestavi.
+
+    Returns:
+        bool: True pokud byl index nove vytvoren / doplnen (a naplnen)
+    """
+    fts = f"{table}_fts"
+    names = (fts, f"{table}_fts_ai", f"{table}_fts_ad", f"{table}_fts_au")
+    existing = {row[0] for row in conn.execute(
+        f"SELECT name FROM sqlite_master WHERE name IN ({', '.join('?' * len(names))})", names
+    )}
+    if existing.issuperset(names):
+        return False
+
+    cols = ', '.join(columns)
+    new_values = ', '.join(f"new.{c}" for c in columns)
+    old_values = ', '.join(f"old.{c}" for c in columns)
+
+    conn.execute(f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5(
+            {cols},
+            content='{table}', content_rowid='{content_rowid}',
+            tokenize='{FTS_TOKENIZER}'
+        )
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS {table}_fts_ai AFTER INSERT ON {table} BEGIN
+            INSERT INTO {fts}(rowid, {cols}) VALUES (new.{content_rowid}, {new_values});
+        END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS {table}_fts_ad AFTER DELETE ON {table} BEGIN
+            INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.{content_rowid}, {old_values});
+        END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS {table}_fts_au AFTER UPDATE OF {cols} ON {table} BEGIN
+            INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.{content_rowid}, {old_values});
+            INSERT INTO {fts}(rowid, {cols}) VALUES (new.{content_rowid}, {new_values});
+        END
+    """)
+    conn.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+    print(f"✅ FTS5 index {fts} vytvořen ({cols})")
+    return True
+
+
+def fts_query(text: str, prefix: bool = True) -> str:
+    """
+    Volny text -> bezpecny MATCH vyraz (vsechna slova, AND)
+
+    Slova se quotuji (zadna FTS syntaxe z uzivatelskeho vstupu),
+    posledni slovo jako prefix ("kolik sto" najde "kolik stoji").
+    """
+    words = _WORD.findall(text or '')
+    if not words:
+        return ''
+    terms = [f'"{w}"' for w in words]
+    if prefix:
+        terms[-1] += '*'
+    return ' '.join(terms)
+
+
+def fts_search(conn: sqlite3.Connection, table: str, text: str,
+               limit: int = 20, content_rowid: str = 'id') -> List[Dict]:
+    """
+    Radky tabulky odpovidajici textu, serazene podle bm25 (nejlepsi prvni)
+
+    Returns:
+        list: radky tabulky (dict) + 'rank' (bm25, nizsi = lepsi)
+    """
+    query = fts_query(text)
+    if not query:
+        return []
+
+    rows = conn.execute(f"""
+        SELECT t.*, bm25({table}_fts) AS rank
+        FROM {table}_fts
+        JOIN {table} t ON t.{content_rowid} = {table}_fts.rowid
+        WHERE {table}_fts MATCH ?
+        ORDER BY rank
+        LIMIT ?
+    """, (query, limit)).fetchall()
+    return [dict(row) for row in rows]
+
+
+# ============================================================
+# MYSQL FULLTEXT
+# ============================================================
+
+# tabulka -> [(nazev indexu, sloupec)]
+MYSQL_FULLTEXT_INDEXES = {
+    'knowledge_base': [('ft_kb_answer', 'answer')],
+    'objection_responses': [
+        ('ft_objection_phrase', 'customer_phrase'),
+        ('ft_objection_bot', 'bot_response'),
+    ],
+}
+
+# InnoDB ignoruje kratsi slova (innodb_ft_min_token_size)
+MYSQL_MIN_TOKEN = 3
+
+
+def ensure_mysql_fulltext(cursor, conn):
+    """Dopln chybejici FULLTEXT indexy (jednou, ALTER TABLE)"""
+    for table, indexes in MYSQL_FULLTEXT_INDEXES.items():
+        cursor.execute("""
+            SELECT DISTINCT INDEX_NAME FROM information_schema.STATISTICS
+            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+        """, (table,))
+        existing = {row['INDEX_NAME'] for row in cursor.fetchall()}
+
+        for name, column in indexes:
+            if name not in existing:
+                cursor.execute(f"ALTER TABLE {table} ADD FULLTEXT INDEX {name} ({column})")
+                print(f"✅ FULLTEXT index {table}.{name} vytvořen")
+    conn.commit()
+
+
+def mysql_boolean_query(text: str, max_words: int = 8) -> str:
+    """
+    Volny text -> MATCH ... AGAINST (... IN BOOLEAN MODE) vyraz
+
+    Vsechna (dost dlouha) slova povinna (+slovo) - nejblize puvodnimu
+    LIKE '%fraze%'. Prazdny retezec = nic k hledani.
+    """
+    words = [w for w in _WORD.findall(text or '') if len(w) >= MYSQL_MIN_TOKEN]
+    terms = [f'+{w}' for w in words[:max_words]]
+    if terms:
+        terms[-1] += '*'  # text byva oriznuty ([:30]) - posledni slovo jako prefix
+    return ' '.join(terms)
@@ -0,0 +1,216 @@
+"""
+Invalidace in-process cache mezi procesy (PRAGMA data_version)
+
+Zmeny z jineho procesu (utils/manage_products.py, learning joby, usage
+flusher jineho workeru) se do cache v tomto procesu dostanou bez restartu:
+
+- PRAGMA data_version - levny dotaz, zmeni se po commitu JINEHO spojeni
+- table_versions      - citac na tabulku, zvysuji ho triggery (migrace)
+                        -> vi se, KTERE tabulky se zmenily
+
+Poll bezi na pozadi kazdych CACHE_INVALIDATION_INTERVAL_MS a prestavuje
+jen dotcene cache (callback na vlakne pollu). Webhook na nic neceka -
+cte starou cache, dokud neni nova hotova. Zastaralost je omezena
+intervalem pollu + dobou prestavby.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+from config import Config
+
+
+def ensure_table_versions(conn: sqlite3.Connection, tables: Iterable[str]):
+    """Tabulka table_versions + triggery INSERT/UPDATE/DELETE na sledovanych tabulkach"""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS table_versions (
+            table_name TEXT PRIMARY KEY,
+            version INTEGER NOT NULL DEFAULT 0
+        )
+    """)
+    for table in tables:
+        conn.execute("INSERT OR IGNORE INTO table_versions (table_name, version) VALUES (?, 0)", (table,))
+        for suffix, event in (('ai', 'INSERT'), ('au', 'UPDATE'), ('ad', 'DELETE')):
+            conn.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS {table}_version_{suffix} AFTER {event} ON {table} BEGIN
+                    UPDATE table_versions SET version = version + 1 WHERE table_name = '{table}';
+                END
+            """)
+
+
+class _Source:
+    """Jedna sledovana databaze - vlastni spojeni (data_version je per spojeni)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.conn = sqlite3.connect(
+            path, timeout=Config.DB_BUSY_TIMEOUT / 1000, check_same_thread=False
+        )
+        self.data_version = self.conn.execute("PRAGMA data_version").fetchone()[0]
+        self.versions = self.read_versions()
+        self.listeners = []  # (nazev, tabulky, callback)
+
+    def read_versions(self) -> Optional[Dict[str, int]]:
+        """None = databaze jeste nema table_versions (nemigrovana)"""
+        try:
+            return dict(self.conn.execute("SELECT table_name, version FROM table_versions"))
+        except sqlite3.OperationalError:
+            return None
+
+
+class InvalidationService:
+    """Poll data_version + table_versions -> callbacky dotcenych cache"""
+
+    def __init__(self, interval_ms: int = None):
+        self.interval = (interval_ms or Config.CACHE_INVALIDATION_INTERVAL_MS) / 1000
+
+        self._sources: Dict[str, _Source] = {}
+        self._lock = threading.Lock()
+
+        self.polls = 0
+        self.poll_errors = 0
+        self.last_poll_ms = 0.0
+        self.last_change_at = None
+        self.invalidations: Dict[str, int] = {}
+        self.rebuild_errors: Dict[str, int] = {}
+
+        self._thread = None
+        self._stop = threading.Event()
+
+    @property
+    def running(self) -> bool:
+        """Bezi poll na pozadi (cache se prestavuji mimo webhook)"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def watch(self, name: str, path: str, tables: Iterable[str],
+              callback: Callable[[Set[str]], None]):
+        """
+        Zaregistruj cache zavislou na tabulkach databaze
+
+        Args:
+            name: nazev cache (metriky)
+            path: SQLite soubor
+            tables: tabulky, ze kterych cache vychazi
+            callback: prestavba cache - dostane mnozinu zmenenych tabulek
+        """
+        key = os.path.abspath(path)
+        with self._lock:
+            source = self._sources.get(key)
+            if source is None:
+                source = self._sources[key] = _Source(path)
+            source.listeners.append((name, frozenset(tables), callback))
+            self.invalidations.setdefault(name, 0)
+            self.rebuild_errors.setdefault(name, 0)
+
+    # ============================================================
+    # POLL
+    # ============================================================
+
+    def poll(self) -> List[str]:
+        """
+        Zkontroluj vsechny databaze a prestav dotcene cache
+
+        Returns:
+            list: nazvy prestavenych cache
+        """
+        started = time.perf_counter()
+        rebuilt = []
+
+        with self._lock:
+            for source in self._sources.values():
+                data_version = source.conn.execute("PRAGMA data_version").fetchone()[0]
+                if data_version == source.data_version:
+                    continue
+                source.data_version = data_version
+
+                versions = source.read_versions()
+                if versions is None or source.versions is None:
+                    changed = None  # bez citacu nevime co - prestav vsechno
+                else:
+                    changed = {t for t, v in versions.items() if source.versions.get(t) != v}
+                source.versions = versions
+
+                for name, tables, callback in source.listeners:
+                    hit = set(tables) if changed is None else changed & tables
+                    if not hit:
+                        continue
+                    try:
+                        callback(hit)
+                        self.invalidations[name] += 1
+                        rebuilt.append(name)
+                    except Exception as e:
+                        self.rebuild_errors[name] += 1
+                        print(f"  ⚠️  Prestavba cache {name} selhala: {e}")
+
+            self.polls += 1
+            self.last_poll_ms = (time.perf_counter() - started) * 1000
+            if rebuilt:
+                self.last_change_at = time.time()
+
+        if rebuilt:
+            print(f"🔄 Cache prestaveny po zmene v DB: {', '.join(rebuilt)}")
+        return rebuilt
+
+    # ============================================================
+    # BACKGROUND THREAD
+    # ============================================================
+
+    def start(self):
+        """Spusti poll na pozadi"""
+        if self.running:
+            return
+
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name='cache-invalidation', daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        """Zastavi vlakno"""
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.poll()
+            except Exception as e:
+                self.poll_errors += 1
+                print(f"  ⚠️  Poll invalidace selhal: {e}")
+
+    # ============================================================
+    # METRIKY
+    # ============================================================
+
+    def get_metrics(self) -> Dict:
+        return {
+            'running': self.running,
+            'interval_ms': self.interval * 1000,
+            'watched': {
+                source.path: [name for name, _, _ in source.listeners]
+                for source in self._sources.values()
+            },
+            'polls': self.polls,
+            'poll_errors': self.poll_errors,
+            'last_poll_ms': round(self.last_poll_ms, 3),
+            'last_change_at': self.last_change_at,
+            'invalidations': dict(self.invalidations),
+            'rebuild_errors': dict(self.rebuild_errors),
+        }
+
+
+# ============================================================
+# SINGLETON INSTANCE
+# ============================================================
+
+_invalidation_instance = None
+
+def get_invalidation_service() -> InvalidationService:
+    """Ziskej singleton instance invalidace"""
+    global _invalidation_instance
+    if _invalidation_instance is None:
+        _invalidation_instance = InvalidationService()
+    return _invalidation_instance
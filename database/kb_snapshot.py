@@ -0,0 +1,121 @@
+"""
+Immutable snapshot knowledge base v pameti
+Tabulky jsou male a skoro jen pro cteni - nactou se cele jednim spojenim
+a zaindexuji (stage, sub_category). Cteni = slovnikovy lookup bez SQL
+a bez zamku. Pri zmene dat se postavi novy snapshot a atomicky vymeni.
+"""
+
+import sqlite3
+import time
+from typing import Dict, Optional, Tuple
+
+from database.phrase_index import PhraseIndex
+from database.samplers import AliasSampler
+
+
+def _response_order(row):
+    """success_rate DESC, conversion_rate DESC, times_used ASC"""
+    return (
+        -(row['success_rate'] or 0),
+        -(row['conversion_rate'] or 0),
+        row['times_used'] or 0,
+        row['id'],
+    )
+
+
+class KBSnapshot:
+    """
+    Jedna nemenna verze knowledge base
+
+    Vsechny kolekce jsou tuple (radky jako dict - ven se vraci kopie).
+    Snapshot se nikdy nemeni, jen se cely nahradi novym.
+    """
+
+    __slots__ = (
+        'topics', 'topic_keywords', 'phrase_index', 'redirects_by_type', 'redirects',
+        'responses', 'responses_by_id', 'responses_by_stage', 'responses_by_sub', 'response_samplers',
+        'phrases', 'phrases_by_key', 'phrase_samplers', 'fillers', 'stats', 'built_at',
+    )
+
+    def __init__(self, conn: sqlite3.Connection):
+        conn.row_factory = sqlite3.Row
+
+        def load(query):
+            return tuple(dict(row) for row in conn.execute(query).fetchall())
+
+        # TOPICS - priority DESC, is_core_topic DESC
+        self.topics = tuple(sorted(
+            load("SELECT * FROM allowed_topics"),
+            key=lambda t: (-(t['priority'] or 0), -(t['is_core_topic'] or 0), t['id'])
+        ))
+        # Predparsovana klicova slova (stejne jako puvodni split(','))
+        self.topic_keywords = tuple(
+            (topic['topic_name'],
+             tuple(k.strip() for k in (topic['on_topic_keywords'] or '').lower().split(',')))
+            for topic in self.topics
+        )
+        self.phrase_index = PhraseIndex(topics=self.topic_keywords)
+
+        # REDIRECTS - podle typu, success_rate DESC
+        self.redirects = load("SELECT * FROM redirect_templates ORDER BY redirect_type, id")
+        by_type: Dict[str, list] = {}
+        for redirect in self.redirects:
+            by_type.setdefault(redirect['redirect_type'], []).append(redirect)
+        self.redirects_by_type = {
+            redirect_type: tuple(sorted(rows, key=lambda r: (-(r['success_rate'] or 0), r['id'])))
+            for redirect_type, rows in by_type.items()
+        }
+
+        # RESPONSES - stage a (stage, sub_category), predserazene
+        self.responses = load("SELECT * FROM cold_call_responses ORDER BY call_stage, sub_category, id")
+        self.responses_by_id = {response['id']: response for response in self.responses}
+        by_stage: Dict[str, list] = {}
+        by_sub: Dict[Tuple[str, str], list] = {}
+        for response in self.responses:
+            by_stage.setdefault(response['call_stage'], []).append(response)
+            by_sub.setdefault((response['call_stage'], response['sub_category']), []).append(response)
+        self.responses_by_stage = {k: tuple(sorted(v, key=_response_order)) for k, v in by_stage.items()}
+        self.responses_by_sub = {k: tuple(sorted(v, key=_response_order)) for k, v in by_sub.items()}
+        # Nahodny vyber podle stage - vazeny success_rate
+        self.response_samplers = {
+            stage: AliasSampler(rows, [row['success_rate'] for row in rows])
+            for stage, rows in self.responses_by_stage.items()
+        }
+
+        # ČESKÉ FRÁZE - natural_score DESC, index (phrase_type, frequency)
+        self.phrases = tuple(sorted(
+            load("SELECT * FROM czech_natural_phrases"),
+            key=lambda p: (-(p['natural_score'] or 0), p['id'])
+        ))
+        by_key: Dict[Tuple[str, str], list] = {}
+        for phrase in self.phrases:
+            by_key.setdefault((phrase['phrase_type'], phrase['frequency']), []).append(phrase)
+        self.phrases_by_key = {k: tuple(v) for k, v in by_key.items()}
+        # Nahodny vyber podle (phrase_type, frequency) - vazeny natural_score
+        self.phrase_samplers = {
+            key: AliasSampler(rows, [row['natural_score'] for row in rows])
+            for key, rows in self.phrases_by_key.items()
+        }
+        self.fillers = tuple(p['czech_phrase'] for p in self.phrases_by_key.get(('filler', 'high'), ()))
+
+        self.stats = {
+            'topics': len(self.topics),
+            'redirects': len(self.redirects),
+            'responses': len(self.responses),
+            'phrases': len(self.phrases),
+        }
+        self.built_at = time.time()
+
+    @classmethod
+    def load(cls, db_path: str) -> 'KBSnapshot':
+        """Postav snapshot z databaze (jedno spojeni, jedna transakce)"""
+        conn = sqlite3.connect(db_path)
+        try:
+            conn.execute("BEGIN")  # konzistentni cteni vsech tabulek
+            return cls(conn)
+        finally:
+            conn.close()
+
+    def get_redirect(self, redirect_type: str) -> Optional[Dict]:
+        rows = self.redirects_by_type.get(redirect_type)
+        return rows[0] if rows else None
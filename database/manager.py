@@ -0,0 +1,169 @@
+"""
+Sprava SQLite spojeni
+
+Kazda databaze ma omezeny pool trvalych spojeni (Config.DB_POOL_SIZE) -
+zadne connect/close na kazdy dotaz. Vlakno si spojeni pujci jen na dobu
+pouziti (connection() / transaction()) a vrati ho, takze ani Werkzeug
+s vlaknem na kazdy request neotevre vic spojeni nez je velikost poolu.
+Spojeni ma nastavene pragmy (WAL, synchronous=NORMAL, busy_timeout, mmap,
+cache_size) a statement cache sqlite3 modulu, takze se opakovane dotazy
+neparsuji znovu.
+
+Vnorene pujceni ve stejnem vlakne (napr. connection() uvnitr
+transaction()) dostane stejne spojeni - pool se nevycerpa sam o sebe.
+"""
+
+import os
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional
+
+from config import Config
+
+
+class ConnectionManager:
+    """Omezeny pool trvalych spojeni na jednu SQLite databazi"""
+
+    def __init__(self, path: str, size: int = None):
+        self.path = path
+        self.size = size or Config.DB_POOL_SIZE
+
+        db_dir = os.path.dirname(self.path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+
+        self._idle = queue.LifoQueue()  # naposled vracene spojeni ma teplou cache
+        self._local = threading.local()  # pujcene spojeni vlakna + hloubka vnoreni
+        self._lock = threading.Lock()
+        self._count = 0  # otevrena spojeni (volna i pujcena)
+        self.opened = 0
+        self.waits = 0  # pujceni, ktera musela cekat na volne spojeni
+
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.path,
+            timeout=Config.DB_BUSY_TIMEOUT / 1000,
+            cached_statements=Config.DB_STATEMENT_CACHE,
+            check_same_thread=False,  # spojeni se pujcuje ruznym vlaknum (vzdy jen jednomu)
+        )
+        conn.row_factory = sqlite3.Row  # Row jde indexovat i jako tuple
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA busy_timeout={int(Config.DB_BUSY_TIMEOUT)}")
+        conn.execute(f"PRAGMA mmap_size={int(Config.DB_MMAP_SIZE)}")
+        conn.execute(f"PRAGMA cache_size=-{int(Config.DB_CACHE_SIZE_KB)}")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        # INSERT OR REPLACE musi spustit i DELETE triggery (FTS indexy)
+        conn.execute("PRAGMA recursive_triggers=ON")
+        return conn
+
+    def _acquire(self) -> sqlite3.Connection:
+        """Volne spojeni z poolu, nove (pod limitem), jinak cekej"""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            create = self._count < self.size
+            if create:
+                self._count += 1
+                self.opened += 1
+            else:
+                self.waits += 1
+
+        if create:
+            try:
+                return self._open()
+            except Exception:
+                with self._lock:
+                    self._count -= 1
+                raise
+
+        try:
+            return self._idle.get(timeout=Config.DB_POOL_TIMEOUT)
+        except queue.Empty:
+            raise sqlite3.OperationalError(
+                f"connection pool exhausted ({self.size} spojeni na {self.path})"
+            )
+
+    def _release(self, conn: sqlite3.Connection):
+        # Nedokoncena transakce nesmi prejit na dalsiho vypujcitele
+        if conn.in_transaction:
+            conn.rollback()
+        self._idle.put(conn)
+
+    @contextmanager
+    def connection(self):
+        """Pujc spojeni z poolu (vnorene volani ve vlakne dostane stejne)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            self._local.depth += 1
+            try:
+                yield conn
+            finally:
+                self._local.depth -= 1
+            return
+
+        conn = self._acquire()
+        self._local.conn, self._local.depth = conn, 1
+        try:
+            yield conn
+        finally:
+            self._local.conn = None
+            self._release(conn)
+
+    @contextmanager
+    def transaction(self):
+        """Zapis v transakci - commit, pri vyjimce rollback"""
+        with self.connection() as conn:
+            with conn:
+                yield conn
+
+    def fetchall(self, query: str, params: Iterable = ()) -> List[sqlite3.Row]:
+        with self.connection() as conn:
+            return conn.execute(query, tuple(params)).fetchall()
+
+    def fetchone(self, query: str, params: Iterable = ()) -> Optional[sqlite3.Row]:
+        with self.connection() as conn:
+            return conn.execute(query, tuple(params)).fetchone()
+
+    def close(self):
+        """Zavri volna spojeni (pujcena se vrati do poolu jako obvykle)"""
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            with self._lock:
+                self._count -= 1
+            conn.close()
+
+    def get_metrics(self) -> Dict:
+        with self._lock:
+            return {
+                'size': self.size,
+                'open': self._count,
+                'idle': self._idle.qsize(),
+                'opened': self.opened,
+                'waits': self.waits,
+            }
+
+
+# ============================================================
+# SINGLETON INSTANCE (jeden manager na soubor)
+# ============================================================
+
+_managers: Dict[str, ConnectionManager] = {}
+_managers_lock = threading.Lock()
+
+def get_connection_manager(path: str) -> ConnectionManager:
+    """Ziskej sdileny manager pro databazi"""
+    key = os.path.abspath(path)
+    with _managers_lock:
+        manager = _managers.get(key)
+        if manager is None:
+            manager = _managers[key] = ConnectionManager(path)
+        return manager
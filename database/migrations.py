@@ -0,0 +1,388 @@
+"""
+Verzovane migrace SQLite schematu (PRAGMA user_version)
+
+Kazda databaze ma seznam migraci (verze, popis, funkce). Pri startu
+se aplikuji jen ty novejsi nez user_version - kazda ve vlastni
+transakci - a po zmene se spusti ANALYZE (statistiky pro planner).
+Migrace jsou idempotentni, takze srovnaji i starsi soubory, ktere
+byly rucne opravene (fix_missing_columns.py).
+
+Kontrola planu dotazu: python -m cli.migrate --check
+"""
+
+import sqlite3
+import threading
+from typing import Callable, Dict, List, Sequence, Tuple
+
+from database.fts import ensure_fts
+from database.invalidation import ensure_table_versions
+
+
+def column_names(conn: sqlite3.Connection, table: str) -> List[str]:
+    return [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+
+
+def add_columns(conn: sqlite3.Connection, table: str, columns: Dict[str, str]):
+    """ALTER TABLE ADD COLUMN pro sloupce, ktere chybi"""
+    existing = column_names(conn, table)
+    for name, decl in columns.items():
+        if name not in existing:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {name} {decl}")
+
+
+# ============================================================
+# calls.db (CallDB + CallAnalytics)
+# ============================================================
+
+def _calls_base_schema(conn):
+    """Vsechny tabulky calls.db (driv rozhozene v CallDB a CallAnalytics)"""
+    conn.execute('''CREATE TABLE IF NOT EXISTS calls (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        call_sid TEXT UNIQUE,
+        type TEXT,
+        direction TEXT,
+        phone TEXT,
+        start_time TEXT,
+        end_time TEXT,
+        duration INTEGER,
+        status TEXT,
+        transcript TEXT,
+        outcome TEXT,
+        notes TEXT
+    )''')
+
+    conn.execute('''CREATE TABLE IF NOT EXISTS contacts (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT,
+        phone TEXT UNIQUE,
+        company TEXT,
+        email TEXT,
+        status TEXT DEFAULT 'new',
+        last_call TEXT,
+        call_count INTEGER DEFAULT 0,
+        notes TEXT
+    )''')
+
+    conn.execute('''CREATE TABLE IF NOT EXISTS products (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT UNIQUE,
+        description TEXT,
+        pitch TEXT,
+        price_from INTEGER,
+        price_to INTEGER,
+        benefits TEXT,
+        target_audience TEXT,
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP
+    )''')
+
+    conn.execute('''CREATE TABLE IF NOT EXISTS campaigns (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT,
+        product_id INTEGER,
+        status TEXT DEFAULT 'draft',
+        total_contacts INTEGER DEFAULT 0,
+        completed_calls INTEGER DEFAULT 0,
+        successful_calls INTEGER DEFAULT 0,
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (product_id) REFERENCES products(id)
+    )''')
+
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS call_details (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            call_sid TEXT UNIQUE NOT NULL,
+            contact_name TEXT,
+            contact_phone TEXT,
+            company TEXT,
+            started_at TIMESTAMP,
+            ended_at TIMESTAMP,
+            duration INTEGER DEFAULT 0,
+            conversation TEXT,
+            transcript TEXT,
+            outcome TEXT DEFAULT 'unknown',
+            got_email BOOLEAN DEFAULT 0,
+            got_phone BOOLEAN DEFAULT 0,
+            scheduled_callback BOOLEAN DEFAULT 0,
+            sales_score INTEGER DEFAULT 0,
+            objections_count INTEGER DEFAULT 0,
+            positive_signals INTEGER DEFAULT 0,
+            ai_summary TEXT,
+            ai_recommendations TEXT,
+            what_worked TEXT,
+            what_failed TEXT,
+            campaign TEXT,
+            product_id INTEGER,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS objections (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            call_sid TEXT,
+            objection_type TEXT,
+            objection_text TEXT,
+            ai_response TEXT,
+            was_overcome BOOLEAN DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS learning_insights (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            insight_type TEXT,
+            context TEXT,
+            what_worked TEXT,
+            success_rate REAL,
+            times_used INTEGER DEFAULT 1,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+
+def _calls_indexes(conn):
+    """Indexy pro dialery (status) a reporty (created_at)"""
+    # get_contacts: WHERE status = ? LIMIT ? (v poradi id)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_contacts_status ON contacts(status, id)")
+    # get_stats: GROUP BY type (covering), reporty podle typu a casu
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_calls_type_start ON calls(type, start_time)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_calls_phone ON calls(phone)")
+    # get_all_calls: ORDER BY created_at DESC LIMIT ?
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_call_details_created ON call_details(created_at DESC)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_call_details_outcome ON call_details(outcome, created_at DESC)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_objections_call ON objections(call_sid)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_campaigns_status ON campaigns(status)")
+
+
+def _calls_fts(conn):
+    # Fulltext nad prepisy (misto LIKE '%...%' pres call_details)
+    ensure_fts(conn, 'call_details', ('transcript', 'conversation'))
+
+
+# ============================================================
+# knowledge_base.db
+# ============================================================
+
+def _kb_usage_columns(conn):
+    """Sloupce, ktere kod aktualizuje a create_sqlite_db.py nevytvari"""
+    add_columns(conn, 'cold_call_responses', {
+        'times_used': 'INTEGER DEFAULT 0',
+        'times_led_to_meeting': 'INTEGER DEFAULT 0',
+        'last_used': 'TIMESTAMP',
+        'avg_response_time': 'REAL',
+    })
+    add_columns(conn, 'redirect_templates', {
+        'times_used': 'INTEGER DEFAULT 0',
+        'times_successful': 'INTEGER DEFAULT 0',
+        'success_rate': 'REAL DEFAULT 50.0',
+    })
+
+
+def _kb_covering_indexes(conn):
+    """Covering indexy pro vyber responses / redirectu / frazi"""
+    # get_best_response: stage + sub_category, razeni uz v indexu
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_responses_stage_sub ON cold_call_responses(
+            call_stage, sub_category, success_rate DESC, conversion_rate DESC, times_used
+        )
+    """)
+    # get_response_by_stage: jen stage
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_responses_stage_rank ON cold_call_responses(
+            call_stage, success_rate DESC, conversion_rate DESC
+        )
+    """)
+    conn.execute("DROP INDEX IF EXISTS idx_call_stage")  # prefix idx_responses_stage_rank
+
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_redirects_type ON redirect_templates(
+            redirect_type, success_rate DESC
+        )
+    """)
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_phrases_type_freq ON czech_natural_phrases(
+            phrase_type, frequency, natural_score DESC
+        )
+    """)
+    conn.execute("DROP INDEX IF EXISTS idx_phrase_type")  # prefix idx_phrases_type_freq
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_topics_priority ON allowed_topics(
+            priority DESC, is_core_topic DESC
+        )
+    """)
+
+
+def _kb_fts(conn):
+    ensure_fts(conn, 'cold_call_responses', ('situation', 'response_text', 'expected_response'))
+
+
+# ============================================================
+# VERZE TABULEK (invalidace cache mezi procesy)
+# ============================================================
+
+# Tabulky, ze kterych se staveji in-process cache (viz database/invalidation.py)
+VERSIONED_TABLES = {
+    'calls': ('products',),
+    'knowledge_base': ('allowed_topics', 'cold_call_responses', 'redirect_templates', 'czech_natural_phrases'),
+}
+
+
+def _calls_table_versions(conn):
+    ensure_table_versions(conn, VERSIONED_TABLES['calls'])
+
+
+def _kb_table_versions(conn):
+    ensure_table_versions(conn, VERSIONED_TABLES['knowledge_base'])
+
+
+# ============================================================
+# REGISTR
+# ============================================================
+
+Migration = Tuple[int, str, Callable[[sqlite3.Connection], None]]
+
+MIGRATIONS: Dict[str, Sequence[Migration]] = {
+    'calls': (
+        (1, 'zakladni schema', _calls_base_schema),
+        (2, 'indexy status / created_at', _calls_indexes),
+        (3, 'FTS5 call_details', _calls_fts),
+        (4, 'table_versions', _calls_table_versions),
+        (5, 'FTS5 triggery (doplneni po neatomicke v3)', _calls_fts),
+    ),
+    'knowledge_base': (
+        (1, 'usage sloupce', _kb_usage_columns),
+        (2, 'covering indexy', _kb_covering_indexes),
+        (3, 'FTS5 cold_call_responses', _kb_fts),
+        (4, 'table_versions', _kb_table_versions),
+        (5, 'FTS5 triggery (doplneni po neatomicke v3)', _kb_fts),
+    ),
+}
+
+# Hot dotazy - EXPLAIN QUERY PLAN nesmi ukazat full scan (cli.migrate --check)
+HOT_QUERIES: Dict[str, Sequence[Tuple[str, tuple]]] = {
+    'calls': (
+        ("SELECT id, name, phone, company, email, call_count FROM contacts WHERE status = ? LIMIT ?", ('new', 100)),
+        ("UPDATE contacts SET call_count = call_count + 1 WHERE phone = ?", ('+420',)),
+        ("UPDATE calls SET status = ? WHERE call_sid = ?", ('completed', 'CA')),
+        ("SELECT type, COUNT(*) FROM calls GROUP BY type", ()),
+        ("SELECT * FROM call_details ORDER BY created_at DESC LIMIT ?", (100,)),
+        ("SELECT COUNT(*) FROM call_details WHERE call_sid = ?", ('CA',)),
+        ("SELECT * FROM call_details WHERE outcome = ? ORDER BY created_at DESC LIMIT ?", ('success', 10)),
+    ),
+    'knowledge_base': (
+        ("""SELECT * FROM cold_call_responses WHERE call_stage = ? AND sub_category = ?
+            ORDER BY success_rate DESC, conversion_rate DESC, times_used ASC LIMIT ?""", ('intro', 'value_first', 3)),
+        ("""SELECT * FROM cold_call_responses WHERE call_stage = ?
+            ORDER BY success_rate DESC, conversion_rate DESC LIMIT ?""", ('intro', 5)),
+        ("SELECT * FROM redirect_templates WHERE redirect_type = ? ORDER BY success_rate DESC LIMIT 1", ('weather',)),
+        ("""SELECT * FROM czech_natural_phrases WHERE phrase_type = ? AND frequency = ?
+            ORDER BY natural_score DESC""", ('filler', 'high')),
+        ("UPDATE cold_call_responses SET times_used = times_used + 1 WHERE id = ?", (1,)),
+    ),
+}
+
+
+# ============================================================
+# RUNNER
+# ============================================================
+
+def get_version(conn: sqlite3.Connection) -> int:
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn: sqlite3.Connection, schema: str) -> List[int]:
+    """
+    Aplikuj chybejici migrace schematu
+
+    Returns:
+        list: verze, ktere se prave aplikovaly
+    """
+    current = get_version(conn)
+    applied = []
+
+    for version, description, apply in MIGRATIONS[schema]:
+        if version <= current:
+            continue
+
+        if conn.in_transaction:
+            conn.commit()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            apply(conn)
+            conn.execute(f"PRAGMA user_version = {int(version)}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+        print(f"🔧 Migrace {schema} v{version}: {description}")
+        applied.append(version)
+
+    if applied:
+        conn.execute("ANALYZE")
+        conn.commit()
+
+    return applied
+
+
+def schema_copy(conn: sqlite3.Connection) -> sqlite3.Connection:
+    """
+    Prazdna in-memory kopie schematu (tabulky, indexy, FTS) bez dat a bez sqlite_stat1
+
+    Na male databazi planner podle statistik klidne zvoli full scan
+    (je levnejsi) - kontrola planu ma overit indexy, ne velikost dat.
+    """
+    rows = conn.execute("""
+        SELECT type, name, sql FROM sqlite_master
+        WHERE sql IS NOT NULL AND name NOT LIKE 'sqlite_%'
+        ORDER BY type = 'index', rowid
+    """).fetchall()
+    virtual = [name for _, name, sql in rows if sql.upper().startswith('CREATE VIRTUAL TABLE')]
+
+    copy = sqlite3.connect(':memory:')
+    for kind, name, sql in rows:
+        if kind not in ('table', 'index'):
+            continue
+        if any(name.startswith(f"{v}_") for v in virtual):
+            continue  # stinove tabulky FTS vytvori CREATE VIRTUAL TABLE
+        copy.execute(sql)
+    return copy
+
+
+def full_scans(conn: sqlite3.Connection, schema: str) -> List[Tuple[str, str]]:
+    """
+    Hot dotazy, jejichz plan (nad prazdnou kopii schematu) obsahuje full scan tabulky
+
+    Returns:
+        list: (dotaz, radek planu) - prazdny = vse jde pres indexy
+    """
+    copy = schema_copy(conn)
+    problems = []
+    for query, params in HOT_QUERIES[schema]:
+        for row in copy.execute(f"EXPLAIN QUERY PLAN {query}", params):
+            detail = row[3]
+            # "SCAN tabulka" bez indexu = full scan ("SCAN ... USING INDEX" je pruchod indexem)
+            if detail.startswith('SCAN') and 'USING' not in detail and 'VIRTUAL TABLE' not in detail:
+                problems.append((' '.join(query.split()), detail))
+    copy.close()
+    return problems
+
+
+# ============================================================
+# JEDNOU ZA PROCES
+# ============================================================
+
+_migrated = set()
+_migrated_lock = threading.Lock()
+
+def ensure_schema(conn: sqlite3.Connection, schema: str, path: str):
+    """Migruj databazi pri prvnim pouziti v procesu"""
+    key = (schema, path)
+    if key in _migrated:
+        return
+    with _migrated_lock:
+        if key not in _migrated:
+            migrate(conn, schema)
+            _migrated.add(key)
@@ -7,6 +7,8 @@ from typing import List, Dict, Optional
 import json
 from datetime import datetime
 
+from database.phrase_index import PhraseIndex, PhraseIndexCache, mysql_table_signature
+
 
 class KnowledgeBase:
     """MySQL znalostní báze"""
@@ -20,6 +22,26 @@ class KnowledgeBase:
             charset='utf8mb4'
         )
         self.cursor = self.conn.cursor(dictionary=True)
+        
+        # Námitky - zkompilovaný index místo reverse LIKE full scanu
+        self.phrases = PhraseIndexCache(
+            lambda: mysql_table_signature(self.cursor, 'objection_responses'),
+            self._build_phrase_index
+        )
+    
+    def _build_phrase_index(self) -> PhraseIndex:
+        """Načti objection_responses (podle success_rate) a zkompiluj fráze"""
+        
+        self.cursor.execute("""
+            SELECT objection_type, customer_phrase, bot_response, success_rate
+            FROM objection_responses
+            WHERE customer_phrase IS NOT NULL AND customer_phrase != ''
+            ORDER BY success_rate DESC, times_used DESC
+        """)
+        
+        return PhraseIndex(objections=[
+            (row, row['customer_phrase']) for row in self.cursor.fetchall()
+        ])
     
     def get_best_response(self, category: str, topic: str, context: str = None) -> Optional[str]:
         """Získej nejlepší odpověď z znalostní báze"""
@@ -50,16 +72,8 @@ class KnowledgeBase:
     def get_objection_response(self, customer_phrase: str) -> Optional[str]:
         """Najdi nejlepší odpověď na námitku"""
         
-        # Hledej podobné fráze
-        self.cursor.execute("""
-            SELECT objection_type, bot_response, success_rate
-            FROM objection_responses
-            WHERE LOWER(%s) LIKE CONCAT('%%', LOWER(customer_phrase), '%%')
-            ORDER BY success_rate DESC, times_used DESC
-            LIMIT 1
-        """, (customer_phrase,))
-        
-        result = self.cursor.fetchone()
+        # Hledej fráze obsažené ve výroku zákazníka (nejlepší success_rate vyhrává)
+        result = self.phrases.get().resolve(customer_phrase).objection
         
         if result:
             self._mark_objection_used(result['objection_type'])
@@ -0,0 +1,122 @@
+"""
+Phrase index - topic, off-topic typ a namitka v jednom pruchodu utterance
+Klicova slova z tabulek (allowed_topics, off_topic_handlers,
+objection_responses) se pri nacteni zkompiluji do jednoho KeywordMatcheru.
+Kazda kategorie ma poradi (priorita / success_rate) - vyhrava prvni shoda.
+
+Index je nemenny. Pri zmene radku se postavi novy
+(SQLite: spolu s KB snapshotem, MySQL: podle podpisu tabulek).
+"""
+
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from config import Config
+from core.keyword_matcher import KeywordMatcher
+
+
+TOPIC = 'topic'
+OFF_TOPIC = 'off_topic'
+OBJECTION = 'objection'
+
+
+class PhraseMatch:
+    """Vysledek resolve() - nejlepsi shoda v kazde kategorii"""
+
+    __slots__ = ('topic', 'off_topic_type', 'objection')
+
+    def __init__(self, topic=None, off_topic_type=None, objection=None):
+        self.topic: Optional[str] = topic
+        self.off_topic_type: Optional[str] = off_topic_type
+        self.objection: Optional[Dict] = objection
+
+    def __repr__(self):
+        objection = self.objection and self.objection.get('objection_type')
+        return f"PhraseMatch(topic={self.topic!r}, off_topic={self.off_topic_type!r}, objection={objection!r})"
+
+
+class PhraseIndex:
+    """
+    Zkompilovany index frazi
+
+    Args:
+        topics: [(topic_name, [klicova slova])] serazene podle priority
+        off_topics: [(off_topic_type, [klicova slova])] v poradi tabulky
+        objections: [(radek, customer_phrase)] serazene podle success_rate
+    """
+
+    def __init__(self,
+                 topics: Iterable[Tuple[str, Iterable[str]]] = (),
+                 off_topics: Iterable[Tuple[str, Iterable[str]]] = (),
+                 objections: Iterable[Tuple[Dict, str]] = ()):
+        # "kategorie:poradi" -> hodnota (nizsi poradi = vyssi priorita)
+        self._values: Dict[str, object] = {}
+        tables: Dict[str, List[str]] = {}
+
+        def add(kind, rank, value, keywords):
+            label = f"{kind}:{rank}"
+            self._values[label] = value
+            tables[label] = list(keywords)
+
+        for rank, (name, keywords) in enumerate(topics):
+            add(TOPIC, rank, name, keywords)
+        for rank, (off_topic_type, keywords) in enumerate(off_topics):
+            add(OFF_TOPIC, rank, off_topic_type, keywords)
+        for rank, (row, phrase) in enumerate(objections):
+            add(OBJECTION, rank, row, [phrase])
+
+        self._matcher = KeywordMatcher(tables)
+        self.size = len(self._values)
+
+    def resolve(self, text: str) -> PhraseMatch:
+        """Jeden pruchod textem -> topic, off-topic typ a namitka"""
+        best: Dict[str, int] = {}
+        for label in self._matcher.match(text):
+            kind, rank = label.split(':')
+            rank = int(rank)
+            if rank < best.get(kind, rank + 1):
+                best[kind] = rank
+
+        def value(kind):
+            return self._values[f"{kind}:{best[kind]}"] if kind in best else None
+
+        return PhraseMatch(value(TOPIC), value(OFF_TOPIC), value(OBJECTION))
+
+
+class PhraseIndexCache:
+    """
+    Drzi aktualni PhraseIndex pro zdroj bez notifikaci o zmenach (MySQL)
+
+    Nejvys jednou za Config.PHRASE_INDEX_CHECK_INTERVAL se zepta na podpis
+    tabulek; kdyz se zmenil, postavi novy index a vymeni referenci.
+    """
+
+    def __init__(self, signature: Callable[[], object], build: Callable[[], PhraseIndex],
+                 check_interval: float = None):
+        self._signature = signature
+        self._build = build
+        self.check_interval = Config.PHRASE_INDEX_CHECK_INTERVAL if check_interval is None else check_interval
+
+        self._current_signature = None
+        self._index: Optional[PhraseIndex] = None
+        self._checked_at = 0.0
+
+    def get(self) -> PhraseIndex:
+        now = time.time()
+        if self._index is None or now - self._checked_at >= self.check_interval:
+            self._checked_at = now
+            signature = self._signature()
+            if self._index is None or signature != self._current_signature:
+                self._index = self._build()
+                self._current_signature = signature
+        return self._index
+
+    def invalidate(self):
+        """Vlastni zapis - zkontroluj podpis pri dalsim get()"""
+        self._checked_at = 0.0
+
+
+def mysql_table_signature(cursor, *tables: str):
+    """Podpis MySQL tabulek (CHECKSUM TABLE - levne u malych tabulek)"""
+    cursor.execute(f"CHECKSUM TABLE {', '.join(tables)}")
+    return tuple((row['Table'], row['Checksum']) for row in cursor.fetchall())
@@ -0,0 +1,269 @@
+"""
+Lokalni retrieval index nad KB situacemi (char n-gram TF-IDF)
+Postavi se offline (python -m cli.build_retrieval_index) z:
+- cold_call_responses.situation a expected_response
+- historickych vet zakaznika z call_details (kdyz na ne bot odpovedel KB response)
+
+Dotaz = vektor n-gramu utterance -> kosinova podobnost proti vsem
+dokumentum pres sloupce sparse matice (CSC). Bez LLM, jen CPU, ~100 us.
+
+Potrebuje numpy (volitelne - bez nej se KB chova jako driv).
+"""
+
+import json
+import math
+import os
+import sqlite3
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # volitelna zavislost
+    np = None
+
+from config import Config
+from core.keyword_matcher import normalize
+from database.warm_start import RETRIEVAL_INDEX, file_signature, warm_component
+
+
+def char_ngrams(text: str, n_min: int, n_max: int) -> Dict[str, int]:
+    """Znakove n-gramy normalizovaneho textu (s hranicemi slov) + cela slova -> pocty"""
+    counts: Dict[str, int] = {}
+    for word in normalize(text).split():
+        counts[f"#{word}"] = counts.get(f"#{word}", 0) + 1  # cele slovo
+        word = f" {word} "
+        for n in range(n_min, n_max + 1):
+            for i in range(len(word) - n + 1):
+                gram = word[i:i + n]
+                counts[gram] = counts.get(gram, 0) + 1
+    return counts
+
+
+class RetrievalIndex:
+    """
+    TF-IDF matice dokumenty x n-gramy ulozena po sloupcich (CSC)
+
+    Kazdy dokument patri k jedne response (response_id) a ma zdroj
+    (situation / expected_response / history).
+    """
+
+    # expected_response je typicky kratka obecna odpoved ("Ano/Ne") - mensi vaha
+    SOURCE_WEIGHTS = {'situation': 1.0, 'history': 1.0, 'expected_response': 0.8}
+
+    def __init__(self, vocab: Dict[str, int], idf, indptr, indices, data,
+                 response_ids, sources: List[str], ngram_range: Tuple[int, int], built_at: float):
+        self.vocab = vocab
+        self.idf = idf
+        self.indptr = indptr      # sloupec j = dokumenty indices[indptr[j]:indptr[j+1]]
+        self.indices = indices
+        self.data = data          # L2 normalizovane vahy (x vaha zdroje)
+        self.response_ids = response_ids
+        self.sources = sources
+        self.ngram_range = ngram_range
+        self.built_at = built_at
+
+    # ============================================================
+    # STAVBA
+    # ============================================================
+
+    @classmethod
+    def build(cls, documents: Iterable[Tuple[int, str, str]],
+              ngram_range: Tuple[int, int] = None) -> 'RetrievalIndex':
+        """
+        Args:
+            documents: (response_id, source, text)
+        """
+        ngram_range = tuple(ngram_range or Config.RETRIEVAL_NGRAM_RANGE)
+
+        docs = []
+        for response_id, source, text in documents:
+            grams = char_ngrams(text or '', *ngram_range)
+            if grams:
+                docs.append((response_id, source, grams))
+
+        # Slovnik + document frequency
+        vocab: Dict[str, int] = {}
+        df: List[int] = []
+        for _, _, grams in docs:
+            for gram in grams:
+                j = vocab.get(gram)
+                if j is None:
+                    j = vocab[gram] = len(df)
+                    df.append(0)
+                df[j] += 1
+
+        n_docs = len(docs)
+        idf = np.array([math.log((1 + n_docs) / (1 + d)) + 1 for d in df], dtype=np.float32)
+
+        # Sublinearni TF * IDF, L2 normalizace po radcich -> sloupce
+        columns: List[List[Tuple[int, float]]] = [[] for _ in df]
+        for row, (_, _, grams) in enumerate(docs):
+            weights = {vocab[g]: (1 + math.log(c)) * idf[vocab[g]] for g, c in grams.items()}
+            norm = math.sqrt(sum(w * w for w in weights.values())) or 1.0
+            scale = cls.SOURCE_WEIGHTS.get(docs[row][1], 1.0) / norm
+            for j, w in weights.items():
+                columns[j].append((row, w * scale))
+
+        indptr = np.zeros(len(df) + 1, dtype=np.int64)
+        indptr[1:] = np.cumsum([len(col) for col in columns])
+        indices = np.fromiter((row for col in columns for row, _ in col), dtype=np.int32, count=int(indptr[-1]))
+        data = np.fromiter((w for col in columns for _, w in col), dtype=np.float32, count=int(indptr[-1]))
+
+        return cls(
+            vocab, idf, indptr, indices, data,
+            np.array([d[0] for d in docs], dtype=np.int64),
+            [d[1] for d in docs],
+            ngram_range, time.time()
+        )
+
+    # ============================================================
+    # DOTAZ
+    # ============================================================
+
+    def search(self, text: str, k: int = 3) -> List[Tuple[int, float, str]]:
+        """
+        Nejblizsi responses k utterance
+
+        Returns:
+            [(response_id, skore 0..1, zdroj)] - kazda response jednou (nejlepsi dokument)
+        """
+        grams = char_ngrams(text, *self.ngram_range)
+        query = {}
+        for gram, count in grams.items():
+            j = self.vocab.get(gram)
+            if j is not None:
+                query[j] = (1 + math.log(count)) * float(self.idf[j])
+        if not query:
+            return []
+
+        norm = math.sqrt(sum(w * w for w in query.values()))
+        scores = np.zeros(len(self.response_ids), dtype=np.float32)
+        for j, w in query.items():
+            start, end = self.indptr[j], self.indptr[j + 1]
+            scores[self.indices[start:end]] += (w / norm) * self.data[start:end]
+
+        results = []
+        seen = set()
+        for row in np.argsort(-scores)[:k * 4]:
+            score = float(scores[row])
+            if score <= 0:
+                break
+            response_id = int(self.response_ids[row])
+            if response_id in seen:
+                continue
+            seen.add(response_id)
+            results.append((response_id, score, self.sources[row]))
+            if len(results) >= k:
+                break
+        return results
+
+    # ============================================================
+    # ULOZENI
+    # ============================================================
+
+    def save(self, path: str = None):
+        path = path or Config.RETRIEVAL_INDEX_PATH
+        db_dir = os.path.dirname(path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+
+        meta = {
+            'vocab': sorted(self.vocab, key=self.vocab.get),
+            'sources': self.sources,
+            'ngram_range': list(self.ngram_range),
+            'built_at': self.built_at,
+        }
+        with open(path, 'wb') as f:
+            np.savez_compressed(
+                f, idf=self.idf, indptr=self.indptr, indices=self.indices, data=self.data,
+                response_ids=self.response_ids, meta=np.array(json.dumps(meta, ensure_ascii=False))
+            )
+
+    @classmethod
+    def load(cls, path: str = None) -> 'RetrievalIndex':
+        path = path or Config.RETRIEVAL_INDEX_PATH
+        with np.load(path) as f:
+            meta = json.loads(str(f['meta']))
+            return cls(
+                {gram: j for j, gram in enumerate(meta['vocab'])},
+                f['idf'], f['indptr'], f['indices'], f['data'], f['response_ids'],
+                meta['sources'], tuple(meta['ngram_range']), meta['built_at']
+            )
+
+
+def collect_documents(kb_db: str = 'database/knowledge_base.db', calls_db: str = None):
+    """
+    Dokumenty pro index: situace a ocekavane odpovedi z KB
+    + vety zakaznika z historie, po kterych bot rekl KB response
+    """
+    conn = sqlite3.connect(kb_db)
+    conn.row_factory = sqlite3.Row
+    responses = [dict(r) for r in conn.execute(
+        "SELECT id, situation, expected_response, response_text FROM cold_call_responses"
+    )]
+    conn.close()
+
+    documents = []
+    for row in responses:
+        documents.append((row['id'], 'situation', row['situation']))
+        documents.append((row['id'], 'expected_response', row['expected_response']))
+
+    calls_db = calls_db or Config.DB_PATH
+    if not os.path.exists(calls_db):
+        return documents
+
+    # Odpoved bota -> KB response (text response je v odpovedi obsazeny, i s fillerem)
+    by_text = [(normalize(r['response_text']), r['id']) for r in responses if r['response_text']]
+
+    conn = sqlite3.connect(calls_db)
+    try:
+        rows = conn.execute("SELECT conversation FROM call_details WHERE conversation IS NOT NULL").fetchall()
+    except sqlite3.OperationalError:
+        rows = []
+    finally:
+        conn.close()
+
+    for (conversation,) in rows:
+        try:
+            messages = json.loads(conversation)
+        except (TypeError, ValueError):
+            continue
+
+        for message, reply in zip(messages, messages[1:]):
+            if message.get('role') != 'user' or reply.get('role') != 'assistant':
+                continue
+            reply_text = normalize(reply.get('content', ''))
+            for text, response_id in by_text:
+                if text and text in reply_text:
+                    documents.append((response_id, 'history', message.get('content', '')))
+                    break
+
+    return documents
+
+
+# ============================================================
+# SINGLETON INSTANCE
+# ============================================================
+
+_index_instance = None
+_index_loaded = False
+
+def get_retrieval_index() -> Optional[RetrievalIndex]:
+    """Nacti index (jednou). None pokud chybi numpy nebo soubor indexu."""
+    global _index_instance, _index_loaded
+    if not _index_loaded:
+        _index_loaded = True
+        if np is None:
+            print("⚠️  Retrieval index vypnut (chybi numpy)")
+        elif not os.path.exists(Config.RETRIEVAL_INDEX_PATH):
+            print(f"⚠️  Retrieval index nenalezen: {Config.RETRIEVAL_INDEX_PATH} "
+                  f"(python -m cli.build_retrieval_index)")
+        else:
+            _index_instance = (
+                warm_component(RETRIEVAL_INDEX, file_signature(Config.RETRIEVAL_INDEX_PATH, content=False))
+                or RetrievalIndex.load()
+            )
+            print(f"✅ Retrieval index: {len(_index_instance.response_ids)} dokumentu, "
+                  f"{len(_index_instance.vocab)} n-gramu")
+    return _index_instance
@@ -0,0 +1,90 @@
+"""
+Vazene nahodne vybery z pameti (alias metoda)
+Misto ORDER BY RANDOM() LIMIT 1 (sort cele tabulky na kazdy dotaz) -
+tabulka pravdepodobnosti se spocita jednou pri stavbe KB snapshotu
+a kazdy los je O(1).
+"""
+
+import random
+from typing import Callable, Collection, Generic, List, Optional, Sequence, TypeVar
+
+
+T = TypeVar('T')
+
+
+class AliasSampler(Generic[T]):
+    """
+    Walker/Vose alias sampler - vazeny los v O(1)
+
+    Vahy <= 0 (nebo None) se nelosuji; kdyz jsou vsechny nulove,
+    los je rovnomerny.
+    """
+
+    __slots__ = ('items', 'weights', '_prob', '_alias')
+
+    def __init__(self, items: Sequence[T], weights: Sequence[Optional[float]]):
+        self.items = tuple(items)
+        weights = [max(float(w or 0), 0.0) for w in weights]
+        if self.items and not any(weights):
+            weights = [1.0] * len(self.items)
+        self.weights = tuple(weights)
+
+        n = len(self.items)
+        self._prob = [1.0] * n
+        self._alias = list(range(n))
+        if not n:
+            return
+
+        total = sum(weights)
+        scaled = [w * n / total for w in weights]
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+
+        while small and large:
+            s = small.pop()
+            l = large.pop()
+            self._prob[s] = scaled[s]
+            self._alias[s] = l
+            scaled[l] -= 1.0 - scaled[s]
+            (small if scaled[l] < 1.0 else large).append(l)
+
+        # Zbytky (zaokrouhlovaci chyby) maji pravdepodobnost 1
+        for i in small + large:
+            self._prob[i] = 1.0
+
+    def __len__(self):
+        return len(self.items)
+
+    def draw(self, rng=random) -> Optional[T]:
+        """Jeden vazeny los"""
+        if not self.items:
+            return None
+        i = int(rng.random() * len(self.items))
+        return self.items[i] if rng.random() < self._prob[i] else self.items[self._alias[i]]
+
+    def draw_excluding(self, exclude: Collection, key: Callable[[T], object],
+                       rng=random, tries: int = 8) -> Optional[T]:
+        """
+        Vazeny los mimo `exclude` (napr. poslednich N pouzitych ID)
+
+        Nejdriv par O(1) losu s odmitnutim; kdyz je vylouceno skoro
+        vsechno, vazeny vyber ze zbytku. Kdyz je vylouceno vsechno,
+        los ze vsech (stejne jako ResponseSelector._filter_recent).
+        """
+        if not exclude:
+            return self.draw(rng)
+
+        for _ in range(tries):
+            item = self.draw(rng)
+            if item is None or key(item) not in exclude:
+                return item
+
+        remaining: List[int] = [
+            i for i, item in enumerate(self.items)
+            if key(item) not in exclude and self.weights[i] > 0
+        ]
+        if not remaining:
+            return self.draw(rng)
+
+        index = rng.choices(remaining, weights=[self.weights[i] for i in remaining])[0]
+        return self.items[index]
@@ -5,9 +5,18 @@ Připojení k database/knowledge_base.db
 
 import sqlite3
 import os
+import threading
 from typing import Optional, Dict, List, Tuple
 from contextlib import contextmanager
 
+from database.kb_snapshot import KBSnapshot
+from database.manager import get_connection_manager
+from database.fts import fts_search
+from database.migrations import VERSIONED_TABLES, ensure_schema
+from database.invalidation import get_invalidation_service
+from database.warm_start import KB_SNAPSHOT, kb_signature, refresh_in_background, warm_entry
+from database.usage_aggregator import UsageAggregator
+
 class SQLiteConnector:
     """Správa připojení k SQLite databázi"""
     
@@ -21,17 +30,15 @@ class SQLiteConnector:
                 f"Spusť nejprve: python database/create_complete_sqlite.py"
             )
         
+        self.manager = get_connection_manager(self.db_path)
+        
         print(f"✅ SQLite připojeno: {self.db_path}")
     
     @contextmanager
     def get_connection(self):
-        """Context manager pro bezpečné připojení"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row  # Vrací Row objekty místo tuples
-        try:
+        """Spojení zapůjčené z poolu (Row objekty místo tuples)"""
+        with self.manager.connection() as conn:
             yield conn
-        finally:
-            conn.close()
     
     def execute_query(self, query: str, params: tuple = ()) -> List[sqlite3.Row]:
         """Spusť SELECT query a vrať výsledky"""
@@ -42,28 +49,108 @@ class SQLiteConnector:
     
     def execute_update(self, query: str, params: tuple = ()) -> int:
         """Spusť UPDATE/INSERT a vrať počet ovlivněných řádků"""
-        with self.get_connection() as conn:
+        with self.manager.transaction() as conn:
             cursor = conn.cursor()
             cursor.execute(query, params)
-            conn.commit()
             return cursor.rowcount
 
 
 class KnowledgeBase:
-    """Hlavní interface pro práci s knowledge base"""
+    """
+    Hlavní interface pro práci s knowledge base
+
+    Čtení jde z in-memory snapshotu (KBSnapshot), zápisy do SQLite.
+    Po zápisu se snapshot označí jako dirty a při dalším čtení ho
+    jedno vlákno přestaví - ostatní mezitím čtou starý. Když běží
+    InvalidationService, přestavuje ho jen její vlákno (i po změnách
+    z jiných procesů) a čtení nikdy nečeká.
+    """
     
     def __init__(self):
         self.db = SQLiteConnector()
+        # Usage sloupce, covering indexy, FTS5 - verzované migrace
+        with self.db.get_connection() as conn:
+            ensure_schema(conn, 'knowledge_base', self.db.db_path)
+        self._dirty = False
+        self._refresh_lock = threading.Lock()
+        self._snapshot, stale = self._load_snapshot()
+        if stale:
+            threading.Thread(target=self._refresh_stale, name='kb-snapshot-refresh', daemon=True).start()
+        
+        # Usage čítače - write-behind (flush → nový snapshot)
+        self.usage = UsageAggregator(self.db.db_path, on_flush=self.invalidate)
+        self.usage.start()
+        
+        # Změny KB z jiných procesů (learning, import, flusher jiného workeru)
+        self.invalidation = get_invalidation_service()
+        self.invalidation.watch(
+            'kb_snapshot', self.db.db_path, VERSIONED_TABLES['knowledge_base'],
+            lambda tables: self.refresh()
+        )
+        
         self._load_stats()
     
+    # ============================================================
+    # SNAPSHOT
+    # ============================================================
+    
+    @property
+    def snapshot(self) -> KBSnapshot:
+        """Aktuální snapshot (přestaví se, pokud se data změnila)"""
+        if self._dirty and not self.invalidation.running and self._refresh_lock.acquire(blocking=False):
+            try:
+                if self._dirty:
+                    self._rebuild()
+            finally:
+                self._refresh_lock.release()
+        return self._snapshot
+    
+    def _load_snapshot(self):
+        """
+        Boot: hotový snapshot z warm start artefaktu
+
+        Starší verze KB (usage čítače po každém hovoru) se použije taky -
+        worker je hned připravený a aktuální snapshot se načte na pozadí.
+
+        Returns:
+            (KBSnapshot, bool): snapshot + jestli je zastaralý
+        """
+        signature = kb_signature(self.db.db_path)
+        warm = warm_entry(KB_SNAPSHOT)
+        if warm is not None:
+            return warm[1], signature is None or warm[0] != signature
+        
+        snapshot = KBSnapshot.load(self.db.db_path)
+        refresh_in_background(self.db.db_path, signature, snapshot)
+        return snapshot, False
+    
+    def _refresh_stale(self):
+        """Zastaralý snapshot z artefaktu → aktuální (+ obnova artefaktu)"""
+        signature = kb_signature(self.db.db_path)
+        self.refresh()
+        refresh_in_background(self.db.db_path, signature, self._snapshot)
+    
+    def _rebuild(self):
+        # Dirty se shodí PŘED čtením - zápis během stavby ho znovu nastaví
+        self._dirty = False
+        try:
+            self._snapshot = KBSnapshot.load(self.db.db_path)
+        except sqlite3.Error as e:
+            self._dirty = True
+            print(f"⚠️  KB snapshot refresh selhal (jedu se starým): {e}")
+    
+    def invalidate(self):
+        """Data se změnila - snapshot se přestaví při dalším čtení"""
+        self._dirty = True
+    
+    def refresh(self):
+        """Přestav snapshot hned (např. po importu dat)"""
+        with self._refresh_lock:
+            self._rebuild()
+    
     def _load_stats(self):
         """Načti základní statistiky"""
-        stats = {
-            'topics': self.db.execute_query("SELECT COUNT(*) as c FROM allowed_topics")[0]['c'],
-            'redirects': self.db.execute_query("SELECT COUNT(*) as c FROM redirect_templates")[0]['c'],
-            'responses': self.db.execute_query("SELECT COUNT(*) as c FROM cold_call_responses")[0]['c'],
-            'phrases': self.db.execute_query("SELECT COUNT(*) as c FROM czech_natural_phrases")[0]['c'],
-        }
+        stats = self._snapshot.stats
         print(f"📊 Knowledge Base loaded:")
         print(f"   • {stats['topics']} topics")
         print(f"   • {stats['redirects']} redirect templates")
@@ -76,30 +163,16 @@ class KnowledgeBase:
     
     def get_all_topics(self) -> List[Dict]:
         """Získej všechny whitelisted topics"""
-        rows = self.db.execute_query("""
-            SELECT * FROM allowed_topics
-            ORDER BY priority DESC, is_core_topic DESC
-        """)
-        return [dict(row) for row in rows]
+        return [dict(topic) for topic in self.snapshot.topics]
     
     def is_on_topic(self, text: str) -> Tuple[bool, Optional[str]]:
         """
         Zkontroluj jestli text je ON-TOPIC
         Returns: (is_on_topic: bool, matched_topic: str)
         """
-        topics = self.get_all_topics()
-        
-        text_lower = text.lower()
-        
-        for topic in topics:
-            keywords = topic['on_topic_keywords'].lower().split(',')
-            keywords = [k.strip() for k in keywords]
-            
-            for keyword in keywords:
-                if keyword in text_lower:
-                    return True, topic['topic_name']
-        
-        return False, None
+        # Jeden průchod přes klíčová slova všech topiců (podle priority)
+        topic = self.snapshot.phrase_index.resolve(text).topic
+        return topic is not None, topic
     
     # ============================================================
     # REDIRECTS (OFF-TOPIC → ON-TOPIC)
@@ -107,23 +180,11 @@ class KnowledgeBase:
     
     def get_redirect(self, redirect_type: str = 'general_offtopic') -> Optional[Dict]:
         """Získej redirect template"""
-        rows = self.db.execute_query("""
-            SELECT * FROM redirect_templates
-            WHERE redirect_type = ?
-            ORDER BY success_rate DESC
-            LIMIT 1
-        """, (redirect_type,))
-        
-        if rows:
-            return dict(rows[0])
+        snapshot = self.snapshot
         
         # Fallback na general
-        rows = self.db.execute_query("""
-            SELECT * FROM redirect_templates
-            WHERE redirect_type = 'general_offtopic'
-            LIMIT 1
-        """)
-        return dict(rows[0]) if rows else None
+        redirect = snapshot.get_redirect(redirect_type) or snapshot.get_redirect('general_offtopic')
+        return dict(redirect) if redirect else None
     
     # ============================================================
     # RESPONSES (COLD CALLING)
@@ -145,53 +206,63 @@ class KnowledgeBase:
             situation: konkrétní situace
             limit: kolik variant vrátit
         """
+        snapshot = self.snapshot
         
-        # Build query
-        query = """
-            SELECT * FROM cold_call_responses
-            WHERE call_stage = ?
-        """
-        params = [stage]
-        
+        # Předseřazené podle success_rate, conversion_rate, times_used
         if sub_category:
-            query += " AND sub_category = ?"
-            params.append(sub_category)
+            rows = snapshot.responses_by_sub.get((stage, sub_category), ())
+        else:
+            rows = snapshot.responses_by_stage.get(stage, ())
         
         if situation:
-            query += " AND situation LIKE ?"
-            params.append(f"%{situation}%")
-        
-        query += """
-            ORDER BY 
-                success_rate DESC,
-                conversion_rate DESC,
-                times_used ASC
-            LIMIT ?
-        """
-        params.append(limit)
+            # FTS5 MATCH místo LIKE '%situation%' (pořadí zůstává podle success_rate)
+            matching = {row['id'] for row in self.search_responses(situation, limit=500)}
+            rows = [row for row in rows if row['id'] in matching]
         
-        rows = self.db.execute_query(query, tuple(params))
-        return [dict(row) for row in rows]
+        return [dict(row) for row in rows[:limit]]
     
     def get_response_by_stage(self, stage: str, limit: int = 5) -> List[Dict]:
         """Získej top responses pro daný stage"""
-        rows = self.db.execute_query("""
-            SELECT * FROM cold_call_responses
-            WHERE call_stage = ?
-            ORDER BY success_rate DESC, conversion_rate DESC
-            LIMIT ?
-        """, (stage, limit))
-        return [dict(row) for row in rows]
+        rows = self.snapshot.responses_by_stage.get(stage, ())
+        return [dict(row) for row in rows[:limit]]
+    
+    def search_responses(self, text: str, limit: int = 20) -> List[Dict]:
+        """Fulltext nad situation / response_text / expected_response (bm25)"""
+        with self.db.get_connection() as conn:
+            return fts_search(conn, 'cold_call_responses', text, limit)
     
-    def get_random_response(self, stage: str) -> Optional[Dict]:
-        """Získej náhodnou response (pro variabilitu)"""
-        rows = self.db.execute_query("""
-            SELECT * FROM cold_call_responses
-            WHERE call_stage = ?
-            ORDER BY RANDOM()
-            LIMIT 1
-        """, (stage,))
-        return dict(rows[0]) if rows else None
+    def get_response_by_id(self, response_id: int) -> Optional[Dict]:
+        """Získej response podle ID"""
+        row = self.snapshot.responses_by_id.get(response_id)
+        return dict(row) if row else None
+    
+    def get_random_response(
+        self,
+        stage: str,
+        used_responses: Optional[List[int]] = None,
+        recent: int = 3
+    ) -> Optional[Dict]:
+        """
+        Získej náhodnou response (pro variabilitu)
+        
+        Vážený los podle success_rate, mimo posledních `recent`
+        použitých (used_responses) - pokud to jde.
+        """
+        sampler = self.snapshot.response_samplers.get(stage)
+        if not sampler:
+            return None
+        
+        exclude = set(used_responses[-recent:]) if used_responses else ()
+        row = sampler.draw_excluding(exclude, key=lambda r: r['id'])
+        return dict(row)
+    
+    def get_all_responses(self) -> List[Dict]:
+        """Získej všechny responses (pre-render, indexy)"""
+        return [dict(row) for row in self.snapshot.responses]
+    
+    def get_all_redirects(self) -> List[Dict]:
+        """Získej všechny redirect templates"""
+        return [dict(row) for row in self.snapshot.redirects]
     
     # ============================================================
     # ČESKÉ FRÁZE
@@ -209,31 +280,28 @@ class KnowledgeBase:
             phrase_type: filler/transition/agreement/empathy/...
             frequency: high/medium/low
         """
-        query = "SELECT * FROM czech_natural_phrases WHERE 1=1"
-        params = []
-        
-        if phrase_type:
-            query += " AND phrase_type = ?"
-            params.append(phrase_type)
+        snapshot = self.snapshot
         
-        if frequency:
-            query += " AND frequency = ?"
-            params.append(frequency)
+        if phrase_type and frequency:
+            rows = snapshot.phrases_by_key.get((phrase_type, frequency), ())
+        else:
+            rows = [
+                row for row in snapshot.phrases
+                if (not phrase_type or row['phrase_type'] == phrase_type)
+                and (not frequency or row['frequency'] == frequency)
+            ]
         
-        query += " ORDER BY natural_score DESC"
-        
-        rows = self.db.execute_query(query, tuple(params))
         return [dict(row) for row in rows]
     
+    def get_random_phrase(self, phrase_type: str, frequency: str = 'high') -> Optional[str]:
+        """Náhodná česká fráze daného typu - vážená natural_score"""
+        sampler = self.snapshot.phrase_samplers.get((phrase_type, frequency))
+        row = sampler.draw() if sampler else None
+        return row['czech_phrase'] if row else None
+    
     def get_random_filler(self) -> Optional[str]:
         """Získej náhodný český filler (no, jo, jasně, ...)"""
-        rows = self.db.execute_query("""
-            SELECT czech_phrase FROM czech_natural_phrases
-            WHERE phrase_type = 'filler' AND frequency = 'high'
-            ORDER BY RANDOM()
-            LIMIT 1
-        """)
-        return rows[0]['czech_phrase'] if rows else None
+        return self.get_random_phrase('filler', 'high')
     
     # ============================================================
     # LEARNING (UKLÁDÁNÍ ZPĚT)
@@ -254,60 +322,14 @@ class KnowledgeBase:
             led_to_meeting: Vedlo to k domluvení schůzky?
         """
         
-        # Update times_used
-        self.db.execute_update("""
-            UPDATE cold_call_responses
-            SET times_used = times_used + 1,
-                last_used = datetime('now')
-            WHERE id = ?
-        """, (response_id,))
-        
-        # Update meeting count
-        if led_to_meeting:
-            self.db.execute_update("""
-                UPDATE cold_call_responses
-                SET times_led_to_meeting = times_led_to_meeting + 1
-                WHERE id = ?
-            """, (response_id,))
-        
-        # Recalculate success_rate and conversion_rate
-        self.db.execute_update("""
-            UPDATE cold_call_responses
-            SET 
-                success_rate = CASE 
-                    WHEN times_used > 0 
-                    THEN CAST(times_led_to_meeting AS REAL) / times_used * 100
-                    ELSE 50.0
-                END,
-                conversion_rate = CASE
-                    WHEN times_used > 0
-                    THEN CAST(times_led_to_meeting AS REAL) / times_used * 100
-                    ELSE 0.0
-                END
-            WHERE id = ?
-        """, (response_id,))
+        # Jen buffer v paměti - zápis + přepočet rates dělá flusher v dávce
+        self.usage.record_response(response_id, led_to_meeting=led_to_meeting)
         
         print(f"📊 Response #{response_id} usage logged (meeting: {led_to_meeting})")
     
     def log_redirect_usage(self, redirect_id: int, was_successful: bool):
         """Zaloguj použití redirectu"""
-        self.db.execute_update("""
-            UPDATE redirect_templates
-            SET times_used = times_used + 1,
-                times_successful = times_successful + ?
-            WHERE id = ?
-        """, (1 if was_successful else 0, redirect_id))
-        
-        # Update success_rate
-        self.db.execute_update("""
-            UPDATE redirect_templates
-            SET success_rate = CASE
-                WHEN times_used > 0
-                THEN CAST(times_successful AS REAL) / times_used * 100
-                ELSE 50.0
-            END
-            WHERE id = ?
-        """, (redirect_id,))
+        self.usage.record_redirect(redirect_id, was_successful=was_successful)
     
     # ============================================================
     # STATS
@@ -315,22 +337,15 @@ class KnowledgeBase:
     
     def get_top_performing_responses(self, limit: int = 10) -> List[Dict]:
         """Získej top performing responses"""
-        rows = self.db.execute_query("""
-            SELECT * FROM cold_call_responses
-            WHERE times_used >= 3
-            ORDER BY conversion_rate DESC, success_rate DESC
-            LIMIT ?
-        """, (limit,))
-        return [dict(row) for row in rows]
+        rows = sorted(
+            (row for row in self.snapshot.responses if (row['times_used'] or 0) >= 3),
+            key=lambda row: (-(row['conversion_rate'] or 0), -(row['success_rate'] or 0))
+        )
+        return [dict(row) for row in rows[:limit]]
     
     def get_stage_stats(self) -> Dict[str, int]:
         """Získej statistiky podle stage"""
-        rows = self.db.execute_query("""
-            SELECT call_stage, COUNT(*) as count
-            FROM cold_call_responses
-            GROUP BY call_stage
-        """)
-        return {row['call_stage']: row['count'] for row in rows}
+        return {stage: len(rows) for stage, rows in self.snapshot.responses_by_stage.items()}
 
 
 # ============================================================
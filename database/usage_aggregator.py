@@ -0,0 +1,226 @@
+"""
+Write-behind agregace usage citacu (responses, redirecty)
+Hovor jen pricte citac v pameti. Flusher vlakno zapise vsechno najednou
+v jedne transakci (kazdych USAGE_FLUSH_INTERVAL_MS nebo po
+USAGE_FLUSH_MAX_EVENTS udalostech) a rates prepocita set-wise.
+Pri ukonceni procesu se buffer dopise (atexit).
+"""
+
+import atexit
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from config import Config
+from database.manager import get_connection_manager
+
+
+class UsageAggregator:
+    """Buffer usage udalosti + periodicky batch flush do SQLite"""
+
+    def __init__(self, db_path: str, on_flush: Optional[Callable[[], None]] = None):
+        self.db_path = db_path
+        self.on_flush = on_flush
+        self.flush_interval = Config.USAGE_FLUSH_INTERVAL_MS / 1000
+        self.max_events = Config.USAGE_FLUSH_MAX_EVENTS
+
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._reset_buffer()
+
+        self._thread = None
+        self._stop = threading.Event()
+        self._wakeup = threading.Event()
+
+        # Metriky
+        self.flushed_events = 0
+        self.flush_count = 0
+        self.flush_errors = 0
+        self.last_flush_at = None
+        self.last_flush_ms = 0.0
+        self.last_lag_ms = 0.0
+
+    def _reset_buffer(self):
+        # id -> [times_used, times_led_to_meeting]
+        self._responses: Dict[int, List[int]] = {}
+        # id -> [times_used, times_successful]
+        self._redirects: Dict[int, List[int]] = {}
+        self._pending = 0
+        self._oldest = None
+
+    # ============================================================
+    # ZAZNAM (hot path - jen pamet)
+    # ============================================================
+
+    def record_response(self, response_id: int, led_to_meeting: bool = False):
+        """Pouziti response (+ jestli vedla ke schuzce)"""
+        with self._lock:
+            counts = self._responses.setdefault(response_id, [0, 0])
+            counts[0] += 1
+            counts[1] += 1 if led_to_meeting else 0
+            self._added()
+
+    def record_redirect(self, redirect_id: int, was_successful: bool = False):
+        """Pouziti redirectu"""
+        with self._lock:
+            counts = self._redirects.setdefault(redirect_id, [0, 0])
+            counts[0] += 1
+            counts[1] += 1 if was_successful else 0
+            self._added()
+
+    def _added(self):
+        self._pending += 1
+        if self._oldest is None:
+            self._oldest = time.time()
+        if self._pending >= self.max_events:
+            self._wakeup.set()
+
+    # ============================================================
+    # FLUSH
+    # ============================================================
+
+    def flush(self) -> int:
+        """
+        Zapis buffer v jedne transakci
+
+        Returns:
+            int: pocet zapsanych udalosti
+        """
+        with self._flush_lock:
+            with self._lock:
+                responses, redirects = self._responses, self._redirects
+                pending, oldest = self._pending, self._oldest
+                self._reset_buffer()
+
+            if not pending:
+                return 0
+
+            started = time.time()
+            try:
+                self._write(responses, redirects)
+            except sqlite3.Error as e:
+                # Vrat do bufferu - zkusi se pri dalsim flushi
+                self._merge_back(responses, redirects, pending, oldest)
+                self.flush_errors += 1
+                print(f"⚠️  Usage flush selhal ({pending} udalosti ceka): {e}")
+                return 0
+
+            now = time.time()
+            self.flushed_events += pending
+            self.flush_count += 1
+            self.last_flush_at = now
+            self.last_flush_ms = (now - started) * 1000
+            self.last_lag_ms = (now - oldest) * 1000
+
+        if self.on_flush:
+            self.on_flush()
+        return pending
+
+    def _write(self, responses, redirects):
+        # Trvale spojeni flusher vlakna (jedna transakce na flush)
+        with get_connection_manager(self.db_path).transaction() as conn:
+            if responses:
+                conn.executemany("""
+                    UPDATE cold_call_responses
+                    SET times_used = times_used + ?,
+                        times_led_to_meeting = times_led_to_meeting + ?,
+                        last_used = datetime('now')
+                    WHERE id = ?
+                """, [(used, meetings, rid) for rid, (used, meetings) in responses.items()])
+
+                conn.execute(f"""
+                    UPDATE cold_call_responses
+                    SET
+                        success_rate = CASE
+                            WHEN times_used > 0
+                            THEN CAST(times_led_to_meeting AS REAL) / times_used * 100
+                            ELSE 50.0
+                        END,
+                        conversion_rate = CASE
+                            WHEN times_used > 0
+                            THEN CAST(times_led_to_meeting AS REAL) / times_used * 100
+                            ELSE 0.0
+                        END
+                    WHERE id IN ({','.join('?' * len(responses))})
+                """, list(responses))
+
+            if redirects:
+                conn.executemany("""
+                    UPDATE redirect_templates
+                    SET times_used = times_used + ?,
+                        times_successful = times_successful + ?
+                    WHERE id = ?
+                """, [(used, ok, rid) for rid, (used, ok) in redirects.items()])
+
+                conn.execute(f"""
+                    UPDATE redirect_templates
+                    SET success_rate = CASE
+                        WHEN times_used > 0
+                        THEN CAST(times_successful AS REAL) / times_used * 100
+                        ELSE 50.0
+                    END
+                    WHERE id IN ({','.join('?' * len(redirects))})
+                """, list(redirects))
+
+    def _merge_back(self, responses, redirects, pending, oldest):
+        with self._lock:
+            for target, source in ((self._responses, responses), (self._redirects, redirects)):
+                for key, (a, b) in source.items():
+                    counts = target.setdefault(key, [0, 0])
+                    counts[0] += a
+                    counts[1] += b
+            self._pending += pending
+            self._oldest = min(filter(None, (self._oldest, oldest)), default=None)
+
+    # ============================================================
+    # FLUSHER VLAKNO
+    # ============================================================
+
+    def start(self):
+        """Spusti flusher na pozadi (+ dopsani pri ukonceni)"""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='usage-flusher', daemon=True)
+        self._thread.start()
+        atexit.register(self.stop)
+
+    def stop(self):
+        """Zastav flusher a dopis buffer"""
+        self._stop.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+        self.flush()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"⚠️  Usage flusher: {e}")
+
+    # ============================================================
+    # METRIKY
+    # ============================================================
+
+    def get_metrics(self) -> Dict:
+        """Backlog a zpozdeni zapisu"""
+        with self._lock:
+            pending = self._pending
+            oldest = self._oldest
+
+        return {
+            'pending_events': pending,
+            'pending_age_ms': round((time.time() - oldest) * 1000, 1) if oldest else 0.0,
+            'flushed_events': self.flushed_events,
+            'flush_count': self.flush_count,
+            'flush_errors': self.flush_errors,
+            'last_flush_ms': round(self.last_flush_ms, 2),
+            'last_flush_lag_ms': round(self.last_lag_ms, 1),
+            'last_flush_at': self.last_flush_at,
+        }
@@ -0,0 +1,229 @@
+"""
+Warm start - predpocitane struktury pro rychly start workeru
+
+Jeden soubor (python -m cli.build_snapshot) s hotovymi objekty:
+- KB snapshot (radky, indexy, alias samplery, phrase index)
+- intent matcher (zkompilovany regex + prefixove uzavery)
+- retrieval index (TF-IDF matice)
+
+Kazda komponenta ma podpis zdroje, ze ktereho vznikla (verze KB
+databaze / obsah souboru). Pri startu se pouzije jen ta, jejiz podpis
+sedi - jinak se komponenta postavi postaru ze zdroje. Vyjimka je KB
+snapshot: usage flusher meni KB po kazdem hovoru, takze se pouzije
+i mirne zastaraly a aktualni se nacte hned na pozadi. Cely payload
+ma SHA-256, poskozeny soubor se ignoruje.
+
+Soubor je pickle - nacita se jen nas vlastni build artefakt z data/.
+"""
+
+import hashlib
+import os
+import pickle
+import sqlite3
+import tempfile
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from config import Config
+
+
+ARTIFACT_FORMAT = 1
+
+KB_SNAPSHOT = 'kb_snapshot'
+INTENT_MATCHER = 'intent_matcher'
+RETRIEVAL_INDEX = 'retrieval_index'
+
+
+# ============================================================
+# PODPISY ZDROJU
+# ============================================================
+
+def kb_signature(db_path: str) -> Optional[str]:
+    """
+    Verze KB databaze: schema (user_version) + citace table_versions
+
+    Returns:
+        str nebo None (databaze bez table_versions - verzi nelze urcit)
+    """
+    conn = sqlite3.connect(db_path)
+    try:
+        user_version = conn.execute("PRAGMA user_version").fetchone()[0]
+        versions = conn.execute("SELECT table_name, version FROM table_versions ORDER BY table_name").fetchall()
+    except sqlite3.OperationalError:
+        return None
+    finally:
+        conn.close()
+    return hashlib.sha1(repr((user_version, versions)).encode()).hexdigest()
+
+
+def file_signature(path: str, content: bool = True) -> Optional[str]:
+    """Podpis souboru - hash obsahu (male soubory) nebo velikost + mtime"""
+    if not os.path.exists(path):
+        return None
+    if not content:
+        stat = os.stat(path)
+        return f"{stat.st_size}:{stat.st_mtime_ns}"
+    with open(path, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def current_signatures(kb_path: str) -> Dict[str, Optional[str]]:
+    """Podpisy vsech komponent podle aktualniho stavu zdroju"""
+    from services.intent_matcher import INTENT_KEYWORDS_FILE
+
+    return {
+        KB_SNAPSHOT: kb_signature(kb_path),
+        INTENT_MATCHER: file_signature(INTENT_KEYWORDS_FILE),
+        RETRIEVAL_INDEX: file_signature(Config.RETRIEVAL_INDEX_PATH, content=False),
+    }
+
+
+# ============================================================
+# ARTEFAKT
+# ============================================================
+
+class WarmStart:
+    """Sada predpocitanych komponent: nazev -> (podpis zdroje, objekt)"""
+
+    def __init__(self, components: Dict[str, Tuple[Optional[str], object]], created_at: float = None):
+        self.components = components
+        self.created_at = created_at or time.time()
+
+    def get(self, name: str, signature: Optional[str]):
+        """Komponenta, pokud vznikla ze stejne verze zdroje (jinak None)"""
+        entry = self.components.get(name)
+        if entry is None or signature is None or entry[0] != signature:
+            return None
+        return entry[1]
+
+    def entry(self, name: str) -> Optional[Tuple[Optional[str], object]]:
+        """(podpis, komponenta) bez ohledu na aktualni verzi zdroje"""
+        return self.components.get(name)
+
+    @classmethod
+    def build(cls, kb_path: str, snapshot: Tuple[Optional[str], object] = None) -> 'WarmStart':
+        """
+        Postav vsechny komponenty ze zdroju
+
+        Args:
+            snapshot: (podpis, KBSnapshot) uz nacteny workerem - jinak se nacte z kb_path
+        """
+        from database.kb_snapshot import KBSnapshot
+        from database.retrieval_index import RetrievalIndex, np
+        from services.intent_matcher import IntentMatcher
+
+        # Podpisy PRED ctenim - zmena behem stavby = starsi podpis = miss
+        signatures = current_signatures(kb_path)
+
+        components = {
+            KB_SNAPSHOT: snapshot or (signatures[KB_SNAPSHOT], KBSnapshot.load(kb_path)),
+            INTENT_MATCHER: (signatures[INTENT_MATCHER], IntentMatcher()),
+        }
+        if np is not None and signatures[RETRIEVAL_INDEX] is not None:
+            components[RETRIEVAL_INDEX] = (signatures[RETRIEVAL_INDEX], RetrievalIndex.load())
+
+        return cls(components)
+
+    def save(self, path: str = None):
+        """Atomicky zapis (tmp + rename) - bezici workery nikdy nectou pulku souboru"""
+        path = path or Config.WARM_START_PATH
+        db_dir = os.path.dirname(path) or '.'
+        os.makedirs(db_dir, exist_ok=True)
+
+        payload = pickle.dumps(self.components, protocol=pickle.HIGHEST_PROTOCOL)
+        header = {
+            'format': ARTIFACT_FORMAT,
+            'sha256': hashlib.sha256(payload).hexdigest(),
+            'created_at': self.created_at,
+        }
+
+        fd, tmp = tempfile.mkstemp(dir=db_dir, prefix='.warm_start.')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump((header, payload), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+
+    @classmethod
+    def load(cls, path: str = None) -> Optional['WarmStart']:
+        """Nacti artefakt (None = chybi, jiny format, nesedi checksum)"""
+        path = path or Config.WARM_START_PATH
+        if not os.path.exists(path):
+            return None
+
+        try:
+            with open(path, 'rb') as f:
+                header, payload = pickle.load(f)
+            if header.get('format') != ARTIFACT_FORMAT:
+                return None
+            if hashlib.sha256(payload).hexdigest() != header.get('sha256'):
+                print(f"⚠️  Warm start {path}: nesedi checksum - ignoruji")
+                return None
+            return cls(pickle.loads(payload), header.get('created_at'))
+        except Exception as e:
+            print(f"⚠️  Warm start {path} nelze nacist: {e}")
+            return None
+
+
+# ============================================================
+# SINGLETON INSTANCE
+# ============================================================
+
+_warm_instance = None
+_warm_loaded = False
+_warm_lock = threading.Lock()
+
+def get_warm_start() -> Optional[WarmStart]:
+    """Nacti artefakt jednou za proces (None = start ze zdroju)"""
+    global _warm_instance, _warm_loaded
+    if not _warm_loaded:
+        with _warm_lock:
+            if not _warm_loaded:
+                _warm_instance = WarmStart.load() if Config.WARM_START_ENABLED else None
+                _warm_loaded = True
+    return _warm_instance
+
+
+def warm_component(name: str, signature: Optional[str]):
+    """Komponenta z artefaktu pro aktualni verzi zdroje, jinak None"""
+    warm = get_warm_start()
+    return warm.get(name, signature) if warm else None
+
+
+def warm_entry(name: str) -> Optional[Tuple[Optional[str], object]]:
+    """(podpis, komponenta) z artefaktu i kdyz je zastarala, jinak None"""
+    warm = get_warm_start()
+    return warm.entry(name) if warm else None
+
+
+def refresh_in_background(kb_path: str, signature: Optional[str], snapshot):
+    """
+    Artefakt je zastaraly (KB se od buildu zmenila) - prepis ho na pozadi,
+    aby dalsi workery startovaly zase z cerstvejsich struktur
+
+    KB se meni po kazdem hovoru (usage citace), takze se artefakt prepisuje
+    nejvys jednou za WARM_START_REFRESH_INTERVAL - ne kazdym novym workerem.
+
+    Args:
+        signature: podpis KB precteny PRED nactenim snapshotu
+    """
+    if get_warm_start() is None or signature is None:
+        return  # artefakt se nepouziva (nikdo nespustil build) / KB bez verzi
+
+    try:
+        if time.time() - os.path.getmtime(Config.WARM_START_PATH) < Config.WARM_START_REFRESH_INTERVAL:
+            return  # nedavno ho prepsal jiny worker
+    except OSError:
+        pass
+
+    def run():
+        try:
+            WarmStart.build(kb_path, (signature, snapshot)).save()
+        except Exception as e:
+            print(f"⚠️  Obnova warm startu selhala: {e}")
+
+    threading.Thread(target=run, name='warm-start-refresh', daemon=True).start()
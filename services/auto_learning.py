@@ -6,8 +6,8 @@ import mysql.connector
 from typing import Dict, List
 import json
 from datetime import datetime
-from openai import OpenAI
-from config import Config
+from core.llm_client import get_openai_client
+from database.fts import ensure_mysql_fulltext, mysql_boolean_query
 
 
 class AutoLearningSystem:
@@ -22,7 +22,8 @@ class AutoLearningSystem:
             charset='utf8mb4'
         )
         self.cursor = self.conn.cursor(dictionary=True)
-        self.client = OpenAI(api_key=Config.OPENAI_API_KEY)
+        ensure_mysql_fulltext(self.cursor, self.conn)  # MATCH místo LIKE '%...%'
+        self.client = get_openai_client()  # sdileny pool spojeni
     
     def learn_from_call(self, call_data: Dict):
         """Uč se z hovoru - OKAMŽITĚ PO KAŽDÉM HOVORU!"""
@@ -183,12 +184,15 @@ Odpověz ve formátu JSON:
             # Aktualizuj objection responses pokud selhaly
             for old_response, better_response in result.get('better_responses', {}).items():
                 # Najdi původní odpověď a sniž její success rate
-                self.cursor.execute("""
-                    UPDATE objection_responses
-                    SET success_rate = success_rate * 0.9
-                    WHERE bot_response LIKE %s
-                    LIMIT 1
-                """, (f"%{old_response[:50]}%",))
+                query = mysql_boolean_query(old_response[:50])
+                if query:
+                    self.cursor.execute("""
+                        UPDATE objection_responses
+                        SET success_rate = success_rate * 0.9
+                        WHERE MATCH(bot_response) AGAINST(%s IN BOOLEAN MODE)
+                        ORDER BY MATCH(bot_response) AGAINST(%s IN BOOLEAN MODE) DESC
+                        LIMIT 1
+                    """, (query, query))
                 
                 # Přidej lepší odpověď
                 self.cursor.execute("""
@@ -214,13 +218,16 @@ Odpověz ve formátu JSON:
             if msg.get('role') == 'assistant':
                 text = msg.get('content', '')
                 
-                if len(text) > 10:
-                    # Najdi podobné fráze v databázi a aktualizuj
+                query = mysql_boolean_query(text[:30])
+                
+                if len(text) > 10 and query:
+                    # Najdi podobné fráze v databázi a aktualizuj (FULLTEXT)
                     self.cursor.execute("""
                         SELECT id FROM knowledge_base
-                        WHERE answer LIKE %s
+                        WHERE MATCH(answer) AGAINST(%s IN BOOLEAN MODE)
+                        ORDER BY MATCH(answer) AGAINST(%s IN BOOLEAN MODE) DESC
                         LIMIT 1
-                    """, (f"%{text[:30]}%",))
+                    """, (query, query))
                     
                     result = self.cursor.fetchone()
                     
@@ -253,12 +260,14 @@ Odpověz ve formátu JSON:
         
         # Pokud zákazník řekl něco nového, co není v databázi
         for phrase in customer_phrases:
-            if len(phrase) > 5:
-                # Zkontroluj jestli existuje
+            query = mysql_boolean_query(phrase[:20])
+            
+            if len(phrase) > 5 and query:
+                # Zkontroluj jestli existuje (FULLTEXT)
                 self.cursor.execute("""
                     SELECT COUNT(*) as count FROM objection_responses
-                    WHERE customer_phrase LIKE %s
-                """, (f"%{phrase[:20]}%",))
+                    WHERE MATCH(customer_phrase) AGAINST(%s IN BOOLEAN MODE)
+                """, (query,))
                 
                 result = self.cursor.fetchone()
                 
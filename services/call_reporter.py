@@ -2,8 +2,7 @@
 AI Call Reporter - vyhodnocení hovorů
 """
 
-from openai import OpenAI
-from config import Config
+from core.llm_client import get_openai_client
 import json
 
 
@@ -11,7 +10,7 @@ class CallReporter:
     """AI vyhodnocení hovorů"""
     
     def __init__(self):
-        self.client = OpenAI(api_key=Config.OPENAI_API_KEY)
+        self.client = get_openai_client()  # sdileny pool spojeni
     
     def analyze_call(self, call_sid: str, conversation: list) -> dict:
         """Vyhodnoť hovor pomocí AI"""
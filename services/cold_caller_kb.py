@@ -1,12 +1,18 @@
 """
 Cold Caller s Knowledge Base
 Wrapper kolem ReceptionistService který přidává KB responses
+
+ColdCallerKB je sdílený v procesu (KB, selector, topic controller),
+stav konkrétního hovoru drží malý KBCallState.
 """
 
-from services.receptionist import ReceptionistService
 from database.sqlite_connector import get_knowledge_base
 from services.topic_controller import TopicController
 from services.response_selector import ResponseSelector
+from services.kb_call_state import KBCallState
+from services.intent_matcher import get_intent_matcher
+from database.retrieval_index import get_retrieval_index
+from config import Config, Phrases
 
 
 class ColdCallerKB:
@@ -21,29 +27,36 @@ class ColdCallerKB:
     """
     
     def __init__(self):
-        # Tvůj původní receptionist (funguje!)
-        self.receptionist = ReceptionistService()
+        # Tvůj původní receptionist - vytvoří se až když je potřeba (varianta B)
+        self._receptionist = None
         
-        # Knowledge Base komponenty
+        # Knowledge Base komponenty (sdílené všemi hovory)
         self.kb = get_knowledge_base()
         self.topic_controller = TopicController()
         self.response_selector = ResponseSelector()
-        
-        # Tracking
-        self.current_stage = 'intro'
-        self.customer_name = None
-        self.company_name = None
-        self.has_web = None
-        self.last_response_id = None
+        self.intents = get_intent_matcher()
+        self.retrieval = get_retrieval_index()  # None = bez free-form matchingu
         
         print("✅ ColdCallerKB inicializován (Receptionist + Knowledge Base)")
     
-    def handle_outbound_call(self, call_sid, name, company=''):
+    @property
+    def receptionist(self):
+        """ReceptionistService (AI + TTS + DB klienti) - líně, jen pro AI enhance"""
+        if self._receptionist is None:
+            from services.receptionist import ReceptionistService
+            self._receptionist = ReceptionistService()
+        return self._receptionist
+    
+    def new_call(self, call_sid):
+        """Per-call stav pro nový hovor (mikrosekundy, žádní klienti ani DB)"""
+        return KBCallState(call_sid)
+    
+    def handle_outbound_call(self, state, name, company=''):
         """
         Zahájí outbound cold call
         
         Args:
-            call_sid: Call SID
+            state: KBCallState hovoru (new_call)
             name: Jméno kontaktu
             company: Název firmy
             
@@ -56,40 +69,56 @@ class ColdCallerKB:
         print(f"   Firma: {company}")
         
         # Ulož info
-        self.customer_name = name
-        self.company_name = company
-        self.current_stage = 'intro'
+        state.customer_name = name
+        state.company_name = company
+        state.current_stage = 'intro'
         
         # Získej INTRO z Knowledge Base
         intro_response = self.response_selector.get_response(
             stage='intro',
             sub_category='value_first',  # Použij value-first approach
-            add_czech_filler=True
+            add_czech_filler=True,
+            used_responses=state.used_responses
         )
         
-        self.last_response_id = intro_response['id']
+        state.last_response_id = intro_response['id']
         
-        # Personalizuj s jménem
-        greeting = intro_response['text']
+        # Personalizuj s jménem (a firmou)
+        greeting = self.personalize_greeting(intro_response['text'], name, company)
+        state.last_segments = self.personalize_greeting_segments(
+            intro_response['segments'], name, company
+        )
         
-        # Přidej jméno
-        greeting = f"Dobrý den, {name}. " + greeting
+        print(f"   📚 KB Response #{intro_response['id']}")
+        print(f"   💬 Greeting: {greeting}")
+        
+        return greeting
+    
+    @staticmethod
+    def personalize_greeting(text, name, company=''):
+        """Přidej oslovení a název firmy do intro response"""
+        greeting = f"Dobrý den, {name}. " + text
         
         # Pokud známe firmu
         if company:
             greeting = greeting.replace("firmám", f"firmě {company}")
         
-        print(f"   📚 KB Response #{intro_response['id']}")
-        print(f"   💬 Greeting: {greeting}")
-        
         return greeting
     
-    def process_customer_response(self, call_sid, user_input):
+    @staticmethod
+    def personalize_greeting_segments(segments, name, company=''):
+        """Oslovení jako samostatný segment, zbytek intro se cachuje sdíleně"""
+        if company:
+            segments = [s.replace("firmám", f"firmě {company}") for s in segments]
+        
+        return [f"Dobrý den, {name}."] + list(segments)
+    
+    def process_customer_response(self, state, user_input):
         """
         Zpracuj odpověď zákazníka S Knowledge Base
         
         Args:
-            call_sid: Call SID
+            state: KBCallState hovoru
             user_input: Co zákazník řekl
             
         Returns:
@@ -102,14 +131,15 @@ class ColdCallerKB:
         # 1. OFF-TOPIC CHECK
         # ============================================================
         
-        is_on_topic, redirect = self.topic_controller.check_and_redirect(user_input)
+        is_on_topic, redirect = self.topic_controller.check_and_redirect(user_input, state)
         
         if not is_on_topic:
             print(f"   ⚠️  OFF-TOPIC → redirect")
             
             # V cold callingu - max 2 off-topics pak politely end
-            if self.topic_controller.off_topic_count >= 2:
-                return "Rozumím. Pošlu vám email s informacemi. Hezký den!"
+            if state.off_topic_count >= 2:
+                state.last_segments = [Phrases.OFF_TOPIC_END]
+                return Phrases.OFF_TOPIC_END
             
             return redirect
         
@@ -117,20 +147,21 @@ class ColdCallerKB:
         # 2. UPDATE STATE
         # ============================================================
         
-        user_lower = user_input.lower()
+        # Všechny intenty utterance jedním průchodem (data/intent_keywords.json)
+        intents = self.intents.match(user_input)
         
         # Detekuj jestli mají web
-        if 'máme web' in user_lower or 'ano máme' in user_lower:
-            self.has_web = True
-        elif 'nemáme web' in user_lower or 'ne nemáme' in user_lower:
-            self.has_web = False
+        if intents.has('kb.has_web'):
+            state.has_web = True
+        elif intents.has('kb.no_web'):
+            state.has_web = False
         
         # ============================================================
         # 3. DETERMINE STAGE
         # ============================================================
         
-        next_stage, sub_category = self._determine_stage(user_input)
-        self.current_stage = next_stage
+        next_stage, sub_category = self._determine_stage(intents, state, user_input)
+        state.current_stage = next_stage
         
         print(f"   🎯 Stage: {next_stage}")
         print(f"   📂 Sub: {sub_category}")
@@ -142,11 +173,12 @@ class ColdCallerKB:
         kb_response = self.response_selector.get_response(
             stage=next_stage,
             sub_category=sub_category,
-            customer_sentiment=self._detect_sentiment(user_input),
-            add_czech_filler=True
+            customer_sentiment=self._detect_sentiment(intents),
+            add_czech_filler=True,
+            used_responses=state.used_responses
         )
         
-        self.last_response_id = kb_response['id']
+        state.last_response_id = kb_response['id']
         
         print(f"   📚 KB #{kb_response['id']}: {kb_response['text'][:60]}...")
         
@@ -159,10 +191,11 @@ class ColdCallerKB:
         
         # VARIANTA A - Rovnou KB (rychlejší):
         final_response = kb_response['text']
+        state.last_segments = kb_response['segments']
         
         # VARIANTA B - AI enhance (personalizovanější):
         # try:
-        #     final_response = self.receptionist.process_message(call_sid, user_input)
+        #     final_response = self.receptionist.process_message(state.call_sid, user_input)
         # except:
         #     final_response = kb_response['text']
         
@@ -171,12 +204,12 @@ class ColdCallerKB:
         # ============================================================
         
         # Detekuj úspěch
-        is_positive = 'ano' in user_lower or 'zajímá' in user_lower or 'jo' in user_lower
-        led_to_meeting = 'schůzka' in user_lower or 'sejdeme' in user_lower
+        is_positive = intents.has('kb.positive')
+        led_to_meeting = intents.has('kb.meeting')
         
-        if self.last_response_id and self.last_response_id > 0:
+        if state.last_response_id and state.last_response_id > 0:
             self.response_selector.log_response_success(
-                response_id=self.last_response_id,
+                response_id=state.last_response_id,
                 was_successful=is_positive,
                 led_to_meeting=led_to_meeting
             )
@@ -185,57 +218,73 @@ class ColdCallerKB:
         
         return final_response
     
-    def _determine_stage(self, user_input):
-        """Urči stage a sub-category"""
-        
-        user_lower = user_input.lower()
+    def _determine_stage(self, intents, state, user_input=''):
+        """Urči stage a sub-category (intents = IntentMatcher.match)"""
         
         # CLOSING
-        if any(w in user_lower for w in ['schůzka', 'sejdeme', 'zítra', 'příští']):
+        if intents.has('stage.closing'):
             return 'closing', 'direct_close'
         
         # OBJECTIONS
-        if 'nemám čas' in user_lower or 'zaneprázdněný' in user_lower:
+        if intents.has('stage.no_time'):
             return 'objection', 'no_time'
         
-        if 'drahé' in user_lower or 'kolik' in user_lower or 'cena' in user_lower:
+        if intents.has('stage.no_money'):
             return 'objection', 'no_money'
         
-        if 'spokojení' in user_lower or 'už máme' in user_lower:
+        if intents.has('stage.have_web_satisfied'):
             return 'objection', 'have_web_satisfied'
         
-        if 'nezajímá' in user_lower or 'nechci' in user_lower:
+        if intents.has('stage.no_interest'):
             return 'objection', 'no_interest'
         
         # VALUE (když se ptají)
-        if any(w in user_lower for w in ['jak', 'proč', 'co', 'zajímá']):
+        if intents.has('stage.value_question'):
             return 'value', 'seo_benefit'
         
+        # FREE-FORM - nejbližší KB situace (retrieval index, bez LLM)
+        retrieved = self._retrieve_stage(user_input)
+        if retrieved:
+            return retrieved
+        
         # DISCOVERY
-        if self.current_stage == 'intro':
+        if state.current_stage == 'intro':
             return 'discovery', 'web_check'
         
         # DEFAULT PROGRESSION
-        if self.current_stage == 'discovery':
-            if self.has_web == False:
+        if state.current_stage == 'discovery':
+            if state.has_web == False:
                 return 'value', 'seo_benefit'
             else:
                 return 'value', 'competitor_advantage'
         
-        if self.current_stage == 'value':
+        if state.current_stage == 'value':
             return 'closing', 'soft_close'
         
-        return self.current_stage, None
+        return state.current_stage, None
     
-    def _detect_sentiment(self, text):
-        """Detekuj sentiment"""
-        text_lower = text.lower()
-        
-        positive = ['ano', 'jo', 'jasně', 'super', 'zajímá', 'dobré', 'fajn']
-        negative = ['ne', 'nechci', 'nezajímá', 'nemám', 'ale', 'problém']
-        
-        pos = sum(1 for w in positive if w in text_lower)
-        neg = sum(1 for w in negative if w in text_lower)
+    def _retrieve_stage(self, user_input):
+        """Stage + sub-category nejpodobnější KB response (nebo None)"""
+        # Krátké "ano/ne/jo" řeší flow, retrieval je pro volné otázky
+        if self.retrieval is None or len(user_input.split()) < Config.RETRIEVAL_MIN_WORDS:
+            return None
+        
+        results = self.retrieval.search(user_input, k=1)
+        if not results or results[0][1] < Config.RETRIEVAL_MIN_SCORE:
+            return None
+        
+        response_id, score, source = results[0]
+        response = self.kb.get_response_by_id(response_id)
+        if not response:
+            return None
+        
+        print(f"   🔎 Retrieval: KB #{response_id} ({score:.2f}, {source})")
+        return response['call_stage'], response['sub_category']
+    
+    def _detect_sentiment(self, intents):
+        """Detekuj sentiment (počet pozitivních vs negativních slov)"""
+        pos = intents.count('sentiment.positive')
+        neg = intents.count('sentiment.negative')
         
         if pos > neg:
             return 'positive'
@@ -244,12 +293,26 @@ class ColdCallerKB:
         else:
             return 'neutral'
     
-    def get_call_summary(self):
+    def get_call_summary(self, state):
         """Shrnutí hovoru"""
         return {
-            'customer_name': self.customer_name,
-            'company_name': self.company_name,
-            'has_web': self.has_web,
-            'final_stage': self.current_stage,
-            'off_topic_count': self.topic_controller.off_topic_count
-        }
\ No newline at end of file
+            'customer_name': state.customer_name,
+            'company_name': state.company_name,
+            'has_web': state.has_web,
+            'final_stage': state.current_stage,
+            'off_topic_count': state.off_topic_count
+        }
+
+
+# ============================================================
+# SINGLETON INSTANCE
+# ============================================================
+
+_cold_caller_kb = None
+
+def get_cold_caller_kb():
+    """Sdílený ColdCallerKB pro celý proces (stav hovoru je v KBCallState)"""
+    global _cold_caller_kb
+    if _cold_caller_kb is None:
+        _cold_caller_kb = ColdCallerKB()
+    return _cold_caller_kb
\ No newline at end of file
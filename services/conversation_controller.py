@@ -7,6 +7,9 @@ import mysql.connector
 from typing import Dict, Optional
 import re
 
+from database.phrase_index import PhraseIndex, PhraseIndexCache, mysql_table_signature
+from services.intent_matcher import get_intent_matcher
+
 
 class ConversationController:
     """Kontroluje flow konverzace a vrací k cíli"""
@@ -21,6 +24,12 @@ class ConversationController:
         )
         self.cursor = self.conn.cursor(dictionary=True)
         
+        # Off-topic klíčová slova - zkompilovaný index, přestaví se při změně tabulky
+        self.phrases = PhraseIndexCache(
+            lambda: mysql_table_signature(self.cursor, 'off_topic_handlers'),
+            self._build_phrase_index
+        )
+        
         # Track current stage
         self.current_stage = 'intro'
         self.stage_attempts = 0
@@ -92,22 +101,8 @@ class ConversationController:
     def _is_on_topic(self, text: str) -> bool:
         """Detekuj jestli je zákazník ON-TOPIC"""
         
-        # ON-TOPIC keywords
-        on_topic_keywords = [
-            'web', 'stránk', 'internet', 'google', 'seo',
-            'zákazník', 'obchodník', 'reklam', 'marketing',
-            'schůzka', 'setkání', 'konzultace', 'nabídka',
-            'cena', 'kolik', 'ano', 'ne', 'zajímá', 'nezajímá',
-            'email', 'telefon', 'kontakt', 'pošl',
-            'můžu', 'můžete', 'kdy', 'jak', 'co',
-            'mám', 'nemám', 'máme', 'nemáme',
-            'chci', 'nechci', 'chtěl', 'potřebuju'
-        ]
-        
-        text_lower = text.lower()
-        
-        # Pokud obsahuje business keywords = ON-TOPIC
-        if any(keyword in text_lower for keyword in on_topic_keywords):
+        # Pokud obsahuje business keywords = ON-TOPIC (flow.on_topic)
+        if get_intent_matcher().match(text).has('flow.on_topic'):
             return True
         
         # Krátké odpovědi (ano, ne, jo, jasně) = ON-TOPIC
@@ -116,24 +111,25 @@ class ConversationController:
         
         return False
     
-    def _detect_off_topic_type(self, text: str) -> str:
-        """Detekuj typ OFF-TOPIC odbočení"""
+    def _build_phrase_index(self) -> PhraseIndex:
+        """Načti off_topic_handlers a zkompiluj klíčová slova"""
         
         self.cursor.execute("""
             SELECT off_topic_type, detected_keywords
             FROM off_topic_handlers
         """)
         
-        handlers = self.cursor.fetchall()
-        
-        text_lower = text.lower()
+        return PhraseIndex(off_topics=[
+            (handler['off_topic_type'], (handler['detected_keywords'] or '').split(', '))
+            for handler in self.cursor.fetchall()
+        ])
+    
+    def _detect_off_topic_type(self, text: str) -> str:
+        """Detekuj typ OFF-TOPIC odbočení"""
         
-        for handler in handlers:
-            keywords = handler['detected_keywords'].split(', ')
-            if any(keyword in text_lower for keyword in keywords):
-                return handler['off_topic_type']
+        off_topic_type = self.phrases.get().resolve(text).off_topic_type
         
-        return 'random_otázka'  # Default
+        return off_topic_type or 'random_otázka'  # Default
     
     def _get_redirect_phrase(self, off_topic_type: str) -> str:
         """Získej redirect frázi pro návrat k tématu"""
@@ -165,7 +161,7 @@ class ConversationController:
     def _analyze_customer_response(self, text: str) -> Dict:
         """Analyzuj odpověď zákazníka"""
         
-        text_lower = text.lower()
+        intents = get_intent_matcher().match(text)
         
         analysis = {
             'has_web': False,
@@ -177,27 +173,27 @@ class ConversationController:
         }
         
         # Detekce webu
-        if any(phrase in text_lower for phrase in ['mám web', 'máme web', 'máme stránky', 'už máme']):
+        if intents.has('flow.has_web'):
             analysis['has_web'] = True
-        elif any(phrase in text_lower for phrase in ['nemám web', 'nemáme web', 'nemáme stránky', 'zatím ne']):
+        elif intents.has('flow.no_web'):
             analysis['has_web'] = False
         
         # Detekce zájmu
-        if any(phrase in text_lower for phrase in ['ano', 'jo', 'jasně', 'zajímá', 'určitě', 'dobrý', 'super']):
+        if intents.has('flow.interested'):
             analysis['interested'] = True
             analysis['positive_signal'] = True
-        elif any(phrase in text_lower for phrase in ['ne', 'nezajímá', 'nechci', 'nemám zájem']):
+        elif intents.has('flow.not_interested'):
             analysis['interested'] = False
         
         # Detekce schůzky
-        if any(phrase in text_lower for phrase in ['schůzka', 'setkání', 'sejdeme', 'konzultace', 'můžeme', 'zítra', 'příští týden']):
+        if intents.has('flow.meeting'):
             analysis['ready_to_meet'] = True
             analysis['positive_signal'] = True
         
         # Detekce námitek
-        if 'čas' in text_lower and 'nemám' in text_lower:
+        if intents.has('flow.time_word') and intents.has('flow.nemam_word'):
             analysis['objection_detected'] = 'no_time'
-        elif any(phrase in text_lower for phrase in ['drahé', 'peníze', 'rozpočet']):
+        elif intents.has('flow.no_money'):
             analysis['objection_detected'] = 'no_money'
         
         # Sentiment
@@ -0,0 +1,115 @@
+"""
+Pool predgenerovanych pozdravu pro prichozi hovory
+
+Misto LLM volani + TTS na kazdy prichozi hovor se pozdrav vybere
+z N variant vygenerovanych offline z Prompts.RECEPTIONIST
+(python -m cli.build_greetings) - audio je uz v cache, prvni zvuk
+hovoru je okamzity. Varianty se stridaji dokola.
+
+Pool je vazany na hash promptu - po zmene promptu se nepouzije
+(pozdrav by nesedel k chovani modelu), dokud se nepostavi znovu.
+"""
+
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from typing import List, Optional
+
+from config import Config, Prompts
+from core.tts_engine import split_sentences
+
+
+# Zprava, na kterou model puvodne odpovidal pozdravem (drzi historii stejnou)
+PICKUP_MESSAGE = "Zákazník zvedl telefon."
+
+
+def prompt_hash(prompt: str = None) -> str:
+    return hashlib.sha1((prompt or Prompts.RECEPTIONIST).encode('utf-8')).hexdigest()
+
+
+class GreetingPool:
+    """Varianty pozdravu + rotace mezi hovory"""
+
+    def __init__(self, variants: List[str], prompt_sha: str = None, created_at: float = None):
+        self.variants = list(variants)
+        self.prompt_sha = prompt_sha or prompt_hash()
+        self.created_at = created_at or time.time()
+
+        # Kazdy worker zacne jinde - soubezne hovory nedostanou stejny pozdrav
+        self._next = random.randrange(len(self.variants)) if self.variants else 0
+        self._lock = threading.Lock()
+        self.served = 0
+
+    def next(self) -> str:
+        """Dalsi pozdrav v rotaci"""
+        with self._lock:
+            greeting = self.variants[self._next % len(self.variants)]
+            self._next += 1
+            self.served += 1
+        return greeting
+
+    def segments(self) -> List[str]:
+        """Vsechny audio segmenty poolu (po vetach jako v /inbound)"""
+        return [segment for variant in self.variants for segment in split_sentences(variant)]
+
+    # ============================================================
+    # ULOZENI
+    # ============================================================
+
+    def save(self, path: str = None):
+        path = path or Config.GREETING_POOL_PATH
+        db_dir = os.path.dirname(path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+
+        tmp = f"{path}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({
+                'prompt_sha': self.prompt_sha,
+                'created_at': self.created_at,
+                'variants': self.variants,
+            }, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str = None) -> Optional['GreetingPool']:
+        """None = soubor chybi, je prazdny nebo patri ke staremu promptu"""
+        path = path or Config.GREETING_POOL_PATH
+        if not os.path.exists(path):
+            return None
+
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        if data.get('prompt_sha') != prompt_hash():
+            print(f"⚠️  Greeting pool {path} je pro starý prompt - pozdrav půjde z AI "
+                  f"(python -m cli.build_greetings)")
+            return None
+        if not data.get('variants'):
+            return None
+
+        return cls(data['variants'], data['prompt_sha'], data.get('created_at'))
+
+
+# ============================================================
+# SINGLETON INSTANCE
+# ============================================================
+
+_pool_instance = None
+_pool_loaded = False
+
+def get_greeting_pool() -> Optional[GreetingPool]:
+    """Nacti pool (jednou). None = pozdrav se generuje AI jako driv."""
+    global _pool_instance, _pool_loaded
+    if not _pool_loaded:
+        _pool_loaded = True
+        try:
+            _pool_instance = GreetingPool.load()
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Greeting pool nelze načíst: {e}")
+        if _pool_instance:
+            print(f"✅ Greeting pool: {len(_pool_instance.variants)} variant")
+    return _pool_instance
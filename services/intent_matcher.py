@@ -0,0 +1,93 @@
+"""
+Intent matcher - vsechna klicova slova z data/intent_keywords.json
+Utterance se projde jednou a vrati vsechny intenty naraz
+(odmitnuti, stage, sentiment, off-topic typ, ...).
+"""
+
+import json
+from functools import lru_cache
+from typing import Dict, FrozenSet, Optional
+
+from core.keyword_matcher import KeywordMatcher
+from database.warm_start import INTENT_MATCHER, file_signature, warm_component
+
+
+INTENT_KEYWORDS_FILE = 'data/intent_keywords.json'
+
+
+class Intents:
+    """Vysledek matchovani jedne utterance"""
+
+    __slots__ = ('_found', '_groups')
+
+    def __init__(self, found: Dict[str, FrozenSet[str]], groups: Dict[str, list]):
+        self._found = found
+        self._groups = groups
+
+    def has(self, intent: str) -> bool:
+        """Obsahuje text nektere klicove slovo intentu? (napr. 'rejection.hard')"""
+        return intent in self._found
+
+    def count(self, intent: str) -> int:
+        """Kolik ruznych klicovych slov intentu text obsahuje"""
+        return len(self._found.get(intent, ()))
+
+    def first(self, group: str) -> Optional[str]:
+        """Prvni nalezeny intent skupiny v poradi souboru (napr. typ redirectu)"""
+        for intent in self._groups.get(group, ()):
+            if f"{group}.{intent}" in self._found:
+                return intent
+        return None
+
+    def __repr__(self):
+        return f"Intents({sorted(self._found)})"
+
+
+class IntentMatcher:
+    """Nacte tabulky klicovych slov a zkompiluje je do jednoho matcheru"""
+
+    def __init__(self, path: str = None):
+        self.path = path or INTENT_KEYWORDS_FILE
+
+        with open(self.path, 'r', encoding='utf-8') as f:
+            tables = json.load(f)
+
+        # Skupiny v poradi souboru (poradi rozhoduje u first())
+        self.groups = {group: list(intents) for group, intents in tables.items()}
+
+        self._matcher = KeywordMatcher({
+            f"{group}.{intent}": keywords
+            for group, intents in tables.items()
+            for intent, keywords in intents.items()
+        })
+
+        self._init_cache()
+
+    def _init_cache(self):
+        # Jedna utterance se bere z vice mist (server, KB caller, topic controller)
+        self.match = lru_cache(maxsize=2048)(self._match)
+
+    def __getstate__(self):
+        # Warm start artefakt - zkompilovany matcher ano, LRU cache ne
+        return {'path': self.path, 'groups': self.groups, '_matcher': self._matcher}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._init_cache()
+
+    def _match(self, text: str) -> Intents:
+        return Intents(self._matcher.match(text), self.groups)
+
+
+# ============================================================
+# SINGLETON INSTANCE
+# ============================================================
+
+_matcher_instance = None
+
+def get_intent_matcher() -> IntentMatcher:
+    """Ziskej singleton instance intent matcheru"""
+    global _matcher_instance
+    if _matcher_instance is None:
+        _matcher_instance = warm_component(INTENT_MATCHER, file_signature(INTENT_KEYWORDS_FILE)) or IntentMatcher()
+    return _matcher_instance
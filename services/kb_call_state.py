@@ -0,0 +1,52 @@
+"""
+Stav jednoho KB hovoru
+Maly objekt - sdilene sluzby (KB, selector, topic controller) jsou v ColdCallerKB,
+tady je jen to, co patri konkretnimu hovoru. Serializuje se do session store.
+"""
+
+
+class KBCallState:
+    """Per-call stav cold callu (stage, kontakt, historie odpovedi)"""
+
+    __slots__ = (
+        'call_sid', 'current_stage', 'customer_name', 'company_name',
+        'has_web', 'last_response_id', 'last_segments',
+        'off_topic_count', 'used_responses',
+    )
+
+    def __init__(self, call_sid=None):
+        self.call_sid = call_sid
+        self.current_stage = 'intro'
+        self.customer_name = None
+        self.company_name = None
+        self.has_web = None
+        self.last_response_id = None
+        self.last_segments = []   # Audio segmenty posledni odpovedi
+        self.off_topic_count = 0  # Kolikrat zakaznik odbocil (TopicController)
+        self.used_responses = []  # Nedavno pouzite responses (ResponseSelector)
+
+    def to_dict(self):
+        """Stav jako JSON-serializovatelny dict"""
+        return {
+            'call_sid': self.call_sid,
+            'current_stage': self.current_stage,
+            'customer_name': self.customer_name,
+            'company_name': self.company_name,
+            'has_web': self.has_web,
+            'last_response_id': self.last_response_id,
+            'off_topic_count': self.off_topic_count,
+            'used_responses': list(self.used_responses),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Obnov stav ze session store"""
+        state = cls(data.get('call_sid'))
+        state.current_stage = data.get('current_stage', 'intro')
+        state.customer_name = data.get('customer_name')
+        state.company_name = data.get('company_name')
+        state.has_web = data.get('has_web')
+        state.last_response_id = data.get('last_response_id')
+        state.off_topic_count = data.get('off_topic_count', 0)
+        state.used_responses = list(data.get('used_responses', []))
+        return state
@@ -61,13 +61,14 @@ class LearningSystem:
                 print(f"❌ Nepodařilo se vytvořit soubor: {e}")
                 raise
     
-    def learn_from_call(self, call_sid, report):
+    def learn_from_call(self, call_sid, report, messages=None):
         """
         Učí se z úspěšného hovoru
         
         Args:
             call_sid: ID hovoru
             report: AI report
+            messages: Konverzace (z fronty) - jinak se hledá v session store
         """
         
         print(f"\n{'='*60}")
@@ -78,15 +79,15 @@ class LearningSystem:
         print(f"Classification: {report.get('classification', 'N/A')}")
         
         # Získej konverzaci
-        from services import ReceptionistService
-        receptionist = ReceptionistService()
+        if messages is None:
+            from services import ReceptionistService
+            receptionist = ReceptionistService()
+            messages = receptionist.ai.get_history(call_sid)
         
-        if call_sid not in receptionist.ai.conversations:
-            print(f"❌ Konverzace nenalezena v paměti")
+        if not messages:
+            print(f"❌ Konverzace nenalezena v session store")
             return False
         
-        messages = receptionist.ai.conversations[call_sid]
-        
         # Bot zprávy
         bot_messages = [
             msg['content'] for msg in messages 
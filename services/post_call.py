@@ -0,0 +1,86 @@
+"""
+Zpracovani hovoru po zaveseni (bezi ve fronte uloh, ne ve webhooku)
+AI report -> ulozeni do call_details -> auto-learning
+"""
+
+from core.job_queue import get_job_queue
+
+
+JOB_CALL_REPORT = 'call_report'
+
+
+def handle_call_report(payload):
+    """
+    AI vyhodnoceni + ulozeni + learning
+
+    Vyjimka = retry (s backoffem). save_call je INSERT OR REPLACE,
+    takze opakovani je bezpecne.
+    """
+    from services.call_reporter import CallReporter
+    from database.call_analytics import CallAnalytics
+
+    call_sid = payload['call_sid']
+    conversation = payload['conversation']
+
+    print(f"\n{'='*60}")
+    print(f"🤖 AI VYHODNOCENÍ ({call_sid})")
+    print(f"{'='*60}")
+
+    # ✅ POŠLI KONVERZACI DO REPORTERU!
+    result = CallReporter().analyze_call(call_sid, conversation)
+
+    if 'error' in result:
+        raise RuntimeError(f"Report error: {result['error']}")
+
+    print(f"\n✅ AI REPORT VYGENEROVÁN!")
+    print(f"   Výsledek: {result.get('outcome', 'N/A')}")
+    print(f"   Skóre: {result.get('sales_score', 0)}/100")
+    print(f"   Shrnutí: {result.get('ai_summary', 'N/A')[:100]}...")
+
+    # ✅ ULOŽ DO DATABÁZE
+    CallAnalytics().save_call({
+        'call_sid': call_sid,
+        'contact_phone': payload.get('caller', ''),
+        'duration': payload.get('duration', 0),
+        'conversation': conversation,
+        'started_at': None,  # TODO: track start time
+        'ended_at': None,
+        **result
+    })
+    print(f"   ✅ Uloženo do databáze!")
+
+    # ✅ AI LEARNING - pokud úspěšný!
+    success_rate = result.get('sales_score', 0)
+
+    if success_rate >= 70:
+        print(f"\n🧠 SPOUŠTÍM AUTO-LEARNING (úspěšný hovor {success_rate}%)...")
+
+        # Learning je best-effort - jeho chyba nema opakovat cely report
+        try:
+            from services.learning_system import LearningSystem
+            LearningSystem().learn_from_call(call_sid, result, messages=conversation)
+            print(f"   ✅ Learning dokončen - prompt vylepšen!")
+        except Exception as e:
+            print(f"   ⚠️  Learning error: {e}")
+
+    elif success_rate < 40:
+        print(f"\n📚 Ukládám FAILED hovor pro learning ({success_rate}%)...")
+        # TODO: Learn from failures
+
+
+def enqueue_call_report(call_sid, conversation, duration, caller=''):
+    """Zaradi vyhodnoceni hovoru (idempotentne podle CallSid)"""
+    return get_job_queue().enqueue(JOB_CALL_REPORT, call_sid, {
+        'call_sid': call_sid,
+        'conversation': conversation,
+        'duration': duration,
+        'caller': caller,
+    })
+
+
+def start_post_call_workers(workers=None):
+    """Zaregistruje handlery a spusti workery fronty"""
+    queue = get_job_queue()
+    queue.register(JOB_CALL_REPORT, handle_call_report)
+    queue.start(workers)
+    return queue
@@ -7,6 +7,7 @@ from twilio.twiml.voice_response import VoiceResponse, Gather
 from core import AIEngine, TTSEngine
 from database import CallDB
 from config import Config, Prompts
+from services.greeting_pool import PICKUP_MESSAGE, get_greeting_pool
 import time
 from datetime import datetime
 
@@ -61,10 +62,18 @@ class ReceptionistService:
             system_prompt=Prompts.RECEPTIONIST
         )
         
-        greeting = self.ai.get_response(
-            session_id=call_sid,
-            user_message="Zákazník zvedl telefon."
-        )
+        # ⚡ Predgenerovany pozdrav (audio uz v cache) - bez LLM volani
+        pool = get_greeting_pool()
+        if pool:
+            greeting = pool.next()
+            self.ai.append_message(call_sid, 'user', PICKUP_MESSAGE)
+            self.ai.append_message(call_sid, 'assistant', greeting)
+        else:
+            greeting = self.ai.get_response(
+                session_id=call_sid,
+                user_message=PICKUP_MESSAGE,
+                stage='greeting'
+            )
         
         print(f"  ✓ Konverzace zahájena")
         print(f"  Vracím pozdrav: {greeting}\n")
@@ -97,13 +106,45 @@ class ReceptionistService:
         
         ai_response = self.ai.get_response(
             session_id=call_sid,
-            user_message=speech_result
+            user_message=speech_result,
+            stage=self.call_stage(call_sid)
         )
         
         print(f"  AI odpověď: {ai_response}")
         
         return ai_response
     
+    def stream_speech(self, call_sid, speech_result):
+        """
+        Jako process_speech, ale AI odpověď po větách (streaming)
+        
+        Yields:
+            str: Věty odpovědi, jak je model dopíše
+        """
+        print(f"\n[ReceptionistService] stream_speech({call_sid})")
+        print(f"  Uživatel řekl: '{speech_result}'")
+        
+        if not speech_result or speech_result.strip() == "":
+            print(f"  ⚠️  Prázdný vstup")
+            yield "Nerozuměl jsem. Můžete to zopakovat?"
+            return
+        
+        yield from self.ai.stream_sentences(
+            session_id=call_sid,
+            user_message=speech_result,
+            stage=self.call_stage(call_sid)
+        )
+    
+    def call_stage(self, call_sid):
+        """
+        Faze hovoru pro reply cache (Config.REPLY_CACHE_STAGES)
+        
+        opening = prvni reakce zakaznika na pozdrav ("ano", "halo", ...),
+        conversation = zbytek hovoru (uz zavisi na kontextu).
+        """
+        user_turns = sum(1 for m in self.ai.get_history(call_sid) if m['role'] == 'user')
+        return 'opening' if user_turns <= 1 else 'conversation'
+    
     def process_message(self, call_sid, user_input):
         """
         Alias pro process_speech (kvůli kompatibilitě s api/server.py)
@@ -4,12 +4,23 @@ Inteligentní výběr podle kontext, historie, success rate
 """
 
 from database.sqlite_connector import get_knowledge_base
+from core.tts_engine import split_sentences
 from typing import Optional, Dict, List
 import random
 
 class ResponseSelector:
     """Inteligentní výběr responses z knowledge base"""
     
+    # Fallback pokud v KB nic nenajdeme (podle stage)
+    FALLBACKS = {
+        'intro': "Dobrý den! Petra z Moravských Webů. Máte chvilku?",
+        'discovery': "Řekněte mi - máte webové stránky?",
+        'value': "Web vám přivede víc zákazníků automaticky. Zajímá vás jak?",
+        'objection': "Chápu váš pohled. Můžeme se sejít a ukážu vám konkrétní příklady?",
+        'closing': "Pojďme se sejít. Zítra nebo pozítří vám vyhovuje?"
+    }
+    DEFAULT_FALLBACK = "Zajímá vás víc informací o našich službách?"
+    
     def __init__(self):
         self.kb = get_knowledge_base()
         self.used_responses = []  # Historie použitých responses
@@ -20,7 +31,8 @@ class ResponseSelector:
         stage: str,
         sub_category: Optional[str] = None,
         customer_sentiment: str = 'neutral',  # positive/neutral/negative
-        add_czech_filler: bool = True
+        add_czech_filler: bool = True,
+        used_responses: Optional[List[int]] = None
     ) -> Dict:
         """
         Získej nejlepší response pro situaci
@@ -30,10 +42,13 @@ class ResponseSelector:
             sub_category: upřesnění (time_sensitive, no_money, ...)
             customer_sentiment: nálada zákazníka
             add_czech_filler: přidat české fillery?
+            used_responses: historie hovoru (per-call stav), jinak vlastní
         
         Returns:
             Dict s response_text, alternatives, metadata
         """
+        if used_responses is None:
+            used_responses = self.used_responses
         
         # Získej top candidates
         candidates = self.kb.get_best_response(
@@ -50,24 +65,24 @@ class ResponseSelector:
             return self._fallback_response(stage)
         
         # Vyfiltruj nedávno použité (variabilita)
-        candidates = self._filter_recent(candidates)
+        candidates = self._filter_recent(candidates, used_responses)
         
         # Vyber podle sentimentu
         selected = self._select_by_sentiment(candidates, customer_sentiment)
         
         # Přidej do historie
-        self.used_responses.append(selected['id'])
-        if len(self.used_responses) > self.max_history:
-            self.used_responses.pop(0)
+        used_responses.append(selected['id'])
+        if len(used_responses) > self.max_history:
+            used_responses.pop(0)
         
         # Sestav finální response
         final_response = self._build_response(selected, add_czech_filler)
         
         return final_response
     
-    def _filter_recent(self, candidates: List[Dict]) -> List[Dict]:
+    def _filter_recent(self, candidates: List[Dict], used_responses: List[int]) -> List[Dict]:
         """Odfiltruj nedávno použité responses (variabilita)"""
-        filtered = [c for c in candidates if c['id'] not in self.used_responses[-3:]]
+        filtered = [c for c in candidates if c['id'] not in used_responses[-3:]]
         return filtered if filtered else candidates
     
     def _select_by_sentiment(self, candidates: List[Dict], sentiment: str) -> Dict:
@@ -92,16 +107,19 @@ class ResponseSelector:
         """Sestav finální response s českými fillery"""
         
         text = response['response_text']
+        segments = split_sentences(text)
         
-        # Přidej český filler občas
+        # Přidej český filler občas (jako samostatný segment - cache hit)
         if add_filler and random.random() < 0.4:
             filler = self.kb.get_random_filler()
             if filler and not text.startswith(filler):
-                text = f"{filler}, {text[0].lower()}{text[1:]}"
+                segments = [self.filler_segment(filler)] + segments
+            text = self.apply_filler(text, filler)
         
         return {
             'id': response['id'],
             'text': text,
+            'segments': segments,
             'alternative_1': response.get('alternative_1'),
             'alternative_2': response.get('alternative_2'),
             'tone': response.get('tone', 'friendly'),
@@ -110,19 +128,26 @@ class ResponseSelector:
             'strategy': response.get('strategy'),
         }
     
+    @staticmethod
+    def apply_filler(text: str, filler: Optional[str]) -> str:
+        """Předsaď filler ("jo, ...") - stejný tvar používá i pre-render"""
+        if filler and not text.startswith(filler):
+            return f"{filler}, {text[0].lower()}{text[1:]}"
+        return text
+    
+    @staticmethod
+    def filler_segment(filler: str) -> str:
+        """Filler jako samostatný audio segment ("Jo.")"""
+        return f"{filler[0].upper()}{filler[1:]}."
+    
     def _fallback_response(self, stage: str) -> Dict:
         """Fallback pokud nic nenajdeme"""
-        fallbacks = {
-            'intro': "Dobrý den! Petra z Moravských Webů. Máte chvilku?",
-            'discovery': "Řekněte mi - máte webové stránky?",
-            'value': "Web vám přivede víc zákazníků automaticky. Zajímá vás jak?",
-            'objection': "Chápu váš pohled. Můžeme se sejít a ukážu vám konkrétní příklady?",
-            'closing': "Pojďme se sejít. Zítra nebo pozítří vám vyhovuje?"
-        }
+        text = self.FALLBACKS.get(stage, self.DEFAULT_FALLBACK)
         
         return {
             'id': -1,
-            'text': fallbacks.get(stage, "Zajímá vás víc informací o našich službách?"),
+            'text': text,
+            'segments': split_sentences(text),
             'alternative_1': None,
             'alternative_2': None,
             'tone': 'friendly',
@@ -0,0 +1,254 @@
+"""
+Spekulativni odpovedi AI behem prehravani audia
+
+Mezi odeslanim Gather a dalsim SpeechResult je nekolik sekund ticha
+(bot mluvi, zakaznik odpovida, Twilio STT). Behem nich se pro nejcastejsi
+reakce v dane fazi hovoru (ano / ne / cena / nemam cas) pripravi odpoved
+AI i jeji TTS na pozadi. Kdyz skutecna odpoved zakaznika spada do jedne
+z nich, odpoved se pouzije hned - bez LLM i TTS na kriticke ceste.
+
+Rozpocet: max SPECULATION_MAX_INFLIGHT spekulaci naraz (ostatni se
+preskoci), zadna spekulace pri fronte v LLM limiteru a po prichodu
+skutecne odpovedi se zbytek zrusi (bezici LLM stream se zavre).
+Stav je v procesu - kdyz /process obslouzi jiny worker, je to miss.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from config import Config
+from core.reply_cache import normalize_turn
+from core.tts_engine import split_sentences
+
+
+# intent -> (reprezentativni zprava pro LLM, klicova slova - cela slova)
+SPECULATIVE_INTENTS = {
+    'no_time': ("Teď nemám čas.", ['nemám čas', 'nemám teď čas', 'teď ne', 'později', 'spěchám', 'nemám minutku']),
+    'price': ("Kolik to stojí?", ['kolik', 'cena', 'cenu', 'stojí']),
+    'yes': ("Ano.", ['ano', 'jo', 'jasně', 'určitě', 'povídejte', 'poslouchám']),
+    'no': ("Ne, děkuji.", ['ne', 'nechci', 'nezajímá', 'nemám zájem']),
+}
+
+# Konkretnejsi intenty maji prednost ("jo, ale nemam cas" = no_time);
+# v ramci urovne musi sedet prave jeden, jinak se spekulace nepouzije
+INTENT_TIERS = (('no_time', 'price'), ('yes', 'no'))
+
+
+class _Speculation:
+    """Jedna predpocitana odpoved (intent -> vety)"""
+
+    def __init__(self, intent: str, utterance: str, base: str):
+        self.intent = intent
+        self.utterance = utterance
+        self.base = base  # posledni zprava historie, ze ktere spekulace vznikla
+        self.started = time.time()
+        self.cancelled = threading.Event()
+        self.future = None
+
+
+class SpeculationEngine:
+    """Predpocita odpovedi na pravdepodobne reakce zakaznika"""
+
+    def __init__(self, ai, tts):
+        self.ai = ai
+        self.tts = tts
+        self.enabled = Config.SPECULATION_ENABLED
+        self.max_inflight = Config.SPECULATION_MAX_INFLIGHT
+
+        self._keywords = {
+            intent: [normalize_turn(keyword) for keyword in keywords]
+            for intent, (_, keywords) in SPECULATIVE_INTENTS.items()
+        }
+
+        self._pool = ThreadPoolExecutor(max_workers=self.max_inflight, thread_name_prefix='speculation')
+        self._calls: Dict[str, Dict[str, _Speculation]] = {}
+        self._lock = threading.Lock()
+        self._inflight = 0
+
+        self.started = 0
+        self.skipped = 0  # rozpocet vycerpan
+        self.cancelled = 0
+        self.hits = 0
+        self.misses = 0  # odpoved nesedi na zadnou (hotovou) spekulaci
+
+    # ============================================================
+    # SPEKULACE
+    # ============================================================
+
+    def speculate(self, call_sid: str, stage: str):
+        """Spust spekulace pro dalsi tah hovoru (po odeslani Gather)"""
+        intents = Config.SPECULATION_STAGES.get(stage)
+        if not self.enabled or not intents:
+            return
+
+        self.cancel(call_sid)
+
+        history = self.ai.get_history(call_sid)
+        if not history:
+            return
+
+        # Realne hovory maji v limiteru prednost
+        if self.ai.limiter.waiting:
+            with self._lock:
+                self.skipped += len(intents)
+            return
+
+        speculations = {}
+        for intent in intents:
+            with self._lock:
+                if self._inflight >= self.max_inflight:
+                    self.skipped += 1
+                    continue
+                self._inflight += 1
+                self.started += 1
+
+            spec = _Speculation(intent, SPECULATIVE_INTENTS[intent][0], history[-1]['content'])
+            spec.future = self._pool.submit(self._run, spec, history, stage)
+            spec.future.add_done_callback(self._done)
+            speculations[intent] = spec
+
+        if not speculations:
+            return
+
+        with self._lock:
+            self._calls[call_sid] = speculations
+            # Hovory bez dalsiho webhooku (zavesil behem prehravani)
+            expired = time.time() - Config.SPECULATION_TTL
+            for sid in [sid for sid, specs in self._calls.items()
+                        if max(spec.started for spec in specs.values()) < expired]:
+                del self._calls[sid]
+
+    def _done(self, future):
+        with self._lock:
+            self._inflight -= 1
+
+    def _run(self, spec: _Speculation, history: List[Dict], stage: str) -> Optional[List[str]]:
+        """LLM odpoved + TTS do cache (ve vlakne poolu)"""
+        if spec.cancelled.is_set():
+            return None
+
+        sentences = self.ai.draft_reply(history, spec.utterance, stage=stage, cancelled=spec.cancelled)
+        if not sentences:
+            return None
+
+        for sentence in sentences:
+            for segment in split_sentences(sentence):
+                if spec.cancelled.is_set():
+                    return sentences  # zbytek TTS dogeneruje /process
+                self.tts.generate(segment)
+
+        return sentences
+
+    # ============================================================
+    # POUZITI
+    # ============================================================
+
+    def classify(self, utterance: str) -> Optional[str]:
+        """Intent skutecne odpovedi, nebo None (dlouha / nejednoznacna)"""
+        text = normalize_turn(utterance)
+        if not text or len(text.split()) > Config.SPECULATION_MAX_WORDS:
+            return None
+
+        padded = f" {text} "
+        for tier in INTENT_TIERS:
+            found = [intent for intent in tier
+                     if any(f" {keyword} " in padded for keyword in self._keywords[intent])]
+            if len(found) == 1:
+                return found[0]
+            if found:
+                return None
+        return None
+
+    def commit(self, call_sid: str, utterance: str) -> Optional[List[str]]:
+        """
+        Pouzij spekulaci odpovidajici skutecne odpovedi zakaznika
+
+        Hit = zprava zakaznika + predpocitana odpoved se zapisou do
+        historie (jako by odpovedel model) a vrati se vety. Ostatni
+        spekulace hovoru se rusi. None = pokracuj beznou cestou.
+        """
+        with self._lock:
+            speculations = self._calls.pop(call_sid, None)
+        if not speculations:
+            return None
+
+        spec = speculations.get(self.classify(utterance))
+        for other in speculations.values():
+            if other is not spec:
+                self._cancel(other)
+
+        sentences = None
+        if spec and time.time() - spec.started <= Config.SPECULATION_TTL:
+            try:
+                # Rozpracovana spekulace je i tak dal nez novy request
+                sentences = spec.future.result(timeout=Config.SPECULATION_WAIT)
+            except Exception:
+                sentences = None
+
+        history = self.ai.get_history(call_sid) if sentences else []
+        if not history or history[-1]['content'] != spec.base:
+            if spec:
+                self._cancel(spec)
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+        print(f"  🔮 Spekulace '{spec.intent}' použita (spuštěna před {(time.time() - spec.started):.1f} s)")
+
+        self.ai.append_message(call_sid, 'user', utterance)
+        self.ai.append_message(call_sid, 'assistant', ' '.join(sentences))
+        return sentences
+
+    def cancel(self, call_sid: str):
+        """Zrus spekulace hovoru (novy tah, konec hovoru)"""
+        with self._lock:
+            speculations = self._calls.pop(call_sid, None)
+        for spec in (speculations or {}).values():
+            self._cancel(spec)
+
+    def _cancel(self, spec: _Speculation):
+        if spec.future.done():
+            return
+        spec.cancelled.set()
+        spec.future.cancel()
+        with self._lock:
+            self.cancelled += 1
+
+    def get_metrics(self) -> Dict:
+        with self._lock:
+            return {
+                'enabled': self.enabled,
+                'inflight': self._inflight,
+                'max_inflight': self.max_inflight,
+                'active_calls': len(self._calls),
+                'started': self.started,
+                'skipped': self.skipped,
+                'cancelled': self.cancelled,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / max(1, self.hits + self.misses), 4),
+            }
+
+
+# ============================================================
+# SINGLETON INSTANCE
+# ============================================================
+
+_engine_instance = None
+
+def get_speculation_engine(ai=None, tts=None) -> SpeculationEngine:
+    """Sdileny engine (prvni volani urcuje AIEngine a TTSEngine)"""
+    global _engine_instance
+    if _engine_instance is None:
+        if ai is None:
+            from core import AIEngine
+            ai = AIEngine()
+        if tts is None:
+            from core import TTSEngine
+            tts = TTSEngine()
+        _engine_instance = SpeculationEngine(ai, tts)
+    return _engine_instance
@@ -4,35 +4,46 @@ Pokud zákazník odbočí → redirect zpět k tématu
 """
 
 from database.sqlite_connector import get_knowledge_base
-from typing import Tuple, Optional
+from core.tts_engine import split_sentences
+from services.intent_matcher import get_intent_matcher
+from typing import Tuple, Optional, List
 import random
 
 class TopicController:
     """Kontroluje a udržuje hovor ON-TOPIC"""
     
+    FALLBACK_REDIRECT = "Jo. Ale zpátky k byznysu - máte web?"
+    
     def __init__(self):
         self.kb = get_knowledge_base()
         self.off_topic_count = 0  # Kolikrát zákazník odbočil
         self.max_off_topic = 3    # Po 3x = ukončit hovor
+        self.last_segments = []   # Audio segmenty posledního redirectu
     
-    def check_and_redirect(self, customer_text: str) -> Tuple[bool, Optional[str]]:
+    def check_and_redirect(self, customer_text: str, state=None) -> Tuple[bool, Optional[str]]:
         """
         Zkontroluj jestli zákazník je ON-TOPIC
         
+        Args:
+            customer_text: Co zákazník řekl
+            state: Per-call stav (KBCallState) - sdílený controller
+                   pak drží off_topic_count a segmenty v něm, ne v sobě
+        
         Returns:
             (is_on_topic: bool, redirect_response: Optional[str])
         """
+        state = state or self
         
         # Zkontroluj jestli text je ON-TOPIC
         is_on_topic, matched_topic = self.kb.is_on_topic(customer_text)
         
         if is_on_topic:
             # Reset counter
-            self.off_topic_count = 0
+            state.off_topic_count = 0
             return True, None
         
         # OFF-TOPIC!
-        self.off_topic_count += 1
+        state.off_topic_count += 1
         
         # Detekuj typ OFF-TOPIC
         redirect_type = self._detect_redirect_type(customer_text)
@@ -42,10 +53,11 @@ class TopicController:
         
         if not redirect:
             # Fallback
-            return False, "Jo. Ale zpátky k byznysu - máte web?"
+            state.last_segments = split_sentences(self.FALLBACK_REDIRECT)
+            return False, self.FALLBACK_REDIRECT
         
         # Sestav odpověď
-        redirect_response = self._build_redirect_response(redirect)
+        redirect_response, state.last_segments = self._build_redirect_response(redirect)
         
         # Log usage
         if 'id' in redirect:
@@ -54,36 +66,11 @@ class TopicController:
         return False, redirect_response
     
     def _detect_redirect_type(self, text: str) -> str:
-        """Detekuj typ OFF-TOPIC konverzace"""
-        text_lower = text.lower()
-        
-        # Jednoduchá keyword detekce
-        if any(word in text_lower for word in ['počasí', 'prší', 'sníh', 'slunce', 'venku']):
-            return 'weather'
-        
-        if any(word in text_lower for word in ['fotbal', 'hokej', 'sport', 'zápas']):
-            return 'sports'
-        
-        if any(word in text_lower for word in ['politika', 'vláda', 'volby', 'prezident']):
-            return 'politics'
-        
-        if any(word in text_lower for word in ['nemocný', 'zdraví', 'doktor', 'bolí']):
-            return 'health'
-        
-        if any(word in text_lower for word in ['děti', 'rodina', 'manželka', 'dovolená']):
-            return 'personal_life'
-        
-        if any(word in text_lower for word in ['drahé', 'problém', 'těžké']):
-            return 'complaint_vent'
-        
-        if any(word in text_lower for word in ['jak se máte', 'dobrý den', 'počasí']):
-            return 'casual_smalltalk'
-        
-        # Default
-        return 'general_offtopic'
+        """Detekuj typ OFF-TOPIC konverzace (skupina 'redirect' v data/intent_keywords.json)"""
+        return get_intent_matcher().match(text).first('redirect') or 'general_offtopic'
     
-    def _build_redirect_response(self, redirect: dict) -> str:
-        """Sestav redirect odpověď s českými fillery"""
+    def _build_redirect_response(self, redirect: dict) -> Tuple[str, List[str]]:
+        """Sestav redirect odpověď s českými fillery (text, audio segmenty)"""
         
         # Acknowledge (jo, chápu, hmm, ...)
         acknowledge = redirect.get('acknowledge_short', 'Jo')
@@ -97,11 +84,24 @@ class TopicController:
             if filler:
                 acknowledge = filler
         
+        return (
+            self.compose_redirect(acknowledge, redirect_text),
+            self.compose_redirect_segments(acknowledge, redirect_text)
+        )
+    
+    @staticmethod
+    def compose_redirect(acknowledge: str, redirect_text: str) -> str:
+        """Spoj acknowledge + redirect (stejný tvar používá i pre-render)"""
         return f"{acknowledge}. {redirect_text}"
     
-    def should_end_call(self) -> bool:
+    @staticmethod
+    def compose_redirect_segments(acknowledge: str, redirect_text: str) -> List[str]:
+        """Acknowledge a redirect jako samostatné audio segmenty"""
+        return [f"{acknowledge}."] + split_sentences(redirect_text)
+    
+    def should_end_call(self, state=None) -> bool:
         """Měl by se hovor ukončit? (příliš OFF-TOPIC)"""
-        return self.off_topic_count >= self.max_off_topic
+        return (state or self).off_topic_count >= self.max_off_topic
     
     def get_end_call_message(self) -> str:
         """Zdvořilé ukončení když je příliš OFF-TOPIC"""
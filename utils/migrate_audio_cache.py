@@ -0,0 +1,87 @@
+"""
+Jednorazova migrace stare audio cache do manifestu AudioStore
+
+Stare soubory (static/audio/tts_*.mp3, static/cache_*.mp3, static/resp_*.mp3,
+static/response_*.mp3) jsou pojmenovane podle hash() - text z nich nejde zpetne
+zjistit, takze je nejde najit podle textu. Indexujeme je jako 'legacy' zaznamy
+(klic = SHA-256 obsahu), aby se zapocitaly do velikosti cache a daly se uklidit.
+
+Pouziti:
+    python -m utils.migrate_audio_cache
+"""
+
+import glob
+import hashlib
+import os
+
+from config import Config
+from core.audio_store import get_audio_store
+
+
+LEGACY_PATTERNS = [
+    os.path.join(Config.AUDIO_CACHE_DIR, 'tts_*.mp3'),
+    'static/cache_*.mp3',
+    'static/resp_*.mp3',
+    'static/response_*.mp3',
+]
+
+
+def _file_digest(path):
+    """SHA-256 obsahu souboru"""
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(65536), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def migrate():
+    """Zaindexuje vsechny stare audio soubory"""
+    store = get_audio_store()
+
+    print("=" * 60)
+    print("   MIGRACE AUDIO CACHE")
+    print("=" * 60)
+
+    indexed = 0
+    skipped = 0
+    duplicates = 0
+    seen = {}
+
+    for pattern in LEGACY_PATTERNS:
+        for path in sorted(glob.glob(pattern)):
+            name = os.path.basename(path)
+
+            # Nove content-addressed soubory (tts_<sha256>) uz v manifestu jsou
+            key_part = name[len('tts_'):-len('.mp3')] if name.startswith('tts_') else ''
+            if len(key_part) == 64 and store.get_entry(key_part):
+                skipped += 1
+                continue
+
+            digest = _file_digest(path)
+
+            if digest in seen:
+                duplicates += 1
+                print(f"  ⚠️  Duplikat: {path} = {seen[digest]}")
+
+            seen.setdefault(digest, path)
+
+            store._record(
+                key=f"legacy:{digest}:{name}",
+                path=path,
+                size=os.path.getsize(path),
+                created=os.path.getmtime(path),
+                legacy=True
+            )
+            indexed += 1
+
+    stats = store.get_stats()
+
+    print(f"\n✅ Zaindexovano: {indexed}")
+    print(f"   Preskoceno (uz v manifestu): {skipped}")
+    print(f"   Duplicitni obsah: {duplicates}")
+    print(f"\n📊 Manifest: {stats['entries']} zaznamu, {stats['total_bytes'] / 1024 / 1024:.1f} MB")
+
+
+if __name__ == "__main__":
+    migrate()